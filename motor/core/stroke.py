@@ -10,6 +10,8 @@ from typing import List, Tuple, Optional
 from enum import Enum
 import time
 
+import numpy as np
+
 
 class StrokeType(Enum):
     """Type of stroke operation."""
@@ -65,11 +67,56 @@ class Stroke:
     color: Optional[Tuple[int, int, int, int]] = None  # RGBA
     metadata: dict = field(default_factory=dict)
     
+    # Column order used by to_array/from_array
+    POINT_FIELDS = (
+        "x", "y", "pressure", "tilt_x", "tilt_y", "rotation", "timestamp", "velocity",
+    )
+    
     def __post_init__(self):
         """Validate and process stroke data."""
         if not self.points:
             self.points = []
     
+    def to_array(self) -> np.ndarray:
+        """
+        Pack point data into a single array.
+        
+        Returns:
+            Array of shape (N, 8) with one row per point, columns in
+            POINT_FIELDS order
+        """
+        array = np.empty((len(self.points), len(self.POINT_FIELDS)), dtype=np.float64)
+        for row, p in zip(array, self.points):
+            row[:] = (
+                p.x, p.y, p.pressure, p.tilt_x, p.tilt_y,
+                p.rotation, p.timestamp, p.velocity,
+            )
+        return array
+    
+    def to_xy_array(self) -> np.ndarray:
+        """
+        Pack point coordinates into a single array.
+        
+        Returns:
+            Array of shape (N, 2) with one (x, y) row per point
+        """
+        return np.array(
+            [(p.x, p.y) for p in self.points], dtype=np.float64
+        ).reshape(-1, 2)
+    
+    @staticmethod
+    def points_from_array(array: np.ndarray) -> List[StrokePoint]:
+        """
+        Unpack points packed by to_array.
+        
+        Args:
+            array: Array of shape (N, 8) in POINT_FIELDS order
+            
+        Returns:
+            List of stroke points
+        """
+        return [StrokePoint(*row) for row in np.asarray(array, dtype=np.float64).tolist()]
+    
     def add_point(self, point: StrokePoint) -> None:
         """Add a point to the stroke."""
         self.points.append(point)
@@ -93,10 +140,8 @@ class Stroke:
         if len(self.points) < 2:
             return 0.0
         
-        total = 0.0
-        for i in range(1, len(self.points)):
-            total += self.points[i].distance_to(self.points[i-1])
-        return total
+        deltas = np.diff(self.to_xy_array(), axis=0)
+        return float(np.hypot(deltas[:, 0], deltas[:, 1]).sum())
     
     def duration(self) -> float:
         """Get total duration of the stroke in seconds."""
@@ -118,46 +163,30 @@ class Stroke:
             return self
         
         # Calculate cumulative distances
-        distances = [0.0]
-        for i in range(1, len(self.points)):
-            distances.append(
-                distances[-1] + self.points[i].distance_to(self.points[i-1])
-            )
+        deltas = np.diff(self.to_xy_array(), axis=0)
+        distances = np.concatenate(([0.0], np.cumsum(np.hypot(deltas[:, 0], deltas[:, 1]))))
         
         total_length = distances[-1]
         if total_length == 0:
             return self
         
-        # Resample at uniform intervals
-        new_points = []
-        target_distance = total_length / (target_points - 1)
+        # Resample at uniform intervals: find the segment containing each
+        # target distance, then interpolate all point fields at once
+        target_dists = np.linspace(0.0, total_length, target_points)
+        segments = np.clip(
+            np.searchsorted(distances, target_dists, side="left") - 1,
+            0, len(distances) - 2,
+        )
+        starts = distances[segments]
+        segment_lengths = distances[segments + 1] - starts
+        t = np.divide(
+            target_dists - starts, segment_lengths,
+            out=np.zeros_like(target_dists), where=segment_lengths > 0,
+        )
         
-        for i in range(target_points):
-            target_dist = i * target_distance
-            
-            # Find segment containing this distance
-            for j in range(len(distances) - 1):
-                if distances[j] <= target_dist <= distances[j + 1]:
-                    # Interpolate between points j and j+1
-                    segment_length = distances[j + 1] - distances[j]
-                    if segment_length == 0:
-                        t = 0
-                    else:
-                        t = (target_dist - distances[j]) / segment_length
-                    
-                    p1, p2 = self.points[j], self.points[j + 1]
-                    new_point = StrokePoint(
-                        x=p1.x + t * (p2.x - p1.x),
-                        y=p1.y + t * (p2.y - p1.y),
-                        pressure=p1.pressure + t * (p2.pressure - p1.pressure),
-                        tilt_x=p1.tilt_x + t * (p2.tilt_x - p1.tilt_x),
-                        tilt_y=p1.tilt_y + t * (p2.tilt_y - p1.tilt_y),
-                        rotation=p1.rotation + t * (p2.rotation - p1.rotation),
-                        timestamp=p1.timestamp + t * (p2.timestamp - p1.timestamp),
-                        velocity=p1.velocity + t * (p2.velocity - p1.velocity),
-                    )
-                    new_points.append(new_point)
-                    break
+        array = self.to_array()
+        p1, p2 = array[segments], array[segments + 1]
+        new_points = self.points_from_array(p1 + t[:, None] * (p2 - p1))
         
         return Stroke(
             points=new_points,
@@ -168,20 +197,32 @@ class Stroke:
             metadata=self.metadata.copy()
         )
     
-    def to_dict(self) -> dict:
-        """Convert stroke to dictionary for serialization."""
+    def to_dict(self, compact: bool = False) -> dict:
+        """
+        Convert stroke to dictionary for serialization.
+        
+        Args:
+            compact: Store points as one (N, 8) array under "point_array"
+                instead of a list of per-point dictionaries
+        """
+        if compact:
+            point_data = {"point_array": self.to_array()}
+        else:
+            point_data = {
+                "points": [
+                    {
+                        "x": p.x, "y": p.y,
+                        "pressure": p.pressure,
+                        "tilt_x": p.tilt_x, "tilt_y": p.tilt_y,
+                        "rotation": p.rotation,
+                        "timestamp": p.timestamp,
+                        "velocity": p.velocity,
+                    }
+                    for p in self.points
+                ],
+            }
         return {
-            "points": [
-                {
-                    "x": p.x, "y": p.y,
-                    "pressure": p.pressure,
-                    "tilt_x": p.tilt_x, "tilt_y": p.tilt_y,
-                    "rotation": p.rotation,
-                    "timestamp": p.timestamp,
-                    "velocity": p.velocity,
-                }
-                for p in self.points
-            ],
+            **point_data,
             "stroke_type": self.stroke_type.value,
             "tool_id": self.tool_id,
             "layer_id": self.layer_id,
@@ -191,15 +232,18 @@ class Stroke:
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Stroke':
-        """Create stroke from dictionary."""
-        points = [
-            StrokePoint(**p) for p in data.get("points", [])
-        ]
+        """Create stroke from dictionary (regular or compact form)."""
+        if "point_array" in data:
+            points = cls.points_from_array(data["point_array"])
+        else:
+            points = [
+                StrokePoint(**p) for p in data.get("points", [])
+            ]
         return cls(
             points=points,
             stroke_type=StrokeType(data.get("stroke_type", "draw")),
             tool_id=data.get("tool_id"),
             layer_id=data.get("layer_id"),
             color=tuple(data["color"]) if data.get("color") else None,
-            metadata=data.get("metadata", {}),
+            metadata=dict(data.get("metadata", {})),
         )
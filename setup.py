@@ -39,6 +39,13 @@ setup(
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
         ],
+        "benchmark": [
+            "pytest-benchmark>=4.0",
+        ],
+        "fast-serialization": [
+            "msgpack>=1.0.0",
+            "zstandard>=0.21.0",
+        ],
     },
     entry_points={
         "console_scripts": [
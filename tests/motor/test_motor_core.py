@@ -65,6 +65,47 @@ class TestStroke:
         assert stroke2.tool_id == "test_tool"
         assert len(stroke2.points) == 1
         assert stroke2.points[0].x == 10
+    
+    def test_stroke_compact_serialization(self):
+        """Test stroke to/from compact dict with packed points."""
+        points = [
+            StrokePoint(x=10, y=20, pressure=0.5),
+            StrokePoint(x=30, y=40, tilt_x=0.2, timestamp=0.1, velocity=5.0),
+        ]
+        stroke = Stroke(points=points, tool_id="test_tool")
+        
+        data = stroke.to_dict(compact=True)
+        assert "points" not in data
+        assert data["point_array"].shape == (2, len(Stroke.POINT_FIELDS))
+        
+        stroke2 = Stroke.from_dict(data)
+        assert stroke2.points == points
+        assert stroke2.tool_id == "test_tool"
+        
+        # Packed points may also arrive as nested lists (e.g. from JSON)
+        data["point_array"] = data["point_array"].tolist()
+        assert Stroke.from_dict(data).points == points
+    
+    def test_stroke_resample(self):
+        """Test resampling interpolates every point field."""
+        stroke = Stroke(points=[
+            StrokePoint(x=0, y=0, pressure=0.0),
+            StrokePoint(x=0, y=0, pressure=0.0),  # Zero-length segment
+            StrokePoint(x=10, y=0, pressure=1.0, timestamp=1.0),
+            StrokePoint(x=10, y=20, pressure=0.0, timestamp=3.0),
+        ], tool_id="test_tool")
+        
+        resampled = stroke.resample(4)
+        
+        assert len(resampled.points) == 4
+        assert resampled.tool_id == "test_tool"
+        assert [p.x for p in resampled.points] == pytest.approx([0, 10, 10, 10])
+        assert [p.y for p in resampled.points] == pytest.approx([0, 0, 10, 20])
+        assert [p.pressure for p in resampled.points] == pytest.approx([0, 1, 0.5, 0])
+        assert [p.timestamp for p in resampled.points] == pytest.approx([0, 1, 2, 3])
+        
+        # Rounding must not drop the final point
+        assert len(Stroke(points=[StrokePoint(0, 0), StrokePoint(0.9, 0)]).resample(8).points) == 8
 
 
 class TestTool:
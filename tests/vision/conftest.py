@@ -0,0 +1,13 @@
+"""Shared fixtures for vision tests."""
+
+import pytest
+
+from vision import VisionModule
+
+
+@pytest.fixture(scope="session")
+def vision_module():
+    """Vision module with pose detection, shared across the test session."""
+    module = VisionModule(enable_pose=True)
+    yield module
+    module.close()
@@ -2,22 +2,83 @@
 
 import pytest
 import numpy as np
+import cv2
 from PIL import Image
+import io
+import subprocess
+import sys
 import tempfile
+import threading
 from pathlib import Path
 
 from vision import VisionModule
-from vision.core import ImageProcessor, PoseDetector, LandmarkDetector, Comparator
+from vision.core import ImageProcessor, GrabCutState, PoseDetector, LandmarkDetector, Comparator
+from vision.core.model_cache import SHARED_MODELS
+from vision.utils import GeometryUtils, ImageUtils
 from vision.models import (
+    AlignmentMetrics,
+    PoseMetrics,
+    ProportionMetrics,
     AnalysisResult,
     ComparisonResult,
     PoseData,
     PoseKeypoint,
     Landmark,
+    FaceLandmarks,
+    HandLandmarks,
     PoseLandmarks,
+    landmarks_to_array,
+    landmark_list_to_array,
+    to_pixel_coords_batch,
+    landmarks_pairwise_distance,
 )
 
 
+def _frozen(array: np.ndarray) -> np.ndarray:
+    """Mark a shared test image read-only so tests cannot mutate it."""
+    array.setflags(write=False)
+    return array
+
+
+# Shared read-only test images; copy before mutating
+_BLACK_100x200 = _frozen(np.zeros((100, 200, 3), dtype=np.uint8))
+_BLACK_150x200 = _frozen(np.zeros((150, 200, 3), dtype=np.uint8))
+_BLACK_100 = _frozen(np.zeros((100, 100, 3), dtype=np.uint8))
+_WHITE_100 = _frozen(np.full((100, 100, 3), 255, dtype=np.uint8))
+_WHITE_200 = _frozen(np.full((200, 200, 3), 255, dtype=np.uint8))
+_WHITE_400x300 = _frozen(np.full((400, 300, 3), 255, dtype=np.uint8))
+_GRAY_128 = _frozen(np.full((100, 100, 3), 128, dtype=np.uint8))
+_GRAY_200 = _frozen(np.full((100, 100, 3), 200, dtype=np.uint8))
+_GRAY_210 = _frozen(np.full((100, 100, 3), 210, dtype=np.uint8))
+
+
+class TestLazyImports:
+    """Test that heavy vision components are imported on demand."""
+    
+    def test_models_import_without_mediapipe(self):
+        """Test importing vision models does not load MediaPipe."""
+        code = (
+            "import sys\n"
+            "import vision.models\n"
+            "from vision.core.comparator import Comparator\n"
+            "assert 'mediapipe' not in sys.modules\n"
+            "from vision import PoseDetector\n"
+            "assert 'mediapipe' in sys.modules\n"
+        )
+        root = Path(__file__).resolve().parents[2]
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+    
+    def test_unknown_attribute(self):
+        """Test unknown attributes still raise AttributeError."""
+        import vision
+        
+        with pytest.raises(AttributeError):
+            vision.NotAComponent
+
+
 class TestImageProcessor:
     """Test ImageProcessor class."""
     
@@ -33,6 +94,20 @@ class TestImageProcessor:
         assert loaded.shape == (100, 100, 3)
         assert np.array_equal(loaded, img)
     
+    def test_load_numpy_channel_layouts(self):
+        """Test grayscale and RGBA arrays are converted to 3-channel BGR."""
+        processor = ImageProcessor()
+        gray = np.full((10, 12), 80, dtype=np.uint8)
+        
+        assert processor.load_image(gray).shape == (10, 12, 3)
+        assert processor.load_image(gray[:, :, None]).shape == (10, 12, 3)
+        
+        rgba = np.zeros((10, 12, 4), dtype=np.uint8)
+        rgba[..., 0] = 255  # Red
+        loaded = processor.load_image(rgba)
+        assert loaded.shape == (10, 12, 3)
+        assert loaded[0, 0].tolist() == [0, 0, 255]
+    
     def test_load_pil_image(self):
         """Test loading from PIL Image."""
         pil_img = Image.new('RGB', (100, 100), color='red')
@@ -44,9 +119,21 @@ class TestImageProcessor:
         # PIL uses RGB, OpenCV uses BGR
         assert loaded[0, 0, 2] == 255  # Red channel in BGR
     
+    def test_load_pil_modes(self):
+        """Test PIL images in other modes load as writable 3-channel BGR."""
+        processor = ImageProcessor()
+        
+        for mode, color in [('RGBA', (255, 0, 0, 128)), ('L', 200), ('P', 3), ('CMYK', (0, 255, 255, 0))]:
+            loaded = processor.load_image(Image.new(mode, (8, 6), color=color))
+            assert loaded.shape == (6, 8, 3), mode
+            assert loaded.flags.writeable, mode
+        
+        gray = processor.load_image(Image.new('L', (8, 6), color=200))
+        assert gray[0, 0].tolist() == [200, 200, 200]
+    
     def test_load_file_path(self):
         """Test loading from file path."""
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as f:
+        with tempfile.NamedTemporaryFile(suffix='.bmp', delete=False) as f:
             filepath = f.name
             
         try:
@@ -64,6 +151,89 @@ class TestImageProcessor:
         finally:
             Path(filepath).unlink(missing_ok=True)
     
+    def test_load_file_cached_decode(self):
+        """Test the opt-in file cache shares read-only images and sees rewrites."""
+        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as f:
+            filepath = f.name
+        
+        try:
+            Image.fromarray(np.zeros((20, 20, 3), dtype=np.uint8)).save(filepath)
+            
+            processor = ImageProcessor()
+            first = processor.load_image(filepath)
+            assert first.flags.writeable
+            assert processor.load_image(filepath) is not first
+            
+            cached = processor.load_image(filepath, cache=True)
+            assert not cached.flags.writeable
+            assert processor.load_image(filepath, cache=True) is cached
+            
+            # A rewritten file (different size on disk) is decoded again
+            Image.fromarray(np.full((30, 30, 3), 7, dtype=np.uint8)).save(filepath)
+            assert processor.load_image(filepath, cache=True).shape == (30, 30, 3)
+            
+            processor.clear_file_cache()
+            assert processor.load_image(filepath, cache=True) is not cached
+            processor.clear_file_cache()
+        finally:
+            Path(filepath).unlink(missing_ok=True)
+    
+    def test_load_jpeg_with_target_size(self):
+        """Test JPEG files decode at reduced scale when a target size is given."""
+        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as f:
+            filepath = f.name
+        
+        try:
+            img = np.zeros((400, 400, 3), dtype=np.uint8)
+            img[100:300, 100:300] = [0, 255, 0]  # Green square
+            Image.fromarray(img).save(filepath)
+            
+            processor = ImageProcessor()
+            full = processor.load_image(filepath)
+            reduced = processor.load_image(filepath, target_size=(100, 100))
+            
+            assert full.shape == (400, 400, 3)
+            assert reduced.shape == (100, 100, 3)
+            assert reduced[50, 50, 1] > 200  # Still green in the middle
+            
+            # EXIF rotation is applied as in the full-size path
+            exif = Image.Exif()
+            exif[0x0112] = 6
+            Image.fromarray(img[:200]).save(filepath, exif=exif)
+            assert processor.load_image(filepath).shape == (400, 200, 3)
+            assert processor.load_image(filepath, target_size=(50, 100)).shape == (100, 50, 3)
+            
+            # Undecodable files raise ValueError, not PIL errors
+            Path(filepath).write_bytes(b"not a jpeg")
+            with pytest.raises(ValueError):
+                processor.load_image(filepath, target_size=(100, 100))
+        finally:
+            Path(filepath).unlink(missing_ok=True)
+    
+    def test_load_encoded_bytes(self):
+        """Test loading from encoded bytes and binary streams."""
+        img = np.zeros((50, 40, 3), dtype=np.uint8)
+        img[10:40, 10:30] = [0, 255, 0]  # Green square
+        buffer = io.BytesIO()
+        Image.fromarray(img).save(buffer, format='BMP')
+        
+        processor = ImageProcessor()
+        from_bytes = processor.load_image(buffer.getvalue())
+        buffer.seek(0)
+        from_stream = processor.load_image(buffer)
+        
+        assert from_bytes.shape == (50, 40, 3)
+        assert np.array_equal(from_bytes, from_stream)
+        # RGB green stays green after conversion to BGR
+        assert from_bytes[20, 20].tolist() == [0, 255, 0]
+    
+    def test_load_invalid_bytes(self):
+        """Test undecodable bytes raise ValueError."""
+        processor = ImageProcessor()
+        
+        with pytest.raises(ValueError):
+            processor.load_image(b"not an image")
+    
     def test_to_rgb(self):
         """Test BGR to RGB conversion."""
         bgr_img = np.zeros((10, 10, 3), dtype=np.uint8)
@@ -76,6 +246,30 @@ class TestImageProcessor:
         assert rgb_img[0, 0, 1] == 0   # G
         assert rgb_img[0, 0, 2] == 255 # B
     
+    def test_to_rgb_reuse_buffer(self):
+        """Test RGB conversion into the per-thread scratch buffer."""
+        bgr_img = np.zeros((10, 10, 3), dtype=np.uint8)
+        bgr_img[:, :] = [255, 0, 0]
+        gray_img = np.full((10, 10), 7, dtype=np.uint8)
+        
+        first = ImageProcessor.to_rgb(bgr_img, reuse_buffer=True)
+        assert np.array_equal(first, ImageProcessor.to_rgb(bgr_img))
+        
+        second = ImageProcessor.to_rgb(gray_img, reuse_buffer=True)
+        assert second is first
+        assert np.all(second == 7)
+    
+    def test_copy_to(self):
+        """Test drawing canvases are copies, caller buffers or the image itself."""
+        img = np.full((4, 5, 3), 9, dtype=np.uint8)
+        buffer = np.zeros_like(img)
+        
+        copied = ImageProcessor.copy_to(img)
+        assert copied is not img and np.array_equal(copied, img)
+        assert ImageProcessor.copy_to(img, buffer) is buffer
+        assert np.array_equal(buffer, img)
+        assert ImageProcessor.copy_to(img, img) is img
+    
     def test_to_grayscale(self):
         """Test grayscale conversion."""
         img = np.zeros((10, 10, 3), dtype=np.uint8)
@@ -89,7 +283,7 @@ class TestImageProcessor:
     
     def test_resize_by_width(self):
         """Test resizing by width."""
-        img = np.zeros((100, 200, 3), dtype=np.uint8)
+        img = _BLACK_100x200
         
         processor = ImageProcessor()
         resized = processor.resize(img, width=100)
@@ -99,7 +293,7 @@ class TestImageProcessor:
     
     def test_resize_by_height(self):
         """Test resizing by height."""
-        img = np.zeros((100, 200, 3), dtype=np.uint8)
+        img = _BLACK_100x200
         
         processor = ImageProcessor()
         resized = processor.resize(img, height=50)
@@ -109,7 +303,7 @@ class TestImageProcessor:
     
     def test_resize_max_size(self):
         """Test resizing with max size."""
-        img = np.zeros((100, 200, 3), dtype=np.uint8)
+        img = _BLACK_100x200
         
         processor = ImageProcessor()
         resized = processor.resize(img, max_size=100)
@@ -119,7 +313,7 @@ class TestImageProcessor:
     def test_extract_silhouette(self):
         """Test silhouette extraction."""
         # Create image with clear foreground
-        img = np.ones((100, 100, 3), dtype=np.uint8) * 255  # White background
+        img = _WHITE_100.copy()  # White background
         img[25:75, 25:75] = [0, 0, 0]  # Black square
         
         processor = ImageProcessor()
@@ -129,10 +323,37 @@ class TestImageProcessor:
         # Center should be black (0) in mask
         assert mask[50, 50] == 0
     
+    def test_grabcut_state_carried_across_frames(self, monkeypatch):
+        """Test GrabCut refines the previous frame's mask with fewer iterations."""
+        frame = np.full((80, 80, 3), 255, dtype=np.uint8)
+        frame[20:60, 25:55] = [40, 60, 200]
+        
+        iterations = []
+        grab_cut = cv2.grabCut
+        monkeypatch.setattr(
+            cv2, "grabCut",
+            lambda img, mask, rect, bgd, fgd, count, mode: iterations.append((count, mode))
+            or grab_cut(img, mask, rect, bgd, fgd, count, mode)
+        )
+        
+        processor = ImageProcessor()
+        state = GrabCutState()
+        first = processor.extract_silhouette(frame, grabcut_state=state)
+        second = processor.extract_silhouette(frame, grabcut_state=state)
+        
+        assert iterations == [(5, cv2.GC_INIT_WITH_RECT), (2, cv2.GC_INIT_WITH_MASK)]
+        assert first[40, 40] == second[40, 40] == 255
+        assert first[2, 2] == second[2, 2] == 0
+        
+        # A new frame size starts over from the rectangle
+        processor.extract_silhouette(frame[:70, :70], grabcut_state=state)
+        assert iterations[-1] == (5, cv2.GC_INIT_WITH_RECT)
+        assert state.mask.shape == (70, 70)
+    
     def test_detect_edges(self):
         """Test edge detection."""
         # Create image with clear edge
-        img = np.ones((100, 100, 3), dtype=np.uint8) * 255
+        img = _WHITE_100.copy()
         img[:, 50:] = 0  # Half black
         
         processor = ImageProcessor()
@@ -142,9 +363,74 @@ class TestImageProcessor:
         # Should detect vertical edge around x=50
         assert np.sum(edges[:, 48:52]) > 0
     
+    def test_detect_edges_reuses_scratch_safely(self):
+        """Test repeated edge detection across sizes returns independent results."""
+        img = _WHITE_100.copy()
+        img[:, 50:] = 0
+        
+        processor = ImageProcessor()
+        first = processor.detect_edges(img)
+        expected = first.copy()
+        for size in (60, 70, 80, 90, 110, 120):
+            processor.detect_edges(np.zeros((size, size, 3), dtype=np.uint8))
+        second = processor.detect_edges(img)
+        
+        assert np.array_equal(first, expected)
+        assert np.array_equal(second, expected)
+        assert len(ImageProcessor._scratch.buffers) <= ImageProcessor.MAX_SCRATCH_ENTRIES
+    
+    def test_precomputed_grayscale(self):
+        """Test passing a precomputed grayscale image gives the same result."""
+        img = _WHITE_100.copy()
+        img[25:75, 25:75] = [0, 0, 0]
+        
+        processor = ImageProcessor()
+        gray = processor.to_grayscale(img)
+        
+        assert np.array_equal(
+            processor.extract_silhouette(img, method="threshold", gray=gray),
+            processor.extract_silhouette(img, method="threshold"),
+        )
+        assert np.array_equal(
+            processor.detect_edges(img, gray=gray),
+            processor.detect_edges(img),
+        )
+    
+    def test_compute_edges_and_mask(self):
+        """Test the fused edge/mask path matches the separate calls."""
+        img = _WHITE_100.copy()
+        img[25:75, 25:75] = [0, 0, 0]
+        
+        processor = ImageProcessor()
+        edges, mask = processor.compute_edges_and_mask(img, method="threshold")
+        
+        assert np.array_equal(edges, processor.detect_edges(img))
+        assert np.array_equal(mask, processor.extract_silhouette(img, method="threshold"))
+        
+        # Results must not alias the scratch buffers reused by the next call
+        edges_again, mask_again = processor.compute_edges_and_mask(_WHITE_100, method="threshold")
+        assert np.array_equal(edges, processor.detect_edges(img))
+        assert np.array_equal(mask, processor.extract_silhouette(img, method="threshold"))
+        assert not np.shares_memory(mask, mask_again)
+    
+    def test_normalize_roundtrip(self):
+        """Test normalizing to float32 and back restores the image."""
+        img = np.arange(256, dtype=np.uint8).reshape(16, 16)
+        
+        processor = ImageProcessor()
+        normalized = processor.normalize_image(img)
+        
+        assert normalized.dtype == np.float32
+        assert normalized.max() == 1.0
+        assert np.array_equal(processor.denormalize_image(normalized), img)
+        
+        # Out-of-range values saturate instead of wrapping around
+        assert processor.denormalize_image(np.array([[1.5, 0.5]], np.float32)).tolist() == [[255, 128]]
+        assert processor.denormalize_image(np.array([[-0.5, -2.0]])).tolist() == [[0, 0]]
+    
     def test_get_dimensions(self):
         """Test getting image dimensions."""
-        img = np.zeros((150, 200, 3), dtype=np.uint8)
+        img = _BLACK_150x200
         
         processor = ImageProcessor()
         width, height = processor.get_dimensions(img)
@@ -190,6 +476,66 @@ class TestPoseData:
         unknown = pose.get_keypoint("unknown")
         assert unknown is None
     
+    def test_as_array(self):
+        """Test stacking keypoint coordinates by name."""
+        pose = PoseData(keypoints=[
+            PoseKeypoint("nose", 0.5, 0.3, 0.1),
+            PoseKeypoint("left_shoulder", 0.4, 0.5),
+            PoseKeypoint("nose", 0.9, 0.9),  # Duplicate: first occurrence wins
+        ])
+        
+        coords, found = pose.as_array()
+        assert coords.shape == (3, 3)
+        assert found.all()
+        
+        coords, found = pose.as_array(["left_shoulder", "unknown", "nose"])
+        assert found.tolist() == [True, False, True]
+        np.testing.assert_array_equal(coords[0], [0.4, 0.5, 0.0])
+        assert np.isnan(coords[1]).all()
+        np.testing.assert_array_equal(coords[2], [0.5, 0.3, 0.1])
+        
+        assert PoseData().as_array()[0].shape == (0, 3)
+    
+    def test_pairwise_keypoint_distances(self):
+        """Test the distance matrix matches per-keypoint distance_to."""
+        keypoints = [PoseKeypoint(f"k{i}", *np.random.rand(3).tolist()) for i in range(6)]
+        pose = PoseData(keypoints=keypoints)
+        
+        distances = pose.pairwise_keypoint_distances()
+        
+        assert distances.shape == (6, 6)
+        assert np.allclose(distances, distances.T)
+        assert distances[1, 4] == pytest.approx(keypoints[1].distance_to(keypoints[4]))
+        subset = pose.pairwise_keypoint_distances(["k2", "missing"])
+        assert subset[0, 0] == 0.0 and np.isnan(subset[1]).all()
+        assert PoseData().pairwise_keypoint_distances().shape == (0, 0)
+    
+    def test_get_keypoint_index_tracks_mutation(self):
+        """Test keypoint lookup stays correct when keypoints change."""
+        pose = PoseData(keypoints=[PoseKeypoint("nose", 0.5, 0.3)])
+        assert pose.get_keypoint("nose").x == 0.5
+        assert pose.get_keypoint("left_hip") is None
+        
+        pose.keypoints.append(PoseKeypoint("left_hip", 0.4, 0.8))
+        assert pose.get_keypoint("left_hip").y == 0.8
+        
+        pose.keypoints = [PoseKeypoint("nose", 0.1, 0.2)]
+        assert pose.get_keypoint("nose").x == 0.1
+        assert pose.get_keypoint("left_hip") is None
+        
+        # Replacing or renaming a keypoint in place keeps the length
+        pose.keypoints[0] = PoseKeypoint("nose", 0.7, 0.2)
+        assert pose.get_keypoint("nose").x == 0.7
+        pose.keypoints[0].name = "neck"
+        assert pose.get_keypoint("nose") is None
+        assert pose.get_keypoint("neck").x == 0.7
+        assert pose.as_array(["neck"])[1].tolist() == [True]
+        pose.keypoints[0] = PoseKeypoint("nose", 0.1, 0.2)
+        
+        # The cache is not part of equality or serialization
+        assert pose == PoseData(keypoints=[PoseKeypoint("nose", 0.1, 0.2)])
+        assert "_by_name" not in pose.to_dict()
+    
     def test_calculate_bounds(self):
         """Test bounding box calculation."""
         keypoints = [
@@ -238,6 +584,201 @@ class TestPoseData:
         assert len(restored.keypoints) == 1
         assert restored.keypoints[0].name == "nose"
 
+    
+    def test_skeleton_edges_match_lines(self):
+        """Test skeleton index pairs describe the same lines as the names."""
+        from vision.models.pose_data import SKELETON_EDGES, SKELETON_KEYPOINTS
+        
+        pose = PoseData(keypoints=[])
+        named = [
+            (SKELETON_KEYPOINTS[start], SKELETON_KEYPOINTS[end])
+            for start, end in SKELETON_EDGES.tolist()
+        ]
+        
+        assert named == pose.get_skeleton_lines()
+        assert len(set(SKELETON_KEYPOINTS)) == len(SKELETON_KEYPOINTS)
+
+
+class TestResultModels:
+    """Test analysis result and comparison metric models."""
+    
+    def test_get_largest_differences(self):
+        """Test largest differences are ordered and ties keep insertion order."""
+        metrics = PoseMetrics(keypoint_differences={
+            "nose": 0.1, "left_wrist": 0.5, "right_wrist": 0.5, "left_knee": 0.3
+        })
+        
+        assert metrics.get_largest_differences(3) == [
+            ("left_wrist", 0.5), ("right_wrist", 0.5), ("left_knee", 0.3)
+        ]
+        assert len(metrics.get_largest_differences(10)) == 4
+        assert metrics.get_largest_differences(0) == []
+    
+    def test_silhouette_bit_packed(self):
+        """Test analysis results store the silhouette one bit per pixel."""
+        mask = np.zeros((37, 50), dtype=np.uint8)
+        mask[5:30, 10:41] = 255
+        result = AnalysisResult(image_width=50, image_height=37)
+        
+        assert result.silhouette is None
+        result.silhouette = mask
+        
+        assert result.silhouette_packed.nbytes == (mask.size + 7) // 8
+        assert result.silhouette.dtype == np.uint8
+        assert np.array_equal(result.silhouette, mask)
+        assert result.to_dict()["silhouette_shape"] == (37, 50)
+        
+        result.silhouette = None
+        assert result.silhouette is None
+        assert "silhouette_shape" not in result.to_dict()
+    
+    def test_silhouette_constructor_and_values(self):
+        """Test silhouettes can be passed in and keep their foreground value."""
+        mask = np.zeros((8, 10), dtype=np.uint8)
+        mask[2:6, 3:7] = 1
+        result = AnalysisResult(image_width=10, image_height=8, silhouette=mask)
+        
+        assert result.silhouette_packed.nbytes == 10
+        assert np.array_equal(result.silhouette, mask)
+        # Each read unpacks a new array; nothing full-size is kept
+        assert result.silhouette is not result.silhouette
+        result.silhouette[0, 0] = 1
+        assert result.silhouette[0, 0] == 0
+        
+        result.silhouette = mask.astype(bool)
+        assert result.silhouette.dtype == np.bool_
+        assert np.array_equal(result.silhouette, mask.astype(bool))
+    
+    def test_result_models_use_slots(self):
+        """Test result models carry no per-instance __dict__."""
+        comparison = ComparisonResult(
+            pose_metrics=PoseMetrics(), alignment_metrics=AlignmentMetrics(0.5, 0.2)
+        )
+        
+        assert not hasattr(AnalysisResult(), "__dict__")
+        assert not hasattr(comparison, "__dict__")
+        assert not hasattr(comparison.alignment_metrics, "__dict__")
+        with pytest.raises(AttributeError):
+            comparison.unknown_field = 1
+        
+        result = comparison.to_dict()
+        assert "pose_metrics" in result and "alignment_metrics" in result
+        assert "symmetry_metrics" not in result
+    
+    def test_get_major_issues(self):
+        """Test proportion issues are filtered by absolute deviation."""
+        metrics = ProportionMetrics(deviation_from_standard={
+            "head_to_body": 0.3, "torso_to_legs": -0.25, "thigh_to_shin": 0.1
+        })
+        
+        assert metrics.get_major_issues(0.2) == [
+            ("head_to_body", 0.3), ("torso_to_legs", -0.25)
+        ]
+    
+    def test_heatmap_quantized(self):
+        """Test alignment heatmaps are stored as uint8."""
+        scores = np.array([[0.0, 0.5], [1.0, 1.2]])
+        mask = np.array([[True, False], [False, True]])
+        
+        metrics = AlignmentMetrics(heatmap=scores)
+        masked = AlignmentMetrics(heatmap=mask)
+        
+        assert metrics.heatmap.dtype == np.uint8
+        assert metrics.heatmap.tolist() == [[0, 128], [255, 255]]
+        assert masked.heatmap.tolist() == [[255, 0], [0, 255]]
+        metrics.heatmap = None
+        assert metrics.heatmap is None
+
+
+class TestGeometryUtils:
+    """Test GeometryUtils scalar helpers."""
+    
+    def test_calculate_angle(self):
+        """Test angles at a vertex, including degenerate vectors."""
+        assert GeometryUtils.calculate_angle((1, 0), (0, 0), (0, 1)) == pytest.approx(90.0, abs=1e-3)
+        assert GeometryUtils.calculate_angle((1, 0), (0, 0), (-1, 0)) == pytest.approx(180.0)
+        assert GeometryUtils.calculate_angle((0, 0), (0, 0), (1, 1)) == pytest.approx(90.0)
+        assert GeometryUtils.calculate_angle((0.01, 0), (0, 0), (0, 0.01)) == pytest.approx(90.0)
+        assert isinstance(GeometryUtils.calculate_angle((1, 0), (0, 0), (0, 1)), float)
+    
+    def test_calculate_angles_batch(self):
+        """Test batched angles match the scalar helper, including degenerate rows."""
+        points = np.random.rand(12, 3, 2)
+        points[0, 0] = points[0, 1]
+        
+        angles = GeometryUtils.calculate_angles_batch(points[:, 0], points[:, 1], points[:, 2])
+        
+        assert angles[0] == 90.0
+        assert angles.tolist() == pytest.approx([
+            GeometryUtils.calculate_angle(*map(tuple, row)) for row in points
+        ])
+    
+    def test_polygon_area_and_rotation(self):
+        """Test array inputs match the scalar polygon and rotation helpers."""
+        square = [(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0)]
+        points = np.random.rand(40, 2)
+        
+        assert GeometryUtils.calculate_polygon_area(square) == 4.0
+        assert GeometryUtils.calculate_polygon_area(np.array(square)) == 4.0
+        assert GeometryUtils.calculate_polygon_area(points) == pytest.approx(
+            GeometryUtils.calculate_polygon_area([tuple(p) for p in points.tolist()])
+        )
+        
+        rotated = GeometryUtils.rotate_points(points, (0.5, 0.5), 30.0)
+        assert rotated.shape == (40, 2)
+        assert rotated.tolist() == [
+            pytest.approx(GeometryUtils.rotate_point(tuple(p), (0.5, 0.5), 30.0))
+            for p in points.tolist()
+        ]
+    
+    def test_calculate_distance(self):
+        """Test Euclidean distance between 2D points."""
+        assert GeometryUtils.calculate_distance((0, 0), (3, 4)) == 5.0
+    
+    def test_calculate_distances_batch(self):
+        """Test batched distances match the scalar helper."""
+        a = np.random.rand(16, 2)
+        b = np.random.rand(16, 2)
+        
+        distances = GeometryUtils.calculate_distances_batch(a, b)
+        
+        assert distances.shape == (16,)
+        assert distances.tolist() == pytest.approx([
+            GeometryUtils.calculate_distance(p, q) for p, q in zip(a, b)
+        ])
+
+
+class TestImageUtils:
+    """Test ImageUtils helpers."""
+    
+    def test_apply_mask(self):
+        """Test masked pixels keep the image and the rest get the background."""
+        image = np.random.randint(0, 256, (30, 40, 3), dtype=np.uint8)
+        mask = np.random.rand(30, 40) > 0.5
+        expected = np.where(mask[..., None], image, np.uint8(7))
+        
+        for m in (mask.astype(np.uint8) * 255, mask):
+            output = ImageUtils.apply_mask(image, m, (7, 7, 7))
+            assert np.array_equal(output, expected)
+            assert not np.shares_memory(output, image)
+    
+    def test_match_histogram(self):
+        """Test histogram matching maps levels to the nearest reference CDF value."""
+        rng = np.random.default_rng(0)
+        source = rng.integers(0, 4, (20, 30, 3), dtype=np.uint8) * 60
+        reference = rng.integers(200, 256, (20, 30, 3), dtype=np.uint8)
+        
+        matched = ImageUtils.match_histogram(source, reference)
+        
+        for c in range(3):
+            src_cdf = np.bincount(source[:, :, c].ravel(), minlength=256).cumsum() / source[:, :, c].size
+            ref_cdf = np.bincount(reference[:, :, c].ravel(), minlength=256).cumsum() / reference[:, :, c].size
+            lookup = np.array([np.argmin(np.abs(ref_cdf - v)) for v in src_cdf], dtype=np.uint8)
+            assert np.array_equal(matched[:, :, c], lookup[source[:, :, c]])
+        
+        gray = source[:, :, 0].copy()
+        assert np.array_equal(ImageUtils.match_histogram(gray, gray), gray)
+
 
 class TestLandmark:
     """Test Landmark class."""
@@ -268,6 +809,204 @@ class TestLandmark:
         dist = lm1.distance_to(lm2)
         
         assert abs(dist - 0.5) < 0.01  # 3-4-5 triangle
+    
+    def test_distance_to_many(self):
+        """Test batched distance calculation matches distance_to."""
+        lm = Landmark(x=0.0, y=0.0, z=0.0)
+        others = [Landmark(x=0.3, y=0.4), Landmark(x=0.1, y=0.2, z=0.2)]
+        
+        planar = lm.distance_to_many(np.array([[o.x, o.y] for o in others]))
+        spatial = lm.distance_to_many(np.array([[o.x, o.y, o.z] for o in others]))
+        
+        assert abs(planar[0] - 0.5) < 1e-9
+        assert np.allclose(spatial, [lm.distance_to(o) for o in others])
+    
+    def test_landmark_set_from_array(self):
+        """Test landmark sets expose their xyzv array through landmark views."""
+        xyzv = np.array(
+            [[0.1 * i, 0.2, 0.0, 0.5] for i in range(33)], dtype=np.float32
+        )
+        pose = PoseLandmarks(xyzv=xyzv, confidence=0.5)
+        
+        assert len(pose) == 33
+        assert np.shares_memory(pose.xyzv, xyzv)
+        assert pose.get_landmark(2).x == pytest.approx(0.2)
+        assert pose.get_landmark(40) is None
+        assert pose.to_dict()["landmarks"][1]["visibility"] == 0.5
+        
+        built = PoseLandmarks(
+            landmarks=[Landmark(*row) for row in xyzv.tolist()], confidence=0.5
+        )
+        assert built == pose
+        assert built.to_dict() == pose.to_dict()
+        assert pose.landmarks[3] == Landmark(*xyzv[3].tolist())
+        
+        pose.landmarks[2].x = 0.9
+        assert pose.xyzv[2, 0] == pytest.approx(0.9)
+        
+        pose.landmarks = [Landmark(x=0.5, y=0.5)]
+        assert pose.xyzv.shape == (1, 4)
+    
+    def test_landmark_set_keeps_input_values(self):
+        """Test landmarks keep their exact values and reject list edits."""
+        landmark = Landmark(0.1, 0.2, 0.3, 0.9)
+        face = FaceLandmarks(landmarks=[landmark])
+        
+        assert face.landmarks[0] == landmark
+        assert face.landmarks[0].x == 0.1
+        restored = FaceLandmarks(
+            landmarks=[Landmark.from_dict(d) for d in face.to_dict()["landmarks"]]
+        )
+        assert restored.to_dict() == face.to_dict() == {
+            "landmarks": [landmark.to_dict()], "confidence": 0.0
+        }
+        
+        # Appending would not reach the array, so the sequence is read-only
+        with pytest.raises(AttributeError):
+            face.landmarks.append(Landmark(0.5, 0.5))
+        assert len(face) == len(face.landmarks) == 1
+    
+    def test_landmarks_pairwise_distance(self):
+        """Test row-wise distances match per-landmark distance_to."""
+        a = PoseLandmarks(xyzv=np.random.rand(33, 4))
+        b = PoseLandmarks(xyzv=np.random.rand(33, 4))
+        
+        distances = landmarks_pairwise_distance(a.xyzv[:, :3], b.xyzv[:, :3])
+        
+        assert distances.shape == (33,)
+        assert distances.tolist() == pytest.approx([
+            p.distance_to(q) for p, q in zip(a.landmarks, b.landmarks)
+        ])
+        with pytest.raises(ValueError):
+            landmarks_pairwise_distance(a.xyzv, b.xyzv[:10])
+    
+    def test_landmark_set_take(self):
+        """Test row selection by index array and reuse of cached views."""
+        hand = HandLandmarks(xyzv=np.arange(84, dtype=np.float32).reshape(21, 4))
+        
+        tips = hand.take([4, 8, 12, 16, 20, 99])
+        
+        assert tips.shape == (5, 4)
+        assert np.array_equal(tips, hand.xyzv[[4, 8, 12, 16, 20]])
+        assert [lm.x for lm in hand.get_fingertips()] == tips[:, 0].tolist()
+        views = hand.landmarks
+        assert hand.get_wrist() is views[0]
+    
+    def test_landmark_set_pixel_coords(self):
+        """Test bulk pixel conversion matches per-landmark conversion."""
+        pose = PoseLandmarks(xyzv=np.random.rand(33, 4))
+        
+        pixels = pose.to_pixel_coords(640, 480)
+        
+        assert pixels.shape == (33, 2) and pixels.dtype == np.int32
+        assert [tuple(p) for p in pixels.tolist()] == [
+            lm.to_pixel_coords(640, 480) for lm in pose.landmarks
+        ]
+        
+        out = np.empty((33, 2), dtype=np.int32)
+        assert to_pixel_coords_batch(pose.xyzv[:, :2], 640, 480, out=out) is out
+        assert np.array_equal(out, pixels)
+    
+    def test_visualize_pose_out(self):
+        """Test pose drawing into a caller buffer or in place."""
+        detector = PoseDetector()
+        pose = PoseData(keypoints=[
+            PoseKeypoint("left_shoulder", 0.3, 0.3),
+            PoseKeypoint("left_elbow", 0.5, 0.6),
+        ])
+        image = np.zeros((60, 80, 3), dtype=np.uint8)
+        
+        drawn = detector.visualize_pose(image, pose)
+        assert not image.any()
+        
+        buffer = np.empty_like(image)
+        assert detector.visualize_pose(image, pose, out=buffer) is buffer
+        assert np.array_equal(buffer, drawn)
+        
+        assert detector.visualize_pose(image, pose, out=image) is image
+        assert np.array_equal(image, drawn)
+        detector.close()
+    
+    def test_stamp_dots_matches_circle(self):
+        """Test batched face dots draw the same pixels as cv2.circle."""
+        from vision.core.landmark_detector import _stamp_dots
+        
+        points = np.array([[0, 0], [50, 40], [99, 79], [120, 10], [-1, 5]], dtype=np.int32)
+        expected = np.zeros((80, 100, 3), dtype=np.uint8)
+        for pt in points.tolist():
+            cv2.circle(expected, pt, 1, (0, 255, 0), -1)
+        
+        stamped = np.zeros_like(expected)
+        _stamp_dots(stamped, points, (0, 255, 0))
+        
+        assert np.array_equal(stamped, expected)
+    
+    def test_landmarks_to_array(self):
+        """Test stacking landmark-like objects into an (N, 4) array."""
+        points = [Landmark(x=0.1, y=0.2, z=0.3, visibility=0.4)] * 3
+        
+        xyzv = landmarks_to_array(points)
+        flat = landmarks_to_array(points, with_visibility=False)
+        
+        assert xyzv.shape == (3, 4) and xyzv.dtype == np.float32
+        assert np.allclose(xyzv[0], [0.1, 0.2, 0.3, 0.4])
+        assert np.all(flat[:, 3] == 1.0)
+        assert landmarks_to_array([]).shape == (0, 4)
+        
+        hand = HandLandmarks(xyzv=np.random.rand(21, 4), handedness="Left")
+        tips = hand.get_fingertips()
+        assert len(tips) == 5
+        assert tips[1].x == pytest.approx(float(hand.xyzv[8, 0]))
+        
+        face = FaceLandmarks(xyzv=np.random.rand(468, 4))
+        contour = face.get_contour()
+        assert len(contour) == 36
+        assert contour[0].x == pytest.approx(float(face.xyzv[10, 0]))
+        assert len(FaceLandmarks(xyzv=np.zeros((17, 4))).get_contour()) == 1
+    
+    def test_landmark_list_to_array(self):
+        """Test converting landmark protobufs matches attribute access."""
+        from mediapipe.framework.formats import landmark_pb2
+        
+        rng = np.random.default_rng(0)
+        message = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z, v in rng.random((33, 4)):
+            message.landmark.add(x=x, y=y, z=z, visibility=v, presence=v)
+        no_visibility = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z in rng.random((468, 3)):
+            no_visibility.landmark.add(x=x, y=y, z=z)
+        mixed = landmark_pb2.NormalizedLandmarkList()
+        mixed.CopyFrom(no_visibility)
+        mixed.landmark[5].visibility = 0.5
+        mixed.landmark[7].presence = 0.25
+        
+        for msg in (message, no_visibility, mixed, landmark_pb2.NormalizedLandmarkList()):
+            for with_visibility in (True, False):
+                xyzv = landmark_list_to_array(msg, with_visibility)
+                assert xyzv.dtype == np.float32 and xyzv.shape == (len(msg.landmark), 4)
+                assert np.array_equal(xyzv, landmarks_to_array(msg.landmark, with_visibility))
+    
+    def test_pose_data_from_array(self):
+        """Test building PoseData from a landmark array."""
+        xyzv = np.array([[0.1, 0.2, 0.3, 0.5], [0.4, 0.5, 0.6, 1.0], [0, 0, 0, 0]])
+        
+        pose = PoseData.from_array(["nose", "neck"], xyzv, image_width=64, image_height=48)
+        
+        assert pose.get_keypoint_names() == ["nose", "neck"]
+        assert pose.get_keypoint("neck").x == pytest.approx(0.4)
+        assert pose.confidence == pytest.approx(0.75)
+        assert (pose.image_width, pose.image_height) == (64, 48)
+        assert PoseData.from_array([], xyzv).confidence == 0.0
+    
+    def test_face_contour_matches_mediapipe_oval(self):
+        """Test the contour loop follows MediaPipe's face-oval edges."""
+        import mediapipe as mp
+        from vision.models.landmarks import FACE_CONTOUR_INDICES
+        
+        loop = FACE_CONTOUR_INDICES.tolist()
+        edges = set(zip(loop, loop[1:] + loop[:1]))
+        
+        assert edges == set(mp.solutions.face_mesh.FACEMESH_FACE_OVAL)
 
 
 class TestComparator:
@@ -291,6 +1030,26 @@ class TestComparator:
         assert metrics.overall_difference < 0.01
         assert len(metrics.missing_keypoints) == 0
     
+    def test_angle_differences(self):
+        """Test joint angle differences, skipping joints with missing keypoints."""
+        straight_arm = PoseData(keypoints=[
+            PoseKeypoint("left_shoulder", 0.0, 0.0),
+            PoseKeypoint("left_elbow", 1.0, 0.0),
+            PoseKeypoint("left_wrist", 2.0, 0.0),
+            PoseKeypoint("right_shoulder", 0.0, 1.0),
+        ])
+        bent_arm = PoseData(keypoints=[
+            PoseKeypoint("left_shoulder", 0.0, 0.0),
+            PoseKeypoint("left_elbow", 1.0, 0.0),
+            PoseKeypoint("left_wrist", 1.0, 1.0),
+            PoseKeypoint("right_shoulder", 0.0, 1.0),
+        ])
+        
+        metrics = Comparator().compare_poses(straight_arm, bent_arm, normalize=False)
+        
+        assert set(metrics.angle_differences) == {"left_elbow"}
+        assert metrics.angle_differences["left_elbow"] == pytest.approx(0.5, abs=1e-3)
+    
     def test_compare_different_poses(self):
         """Test comparing different poses."""
         pose1 = PoseData(keypoints=[
@@ -321,6 +1080,55 @@ class TestComparator:
         
         assert 0 <= metrics.overall_score <= 1
         assert isinstance(metrics.body_ratios, dict)
+        
+        # Head: nose to shoulder center (0.2) over nose to ankle (sqrt(0.65))
+        assert metrics.body_ratios["head_to_body"] == pytest.approx(0.2 / np.sqrt(0.65))
+        assert metrics.issues == [
+            f"Head proportion off by {metrics.deviation_from_standard['head_to_body']:.2%}"
+        ]
+    
+    def test_analyze_limb_proportions(self):
+        """Test limb ratios are reported and scored against the standards."""
+        keypoints = [
+            PoseKeypoint("left_shoulder", 0.4, 0.2),
+            PoseKeypoint("left_elbow", 0.4, 0.35),
+            PoseKeypoint("left_wrist", 0.4, 0.45),
+            PoseKeypoint("left_hip", 0.4, 0.5),
+            PoseKeypoint("left_knee", 0.4, 0.7),
+            PoseKeypoint("left_ankle", 0.4, 0.9),
+        ]
+        metrics = Comparator().analyze_proportions(PoseData(keypoints=keypoints))
+        
+        assert metrics.body_ratios["upper_arm_to_forearm"] == pytest.approx(1.5)
+        assert metrics.body_ratios["thigh_to_shin"] == pytest.approx(1.0)
+        assert metrics.body_ratios["torso_to_legs"] == pytest.approx(0.75)
+        assert "head_to_body" not in metrics.body_ratios
+        assert len(metrics.issues) == 2
+        # Average absolute deviation is (0.25 + 0.5 + 0) / 3
+        assert metrics.overall_score == pytest.approx(max(0.0, 1.0 - 0.25 * 5))
+        
+        # Ratios without a standard are reported but not scored
+        custom = Comparator().analyze_proportions(
+            PoseData(keypoints=keypoints), standard_ratios={"thigh_to_shin": 1.0}
+        )
+        assert set(custom.deviation_from_standard) == {"thigh_to_shin"}
+        assert custom.overall_score == pytest.approx(1.0)
+    
+    def test_body_segments(self):
+        """Test segment lengths and skipping of segments with missing endpoints."""
+        keypoints = [
+            PoseKeypoint("nose", 0.5, 0.1),
+            PoseKeypoint("left_shoulder", 0.4, 0.3),
+            PoseKeypoint("right_shoulder", 0.6, 0.3),
+            PoseKeypoint("left_hip", 0.4, 0.6),
+            PoseKeypoint("right_ankle", 0.6, 0.9),
+        ]
+        segments = Comparator()._calculate_body_segments(PoseData(keypoints=keypoints))
+        
+        assert set(segments) == {"head_height", "total_height", "torso_length"}
+        assert segments["head_height"] == pytest.approx(0.2)
+        assert segments["total_height"] == pytest.approx(np.sqrt(0.65))
+        assert segments["torso_length"] == pytest.approx(0.3)
     
     def test_analyze_symmetry(self):
         """Test symmetry analysis."""
@@ -338,6 +1146,27 @@ class TestComparator:
         assert 0 <= metrics.symmetry_score <= 1
         assert metrics.symmetry_axis is not None
     
+    def test_analyze_symmetry_pairs(self):
+        """Test per-pair differences skip incomplete pairs."""
+        keypoints = [
+            PoseKeypoint("left_shoulder", 0.2, 0.3),
+            PoseKeypoint("right_shoulder", 0.8, 0.3),
+            PoseKeypoint("left_wrist", 0.0, 0.5),
+            PoseKeypoint("right_wrist", 0.6, 0.5),
+            PoseKeypoint("left_knee", 1.0, 0.8),
+        ]
+        pose = PoseData(keypoints=keypoints)
+        
+        metrics = Comparator().analyze_symmetry(pose)
+        
+        assert set(metrics.left_right_differences) == {
+            "left_shoulder_right_shoulder",
+            "left_wrist_right_wrist",
+        }
+        assert abs(metrics.left_right_differences["left_shoulder_right_shoulder"]) < 1e-9
+        assert abs(metrics.left_right_differences["left_wrist_right_wrist"] - 0.4) < 1e-9
+        assert metrics.asymmetric_features == ["left_wrist/right_wrist"]
+    
     def test_edge_alignment(self):
         """Test edge alignment calculation."""
         # Create two edge maps
@@ -352,6 +1181,162 @@ class TestComparator:
         
         assert metrics.alignment_score > 0.8  # Should be well aligned
         assert metrics.edge_overlap > 0.9
+    
+    def test_edge_alignment_counts(self):
+        """Test alignment metrics derived from edge pixel counts."""
+        edges1 = np.zeros((100, 100), dtype=np.uint8)
+        edges1[0:20, 0:20] = 255
+        edges2 = np.zeros((100, 100), dtype=np.uint8)
+        edges2[0:20, 10:30] = 255  # Half overlapping
+        
+        comparator = Comparator()
+        metrics = comparator.calculate_edge_alignment(edges1, edges2)
+        
+        # 200 overlapping pixels of 400 per map; 400 pixels misaligned
+        assert metrics.edge_overlap == pytest.approx(0.5)
+        assert metrics.alignment_score == pytest.approx(1.0 - 400 / 10000)
+        assert metrics.heatmap.dtype == np.uint8
+        assert np.count_nonzero(metrics.heatmap) == 400
+        assert set(np.unique(metrics.heatmap).tolist()) == {0, 255}
+        assert metrics.misaligned_regions
+        
+        no_heatmap = comparator.calculate_edge_alignment(edges1, edges2, return_heatmap=False)
+        assert no_heatmap.heatmap is None
+        assert no_heatmap.misaligned_regions == metrics.misaligned_regions
+    
+    def test_edge_alignment_reuses_buffers(self):
+        """Test repeated same-size comparisons reuse scratch buffers safely."""
+        edges1 = np.zeros((60, 60), dtype=np.uint8)
+        edges1[10:40, 10:40] = 255
+        edges2 = np.zeros((60, 60), dtype=np.uint8)
+        
+        comparator = Comparator()
+        first = comparator.calculate_edge_alignment(edges1, edges2)
+        buffers = dict(comparator._scratch.buffers)
+        
+        second = comparator.calculate_edge_alignment(edges1, edges1)
+        assert all(comparator._scratch.buffers[slot] is buf for slot, buf in buffers.items())
+        
+        # Earlier results are not overwritten by later calls
+        assert np.count_nonzero(first.heatmap) == 900
+        assert np.count_nonzero(second.heatmap) == 0
+        
+        # Mismatched sizes are resized into their own buffer
+        resized = comparator.calculate_edge_alignment(edges1, edges1[::2, ::2])
+        assert resized.edge_overlap > 0.8
+        assert comparator._scratch.buffers["resized"].shape == edges1.shape
+        
+        # Other threads sharing the comparator get their own buffers
+        other = {}
+        thread = threading.Thread(
+            target=lambda: other.update(
+                mask1=comparator._get_scratch_buffer("mask1", edges1.shape, np.uint8)
+            )
+        )
+        thread.start()
+        thread.join()
+        assert other["mask1"] is not comparator._scratch.buffers["mask1"]
+    
+    def test_edge_alignment_lazy_outputs(self, monkeypatch):
+        """Test regions are only labelled when read, from a detached heatmap."""
+        edges1 = np.zeros((100, 100), dtype=np.uint8)
+        edges1[10:40, 10:40] = 255
+        edges2 = np.zeros((100, 100), dtype=np.uint8)
+        
+        comparator = Comparator()
+        calls = []
+        find_regions = comparator._find_misaligned_regions
+        monkeypatch.setattr(
+            comparator, "_find_misaligned_regions",
+            lambda mask, min_area: calls.append(mask) or find_regions(mask, min_area)
+        )
+        
+        metrics = comparator.calculate_edge_alignment(edges1, edges2)
+        assert metrics.alignment_score == pytest.approx(1.0 - 900 / 10000)
+        assert calls == []
+        assert metrics.to_dict()["heatmap_shape"] == (100, 100)
+        
+        # Later edits and calls must not leak into the result
+        edges1[:] = 0
+        comparator.calculate_edge_alignment(edges2, edges2)
+        
+        assert metrics.misaligned_regions == [(10, 10, 30, 30)]
+        assert metrics.misaligned_regions == [(10, 10, 30, 30)]
+        assert len(calls) == 1
+        # The regions and heatmap share one XOR mask
+        assert metrics.heatmap is calls[0]
+        
+        # Eagerly supplied values are returned as-is
+        plain = AlignmentMetrics(alignment_score=0.5, misaligned_regions=[(0, 0, 1, 1)])
+        assert plain.heatmap is None
+        assert plain.get_worst_regions(1) == [(0, 0, 1, 1)]
+        assert plain.to_dict()["misaligned_regions"] == [(0, 0, 1, 1)]
+    
+    def test_edge_alignment_resizes_binary_maps(self):
+        """Test mismatched edge maps are resized without blurring edges."""
+        edges1 = np.zeros((100, 100), dtype=np.uint8)
+        edges1[20:60, 40:80] = 255
+        
+        comparator = Comparator()
+        for edges2 in (edges1[::2, ::2], edges1[::2, ::2] > 0):
+            metrics = comparator.calculate_edge_alignment(edges1, edges2)
+            assert metrics.edge_overlap == 1.0
+            assert metrics.alignment_score == 1.0
+    
+    def test_edge_alignment_downsample(self):
+        """Test downsampled alignment keeps the statistics and full-res boxes."""
+        edges1 = np.zeros((200, 200), dtype=np.uint8)
+        edges1[40:160, 40:160] = 255
+        edges2 = np.zeros((200, 200), dtype=np.uint8)
+        edges2[40:160, 100:160] = 255
+        
+        comparator = Comparator()
+        full = comparator.calculate_edge_alignment(edges1, edges2)
+        small = comparator.calculate_edge_alignment(edges1, edges2, downsample=4)
+        
+        assert small.edge_overlap == pytest.approx(full.edge_overlap)
+        assert small.alignment_score == pytest.approx(full.alignment_score)
+        assert small.heatmap.shape == (50, 50)
+        assert small.misaligned_regions == full.misaligned_regions == [(40, 40, 60, 120)]
+        
+        # A lone edge pixel still counts after shrinking its block
+        speck = np.zeros((64, 64), dtype=bool)
+        speck[3, 3] = True
+        assert comparator.calculate_edge_alignment(speck, speck, downsample=16).edge_overlap == 1.0
+        
+        with pytest.raises(ValueError):
+            comparator.calculate_edge_alignment(edges1, edges2, downsample=0)
+    
+    def test_find_misaligned_regions(self):
+        """Test regions are filtered by pixel area and sorted largest first."""
+        mask = np.zeros((100, 100), dtype=bool)
+        mask[5:15, 5:15] = True      # 100 pixels
+        mask[50:80, 40:60] = True    # 600 pixels
+        mask[90:95, 90:95] = True    # 25 pixels, below min_area
+        
+        regions = Comparator()._find_misaligned_regions(mask)
+        
+        assert regions == [(40, 50, 20, 30), (5, 5, 10, 10)]
+        assert Comparator()._find_misaligned_regions(mask.astype(np.float32)) == regions
+        assert Comparator()._find_misaligned_regions(np.zeros((10, 10), dtype=bool)) == []
+    
+    def test_edge_alignment_non_binary_maps(self):
+        """Test any nonzero value counts as an edge, whatever the dtype."""
+        edges1 = np.zeros((50, 50), dtype=np.uint8)
+        edges1[10:20, 10:20] = 1
+        edges2 = np.zeros((50, 50), dtype=np.uint8)
+        edges2[10:20, 10:20] = 2
+        
+        comparator = Comparator()
+        metrics = comparator.calculate_edge_alignment(edges1, edges2)
+        assert metrics.edge_overlap == 1.0
+        assert metrics.alignment_score == 1.0
+        
+        float_metrics = comparator.calculate_edge_alignment(
+            edges1.astype(np.float64) * 0.5, edges2 > 0
+        )
+        assert float_metrics.edge_overlap == 1.0
+        assert np.count_nonzero(float_metrics.heatmap) == 0
 
 
 class TestVisionModule:
@@ -368,7 +1353,7 @@ class TestVisionModule:
     def test_analyze_simple_image(self):
         """Test analyzing a simple image."""
         # Create a simple test image
-        img = np.ones((200, 200, 3), dtype=np.uint8) * 255
+        img = _WHITE_200
         
         vision = VisionModule()
         result = vision.analyze(img)
@@ -378,24 +1363,63 @@ class TestVisionModule:
         assert result.image_height == 200
         assert result.processing_time_ms > 0
     
-    def test_analyze_with_pose_stick_figure(self):
+    def test_detector_pool_reused_and_closed(self):
+        """Test detectors share one thread pool that close() shuts down."""
+        vision = VisionModule()
+        pool = vision._detector_pool
+        
+        vision.analyze(_WHITE_200)
+        vision.analyze(_WHITE_200)
+        assert vision._detector_pool is pool
+        
+        vision.close()
+        assert vision._detector_pool is None
+        assert pool._shutdown
+        vision.close()
+    
+    def test_analyze_with_pose_stick_figure(self, vision_module):
         """Test analyzing image with simple pose representation."""
         # Create image with a simple stick figure pattern
-        img = np.ones((400, 300, 3), dtype=np.uint8) * 255
+        img = _WHITE_400x300
         # Draw a simple stick figure (this won't actually be detected as a pose)
         # but tests the pipeline
         
-        vision = VisionModule(enable_pose=True)
+        vision = vision_module
         result = vision.analyze(img, extract_silhouette=True, detect_edges=True)
         
         assert result.silhouette is not None
         assert result.edges is not None
     
-    def test_compare_identical_images(self):
+    def test_analyze_runs_detectors_concurrently(self, vision_module, monkeypatch):
+        """Test analyze runs each detector once on one shared RGB frame."""
+        import threading
+        
+        calls = []
+        
+        def recorder(name, value):
+            def detect(image, rgb=None):
+                calls.append((name, threading.get_ident(), rgb))
+                return value
+            return detect
+        
+        pose = PoseData([PoseKeypoint("nose", 0.5, 0.5, confidence=0.7)], confidence=0.7)
+        monkeypatch.setattr(vision_module.pose_detector, "detect_with_landmarks", recorder("pose", (pose, None)))
+        monkeypatch.setattr(vision_module.landmark_detector, "detect_face", recorder("face", None))
+        monkeypatch.setattr(vision_module.landmark_detector, "detect_hands", recorder("hands", []))
+        
+        result = vision_module.analyze(_GRAY_128, extract_silhouette=False, detect_edges=False)
+        
+        assert sorted(name for name, _, _ in calls) == ["face", "hands", "pose"]
+        assert threading.get_ident() not in {thread for _, thread, _ in calls}
+        assert all(rgb is calls[0][2] for _, _, rgb in calls)
+        assert result.pose is pose
+        assert result.detection_confidence == pytest.approx(0.7)
+    
+    def test_compare_identical_images(self, vision_module):
         """Test comparing identical images."""
-        img = np.ones((100, 100, 3), dtype=np.uint8) * 128
+        img = _GRAY_128
         
-        vision = VisionModule(enable_pose=True)
+        vision = vision_module
         comparison = vision.compare_to(img, img)
         
         assert isinstance(comparison, ComparisonResult)
@@ -403,34 +1427,53 @@ class TestVisionModule:
         # (may not be 1.0 if no features detected)
         assert comparison.overall_similarity >= 0.4
     
-    def test_compare_different_images(self):
+    def test_compare_identical_images_analyzes_once(self, vision_module, monkeypatch):
+        """Test identical inputs are analyzed only once."""
+        img = _GRAY_128
+        calls = []
+        original_analyze = vision_module.analyze
+        
+        def counting_analyze(*args, **kwargs):
+            calls.append(1)
+            return original_analyze(*args, **kwargs)
+        
+        monkeypatch.setattr(vision_module, "analyze", counting_analyze)
+        
+        vision_module.compare_to(img, img)
+        vision_module.compare_to(img, img.copy())
+        assert len(calls) == 2
+        
+        vision_module.compare_to(img, img + 1)
+        assert len(calls) == 4
+    
+    def test_compare_different_images(self, vision_module):
         """Test comparing different images."""
-        img1 = np.ones((100, 100, 3), dtype=np.uint8) * 255  # White
-        img2 = np.zeros((100, 100, 3), dtype=np.uint8)  # Black
+        img1 = _WHITE_100
+        img2 = _BLACK_100
         
-        vision = VisionModule(enable_pose=True)
+        vision = vision_module
         comparison = vision.compare_to(img1, img2)
         
         assert isinstance(comparison, ComparisonResult)
         # Different images should have similarity <= 1.0
         assert comparison.overall_similarity <= 1.0
     
-    def test_detect_pose_errors(self):
+    def test_detect_pose_errors(self, vision_module):
         """Test pose error detection."""
-        img = np.ones((100, 100, 3), dtype=np.uint8) * 200
+        img = _GRAY_200
         
-        vision = VisionModule(enable_pose=True)
+        vision = vision_module
         errors = vision.detect_pose_errors(img)
         
         assert isinstance(errors, list)
         # May contain "No pose detected" or other errors
     
-    def test_highlight_areas_needing_refinement(self):
+    def test_highlight_areas_needing_refinement(self, vision_module):
         """Test highlighting refinement areas."""
-        img1 = np.ones((100, 100, 3), dtype=np.uint8) * 200
-        img2 = np.ones((100, 100, 3), dtype=np.uint8) * 210
+        img1 = _GRAY_200
+        img2 = _GRAY_210
         
-        vision = VisionModule(enable_pose=True)
+        vision = vision_module
         areas = vision.highlight_areas_needing_refinement(img1, img2)
         
         assert isinstance(areas, list)
@@ -440,6 +1483,108 @@ class TestVisionModule:
         vision = VisionModule()
         vision.close()
         # Should not raise errors
+    
+    def test_pose_model_shared_between_detectors(self):
+        """Test detectors with the same config share one MediaPipe graph."""
+        detector1 = PoseDetector()
+        detector2 = PoseDetector()
+        
+        assert detector1.pose is detector2.pose
+        
+        detector1.close()
+        # Remaining detector keeps a usable graph
+        img = _GRAY_200
+        assert detector2.detect(img) is None
+        detector2.close()
+    
+    def test_landmark_models_shared_between_detectors(self):
+        """Test image-mode landmark detectors share their MediaPipe graphs."""
+        detector1 = LandmarkDetector()
+        detector2 = LandmarkDetector()
+        tracker = LandmarkDetector(mode="video")
+        
+        assert detector1.face_mesh is detector2.face_mesh
+        assert detector1.hands is detector2.hands
+        assert tracker.face_mesh is not detector1.face_mesh
+        
+        detector1.close()
+        detector1.close()
+        # Remaining detector keeps usable graphs
+        assert detector2.detect_face(_GRAY_200) is None
+        assert detector2.detect_hands(_GRAY_200) == []
+        detector2.close()
+        tracker.close()
+    
+    def test_pose_detect_batch(self):
+        """Test batched detection returns one result per image in order."""
+        detector = PoseDetector()
+        images = [_GRAY_200, _BLACK_100, _WHITE_100]
+        
+        assert detector.detect_batch(images, max_workers=2) == [None, None, None]
+        assert detector.detect_batch([], max_workers=2) == []
+        assert detector.detect(_GRAY_200) is None
+        
+        # Extra worker graphs are pooled across calls until close
+        pooled = detector._batch_models[0].model
+        assert detector.detect_batch(images) == [None, None, None]
+        assert detector._batch_models[0].model is pooled
+        detector.close()
+        assert detector._batch_key(1) not in SHARED_MODELS
+    
+    def test_pose_detect_streaming(self):
+        """Test streaming detection tracks frames with one video graph."""
+        image_detector = PoseDetector()
+        video_detector = PoseDetector(mode="video")
+        frames = [_GRAY_200, _BLACK_100, _GRAY_200]
+        
+        assert list(image_detector.detect_streaming(frames)) == [None, None, None]
+        assert list(video_detector.detect_streaming(frames)) == [None, None, None]
+        assert video_detector.pose is not image_detector.pose
+        assert image_detector.detect(_GRAY_200) is None
+        
+        image_detector.close()
+        video_detector.close()
+        
+        with pytest.raises(ValueError):
+            PoseDetector(mode="live")
+    
+    def test_pose_detect_streaming_prefetch(self):
+        """Test prefetched streaming reads frames ahead and re-raises errors."""
+        import threading
+        
+        readers = []
+        
+        def frames():
+            for frame in [_GRAY_200, _BLACK_100, _GRAY_200]:
+                readers.append(threading.get_ident())
+                yield frame
+            raise IOError("camera disconnected")
+        
+        detector = PoseDetector(mode="video")
+        stream = detector.detect_streaming(frames(), prefetch=2)
+        
+        assert [next(stream) for _ in range(3)] == [None, None, None]
+        with pytest.raises(IOError):
+            next(stream)
+        assert threading.get_ident() not in readers
+        
+        detector.close()
+    
+    def test_pose_tasks_backend_options(self):
+        """Test the Tasks backend validates its model options."""
+        with pytest.raises(ValueError):
+            PoseDetector(use_gpu=True)
+        with pytest.raises(RuntimeError):
+            PoseDetector(model_asset_path="/nonexistent/pose_landmarker.task")
+    
+    def test_landmark_detect_streaming(self):
+        """Test streaming face and hand detection yields one result per frame."""
+        detector = LandmarkDetector(mode="video")
+        
+        results = list(detector.detect_streaming([_GRAY_200, _BLACK_100]))
+        
+        assert results == [(None, []), (None, [])]
+        detector.close()
 
 
 # Run tests
@@ -0,0 +1,43 @@
+"""Benchmarks for DecisionLogger aggregate queries.
+
+Requires the ``benchmark`` extra (pytest-benchmark). Run with:
+
+    pytest tests/workflow/benchmarks --benchmark-only
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from workflow.models.drawing_phase import DrawingPhase
+from workflow.models.stroke_intent import StrokeIntent
+from workflow.core.decision_logger import DecisionLogger
+
+
+NUM_PHASES = 1000
+STROKES_PER_PHASE = 100
+
+
+@pytest.fixture(scope="module")
+def long_session_logger():
+    """A logger seeded with NUM_PHASES phases of STROKES_PER_PHASE strokes each."""
+    logger = DecisionLogger()
+    for p in range(NUM_PHASES):
+        logger.start_phase(DrawingPhase.SKETCH)
+        for i in range(STROKES_PER_PHASE):
+            logger.log_stroke(f"s{p}_{i}", StrokeIntent.GESTURE, DrawingPhase.SKETCH)
+    return logger
+
+
+@pytest.mark.benchmark(group="aggregate")
+def test_workflow_summary_benchmark(benchmark, long_session_logger):
+    """Benchmark get_workflow_summary over a long session."""
+    summary = benchmark(long_session_logger.get_workflow_summary)
+    assert summary["total_strokes"] == NUM_PHASES * STROKES_PER_PHASE
+
+
+@pytest.mark.benchmark(group="aggregate")
+def test_all_strokes_benchmark(benchmark, long_session_logger):
+    """Benchmark get_all_strokes over a long session."""
+    strokes = benchmark(long_session_logger.get_all_strokes)
+    assert len(strokes) == NUM_PHASES * STROKES_PER_PHASE
@@ -0,0 +1,56 @@
+"""Shared pytest configuration and fixtures for workflow tests."""
+
+from datetime import datetime
+
+import pytest
+
+from workflow.models.drawing_phase import DrawingPhase
+from workflow.models.stroke_intent import StrokeIntent
+from motor.core.canvas import Canvas
+from workflow.core.decision_logger import DecisionLogger
+from workflow.core.workflow_executor import WorkflowExecutor
+
+
+def pytest_configure(config):
+    """Register markers used to select test subsets."""
+    config.addinivalue_line("markers", "fast: trivial checks suitable for inner-loop runs")
+    config.addinivalue_line("markers", "slow: serialization round-trips and other heavier tests")
+
+
+@pytest.fixture(scope="session")
+def now():
+    """Fixed timestamp for tests that build decisions and logs directly."""
+    return datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def make_logger():
+    """Factory for a fresh DecisionLogger that has already started a phase."""
+    def _make_logger(phase=DrawingPhase.SKETCH):
+        logger = DecisionLogger()
+        logger.start_phase(phase)
+        return logger
+    return _make_logger
+
+
+@pytest.fixture(scope="class")
+def two_phase_logger():
+    """Logger with one stroke in SKETCH and one in REFINEMENT; do not mutate."""
+    logger = DecisionLogger()
+    logger.start_phase(DrawingPhase.SKETCH)
+    logger.log_stroke("s1", StrokeIntent.GESTURE, DrawingPhase.SKETCH)
+    logger.start_phase(DrawingPhase.REFINEMENT)
+    logger.log_stroke("s2", StrokeIntent.CONTOUR, DrawingPhase.REFINEMENT)
+    return logger
+
+
+@pytest.fixture
+def canvas():
+    """Fresh 800x600 canvas."""
+    return Canvas(width=800, height=600)
+
+
+@pytest.fixture
+def executor(canvas):
+    """Fresh WorkflowExecutor on its own canvas, with logging enabled."""
+    return WorkflowExecutor(canvas)
@@ -32,6 +32,31 @@ class TestCanvasCheckpoint:
         restored = CanvasCheckpoint.from_dict(data)
         assert restored.checkpoint_id == checkpoint.checkpoint_id
         assert restored.phase == checkpoint.phase
+    
+    def test_checkpoint_bytes_roundtrip(self):
+        """Test checkpoint to/from bytes."""
+        manager = CheckpointManager()
+        canvas = Canvas(width=800, height=600)
+        strokes = [Stroke(points=[StrokePoint(0, 0), StrokePoint(10, 10)])]
+        checkpoint = manager.create_checkpoint(
+            canvas, DrawingPhase.SKETCH, strokes, description="Test checkpoint"
+        )
+        
+        blob = checkpoint.to_bytes()
+        restored = CanvasCheckpoint.from_bytes(blob)
+        
+        assert isinstance(blob, bytes)
+        assert restored.checkpoint_id == checkpoint.checkpoint_id
+        assert restored.timestamp == checkpoint.timestamp
+        restored_strokes = manager.get_stroke_history_at_checkpoint(restored)
+        assert [s.to_dict() for s in restored_strokes] == [s.to_dict() for s in strokes]
+        restored_canvas = Canvas.from_dict(restored.canvas_state)
+        assert restored_canvas.to_dict() == canvas.to_dict()
+    
+    def test_checkpoint_from_invalid_bytes(self):
+        """Test decoding bytes that are not a checkpoint."""
+        with pytest.raises(ValueError):
+            CanvasCheckpoint.from_bytes(b"not a checkpoint")
 
 
 class TestCheckpointManager:
@@ -154,6 +179,37 @@ class TestCheckpointManager:
         # Should only keep last 3
         assert manager.get_checkpoint_count() == 3
     
+    def test_create_checkpoints_batch(self):
+        """Test creating several checkpoints in one call."""
+        manager = CheckpointManager(max_checkpoints=3)
+        canvas = Canvas(width=800, height=600)
+        
+        checkpoints = manager.create_checkpoints_batch(
+            [(canvas, DrawingPhase.SKETCH, [], f"cp {i}") for i in range(5)]
+        )
+        
+        assert len(checkpoints) == 5
+        assert [cp.description for cp in checkpoints] == [f"cp {i}" for i in range(5)]
+        assert manager.get_checkpoint_count() == 3
+        assert manager.get_latest_checkpoint() is checkpoints[-1]
+        assert all(cp.canvas_state is checkpoints[0].canvas_state for cp in checkpoints)
+    
+    def test_checkpoint_ids_unique_and_ordered(self):
+        """Test rapidly created checkpoints get distinct, ordered IDs."""
+        manager = CheckpointManager()
+        canvas = Canvas(width=800, height=600)
+        
+        checkpoints = [
+            manager.create_checkpoint(canvas, DrawingPhase.SKETCH, [])
+            for _ in range(5)
+        ]
+        
+        assert len({cp.checkpoint_id for cp in checkpoints}) == 5
+        assert [cp.sequence for cp in checkpoints] == [1, 2, 3, 4, 5]
+        
+        restored = CanvasCheckpoint.from_dict(checkpoints[-1].to_dict())
+        assert restored.sequence == 5
+    
     def test_get_stroke_history_at_checkpoint(self):
         """Test getting stroke history from checkpoint."""
         manager = CheckpointManager()
@@ -208,3 +264,142 @@ class TestCheckpointManager:
         assert len(summary) == 2
         assert summary[0]["description"] == "First checkpoint"
         assert summary[1]["stroke_count"] == 1
+    
+    def test_identical_canvas_state_shared(self):
+        """Test identical canvas states are stored once."""
+        manager = CheckpointManager()
+        canvas = Canvas(width=800, height=600)
+        
+        cp1 = manager.create_checkpoint(canvas, DrawingPhase.SKETCH, [])
+        cp2 = manager.create_checkpoint(canvas, DrawingPhase.REFINEMENT, [])
+        assert cp1.canvas_state is cp2.canvas_state
+        
+        canvas.name = "Changed"
+        cp3 = manager.create_checkpoint(canvas, DrawingPhase.REFINEMENT, [])
+        assert cp3.canvas_state is not cp2.canvas_state
+        assert manager.restore_checkpoint(cp3).name == "Changed"
+        assert manager.restore_checkpoint(cp1).name == "Untitled"
+    
+    def test_stroke_history_snapshot_ignores_later_mutation(self):
+        """Test strokes edited in place after a checkpoint are re-serialized."""
+        manager = CheckpointManager()
+        canvas = Canvas(width=800, height=600)
+        stroke = Stroke(points=[StrokePoint(0, 0)], metadata={"pass": 1})
+        
+        cp1 = manager.create_checkpoint(canvas, DrawingPhase.SKETCH, [stroke])
+        stroke.add_point(StrokePoint(10, 10))
+        stroke.metadata["pass"] = 2
+        cp2 = manager.create_checkpoint(canvas, DrawingPhase.SKETCH, [stroke])
+        
+        assert len(cp1.stroke_history[0]["point_array"]) == 1
+        assert cp1.stroke_history[0]["metadata"] == {"pass": 1}
+        assert len(cp2.stroke_history[0]["point_array"]) == 2
+        
+        history = manager.get_stroke_history_at_checkpoint(cp2)
+        assert history[0].points[1].x == 10
+    
+    def test_unchanged_strokes_shared_between_checkpoints(self):
+        """Test consecutive checkpoints share records of unchanged strokes."""
+        manager = CheckpointManager()
+        canvas = Canvas(width=800, height=600)
+        strokes = [Stroke(points=[StrokePoint(0, 0)]), Stroke(points=[StrokePoint(5, 5)])]
+        
+        cp1 = manager.create_checkpoint(canvas, DrawingPhase.SKETCH, strokes[:1])
+        strokes[0].add_point(StrokePoint(1, 1))
+        cp2 = manager.create_checkpoint(canvas, DrawingPhase.SKETCH, strokes)
+        cp3 = manager.create_checkpoint(canvas, DrawingPhase.SKETCH, strokes)
+        
+        # The edited stroke gets a new record; the old one is left intact
+        assert cp2.stroke_history[0] is not cp1.stroke_history[0]
+        assert len(cp1.stroke_history[0]["point_array"]) == 1
+        assert all(a is b for a, b in zip(cp2.stroke_history, cp3.stroke_history))
+        assert not cp3.stroke_history[0]["point_array"].flags.writeable
+        
+        restored = manager.get_stroke_history_at_checkpoint(cp3)
+        restored[0].add_point(StrokePoint(2, 2))
+        assert len(cp2.stroke_history[0]["point_array"]) == 2
+    
+    def test_evicted_checkpoints_removed_from_indices(self):
+        """Test evicted checkpoints are no longer found by ID or phase."""
+        manager = CheckpointManager(max_checkpoints=2)
+        canvas = Canvas(width=800, height=600)
+        
+        cp1 = manager.create_checkpoint(canvas, DrawingPhase.SKETCH, [])
+        cp2 = manager.create_checkpoint(canvas, DrawingPhase.REFINEMENT, [])
+        cp3 = manager.create_checkpoint(canvas, DrawingPhase.REFINEMENT, [])
+        
+        assert manager.get_checkpoint(cp1.checkpoint_id) is None
+        assert manager.get_checkpoints_by_phase(DrawingPhase.SKETCH) == []
+        assert manager.rollback_to_phase(DrawingPhase.SKETCH) is None
+        assert manager.get_checkpoint(cp2.checkpoint_id) is cp2
+        assert manager.rollback_to_phase(DrawingPhase.REFINEMENT) is cp3
+        assert manager.current_checkpoint_index == 1
+    
+    def test_zero_max_checkpoints_keeps_nothing(self):
+        """Test a manager limited to zero checkpoints stores none."""
+        manager = CheckpointManager(max_checkpoints=0)
+        canvas = Canvas(width=800, height=600)
+        
+        cp = manager.create_checkpoint(canvas, DrawingPhase.SKETCH, [])
+        
+        assert len(manager.checkpoints) == 0
+        assert manager.current_checkpoint_index == -1
+        assert manager.get_checkpoint(cp.checkpoint_id) is None
+        assert manager.get_latest_checkpoint() is None
+    
+    def test_rollback_index_after_eviction(self):
+        """Test rollback finds the right position once old checkpoints are evicted."""
+        manager = CheckpointManager(max_checkpoints=3)
+        canvas = Canvas(width=800, height=600)
+        cps = [manager.create_checkpoint(canvas, DrawingPhase.SKETCH, []) for _ in range(5)]
+        
+        for position, cp in enumerate(cps[2:]):
+            assert manager.rollback_to_checkpoint(cp.checkpoint_id) is cp
+            assert manager.current_checkpoint_index == position
+    
+    def test_export_deltas(self):
+        """Test checkpoints export as deltas between keyframes."""
+        manager = CheckpointManager()
+        manager.KEYFRAME_INTERVAL = 2
+        canvas = Canvas(width=800, height=600)
+        strokes = []
+        for i in range(3):
+            strokes.append(Stroke(points=[StrokePoint(i, i)]))
+            manager.create_checkpoint(canvas, DrawingPhase.SKETCH, strokes)
+        
+        records = manager.export_deltas()
+        
+        assert records[0]["keyframe"] and len(records[0]["stroke_history"]) == 1
+        assert records[1]["base_id"] == records[0]["checkpoint_id"]
+        assert records[1]["stroke_prefix"] == 1
+        assert len(records[1]["stroke_history"]) == 1
+        assert "canvas_state" not in records[1]
+        assert records[2]["keyframe"] and len(records[2]["stroke_history"]) == 3
+    
+    def test_manager_bytes_roundtrip(self):
+        """Test all checkpoints survive a to/from bytes roundtrip."""
+        manager = CheckpointManager()
+        manager.KEYFRAME_INTERVAL = 2
+        canvas = Canvas(width=800, height=600)
+        strokes = []
+        for i in range(5):
+            strokes.append(Stroke(points=[StrokePoint(i, i), StrokePoint(i + 1, i)]))
+            manager.create_checkpoint(canvas, DrawingPhase.SKETCH, strokes)
+        
+        restored = CheckpointManager.from_bytes(manager.to_bytes())
+        
+        assert restored.get_checkpoint_summary() == manager.get_checkpoint_summary()
+        for original, loaded in zip(manager.checkpoints, restored.checkpoints):
+            history = restored.get_stroke_history_at_checkpoint(loaded)
+            assert [s.to_dict() for s in history] == [
+                s.to_dict() for s in manager.get_stroke_history_at_checkpoint(original)
+            ]
+        
+        # New checkpoints continue the restored sequence
+        cp = restored.create_checkpoint(canvas, DrawingPhase.SKETCH, strokes)
+        assert cp.sequence == 6
+    
+    def test_manager_from_invalid_bytes(self):
+        """Test decoding bytes that are not an encoded manager."""
+        with pytest.raises(ValueError):
+            CheckpointManager.from_bytes(b"not a manager")
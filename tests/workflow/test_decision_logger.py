@@ -1,5 +1,7 @@
 """Tests for decision logger."""
 
+from datetime import datetime
+
 import pytest
 
 from workflow.models.drawing_phase import DrawingPhase
@@ -11,162 +13,173 @@ from workflow.core.decision_logger import (
 )
 
 
+_SKETCH = DrawingPhase.SKETCH
+_REFINEMENT = DrawingPhase.REFINEMENT
+_GESTURE = StrokeIntent.GESTURE
+
+_TS = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _mk_decision(stroke_id, intent, phase=_SKETCH, **kwargs):
+    """Build a StrokeDecision with the shared fixed timestamp."""
+    return StrokeDecision(
+        stroke_id=stroke_id, timestamp=_TS, intent=intent, phase=phase, **kwargs
+    )
+
+
+# Shared read-only decisions for filter tests
+_POOL = tuple(
+    _mk_decision(f"s{i}", intent)
+    for i, intent in enumerate([
+        _GESTURE,
+        StrokeIntent.CONSTRUCTION,
+        _GESTURE,
+        StrokeIntent.CONTOUR,
+    ])
+)
+
+
+@pytest.fixture(scope="class")
+def serialized_decision():
+    """A decision and its dict form, serialized once per test class."""
+    decision = _mk_decision("stroke_1", StrokeIntent.CONTOUR, _REFINEMENT)
+    return decision, decision.to_dict()
+
+
+@pytest.fixture(scope="class")
+def serialized_phase_log():
+    """A phase log and its dict form, serialized once per test class."""
+    log = PhaseDecisionLog(phase=_SKETCH, start_time=_TS)
+    return log, log.to_dict()
+
+
+@pytest.fixture(scope="class")
+def serialized_logger():
+    """A one-stroke logger and its dict form, serialized once per test class."""
+    logger = DecisionLogger()
+    logger.start_phase(_SKETCH)
+    logger.log_stroke("s1", _GESTURE, _SKETCH)
+    return logger, logger.to_dict()
+
+
 class TestStrokeDecision:
     """Test StrokeDecision class."""
     
     def test_create_decision(self):
         """Test creating a stroke decision."""
-        from datetime import datetime
-        
-        decision = StrokeDecision(
-            stroke_id="stroke_1",
-            timestamp=datetime.now(),
-            intent=StrokeIntent.GESTURE,
-            phase=DrawingPhase.SKETCH,
+        decision = _mk_decision(
+            "stroke_1",
+            _GESTURE,
             purpose="Initial layout",
             task_id="task_1",
         )
         
         assert decision.stroke_id == "stroke_1"
-        assert decision.intent == StrokeIntent.GESTURE
-        assert decision.phase == DrawingPhase.SKETCH
+        assert decision.intent == _GESTURE
+        assert decision.phase == _SKETCH
     
     def test_get_improvement_score(self):
         """Test calculating improvement score."""
-        from datetime import datetime
-        
-        decision = StrokeDecision(
-            stroke_id="stroke_1",
-            timestamp=datetime.now(),
-            intent=StrokeIntent.GESTURE,
-            phase=DrawingPhase.SKETCH,
+        decision = _mk_decision(
+            "stroke_1",
+            _GESTURE,
             pre_evaluation={"quality": 0.5, "accuracy": 0.6},
             post_evaluation={"quality": 0.7, "accuracy": 0.8},
         )
         
         improvement = decision.get_improvement_score()
         assert improvement > 0
-        assert improvement == pytest.approx(0.2, abs=0.01)
+        assert abs(improvement - 0.2) < 0.01
     
-    def test_serialization(self):
-        """Test decision to/from dict."""
-        from datetime import datetime
-        
-        decision = StrokeDecision(
-            stroke_id="stroke_1",
-            timestamp=datetime.now(),
-            intent=StrokeIntent.CONTOUR,
-            phase=DrawingPhase.REFINEMENT,
-        )
-        
-        data = decision.to_dict()
+    def test_to_dict_shape(self, serialized_decision):
+        """Test decision to dict."""
+        _, data = serialized_decision
         assert data["intent"] == "contour"
-        
+        assert data["phase"] == "refinement"
+    
+    @pytest.mark.slow
+    def test_from_dict_roundtrip(self, serialized_decision):
+        """Test decision from dict."""
+        decision, data = serialized_decision
         restored = StrokeDecision.from_dict(data)
-        assert restored.intent == decision.intent
+        assert restored == decision
 
 
 class TestPhaseDecisionLog:
     """Test PhaseDecisionLog class."""
     
-    def test_create_log(self):
+    def test_create_log(self, now):
         """Test creating a phase log."""
-        from datetime import datetime
-        
         log = PhaseDecisionLog(
-            phase=DrawingPhase.SKETCH,
-            start_time=datetime.now(),
+            phase=_SKETCH,
+            start_time=now,
         )
         
-        assert log.phase == DrawingPhase.SKETCH
+        assert log.phase == _SKETCH
         assert log.end_time is None
         assert len(log.strokes) == 0
     
-    def test_add_stroke_decision(self):
+    def test_add_stroke_decision(self, now):
         """Test adding stroke decisions."""
-        from datetime import datetime
-        
         log = PhaseDecisionLog(
-            phase=DrawingPhase.SKETCH,
-            start_time=datetime.now(),
+            phase=_SKETCH,
+            start_time=now,
         )
         
-        decision = StrokeDecision(
-            stroke_id="stroke_1",
-            timestamp=datetime.now(),
-            intent=StrokeIntent.GESTURE,
-            phase=DrawingPhase.SKETCH,
-        )
+        decision = _mk_decision("stroke_1", _GESTURE)
         
         log.add_stroke_decision(decision)
         assert len(log.strokes) == 1
         assert log.get_stroke_count() == 1
     
-    def test_add_evaluation(self):
+    def test_add_evaluation(self, now):
         """Test adding evaluations."""
-        from datetime import datetime
-        
         log = PhaseDecisionLog(
-            phase=DrawingPhase.SKETCH,
-            start_time=datetime.now(),
+            phase=_SKETCH,
+            start_time=now,
         )
         
         log.add_evaluation({"quality": 0.7})
         assert len(log.phase_evaluations) == 1
     
-    def test_close_phase(self):
+    def test_close_phase(self, now):
         """Test closing a phase."""
-        from datetime import datetime
-        
         log = PhaseDecisionLog(
-            phase=DrawingPhase.SKETCH,
-            start_time=datetime.now(),
+            phase=_SKETCH,
+            start_time=now,
         )
         
         log.close_phase("Quality threshold met")
         assert log.end_time is not None
         assert log.transition_reason == "Quality threshold met"
     
-    def test_get_strokes_by_intent(self):
+    def test_get_strokes_by_intent(self, now):
         """Test filtering strokes by intent."""
-        from datetime import datetime
-        
         log = PhaseDecisionLog(
-            phase=DrawingPhase.SKETCH,
-            start_time=datetime.now(),
+            phase=_SKETCH,
+            start_time=now,
         )
         
-        log.add_stroke_decision(StrokeDecision(
-            stroke_id="s1",
-            timestamp=datetime.now(),
-            intent=StrokeIntent.GESTURE,
-            phase=DrawingPhase.SKETCH,
-        ))
-        
-        log.add_stroke_decision(StrokeDecision(
-            stroke_id="s2",
-            timestamp=datetime.now(),
-            intent=StrokeIntent.CONSTRUCTION,
-            phase=DrawingPhase.SKETCH,
-        ))
+        for decision in _POOL:
+            log.add_stroke_decision(decision)
         
-        gesture_strokes = log.get_strokes_by_intent(StrokeIntent.GESTURE)
-        assert len(gesture_strokes) == 1
+        gesture_strokes = log.get_strokes_by_intent(_GESTURE)
+        assert gesture_strokes == [d for d in _POOL if d.intent == _GESTURE]
+        assert len(gesture_strokes) == 2
+        assert log.get_strokes_by_intent(StrokeIntent.SHADING) == []
     
-    def test_serialization(self):
-        """Test log to/from dict."""
-        from datetime import datetime
-        
-        log = PhaseDecisionLog(
-            phase=DrawingPhase.SKETCH,
-            start_time=datetime.now(),
-        )
-        
-        data = log.to_dict()
+    def test_to_dict_shape(self, serialized_phase_log):
+        """Test log to dict."""
+        _, data = serialized_phase_log
         assert data["phase"] == "sketch"
-        
+        assert data["end_time"] is None
+    
+    @pytest.mark.slow
+    def test_from_dict_roundtrip(self, serialized_phase_log):
+        """Test log from dict."""
+        log, data = serialized_phase_log
         restored = PhaseDecisionLog.from_dict(data)
-        assert restored.phase == log.phase
+        assert restored == log
 
 
 class TestDecisionLogger:
@@ -175,118 +188,99 @@ class TestDecisionLogger:
     def test_start_phase(self):
         """Test starting a new phase."""
         logger = DecisionLogger()
-        logger.start_phase(DrawingPhase.SKETCH)
+        logger.start_phase(_SKETCH)
         
         assert logger.current_log is not None
-        assert logger.current_log.phase == DrawingPhase.SKETCH
+        assert logger.current_log.phase == _SKETCH
         assert len(logger.phase_logs) == 1
     
-    def test_log_stroke(self):
+    def test_log_stroke(self, make_logger):
         """Test logging a stroke."""
-        logger = DecisionLogger()
-        logger.start_phase(DrawingPhase.SKETCH)
+        logger = make_logger()
         
         logger.log_stroke(
             stroke_id="stroke_1",
-            intent=StrokeIntent.GESTURE,
-            phase=DrawingPhase.SKETCH,
+            intent=_GESTURE,
+            phase=_SKETCH,
             purpose="Initial gesture",
         )
         
         assert logger.get_total_stroke_count() == 1
     
-    def test_log_evaluation(self):
+    def test_log_evaluation(self, make_logger):
         """Test logging evaluation."""
-        logger = DecisionLogger()
-        logger.start_phase(DrawingPhase.SKETCH)
+        logger = make_logger()
         
         logger.log_evaluation({"quality": 0.7})
         
         assert len(logger.current_log.phase_evaluations) == 1
     
-    def test_close_phase(self):
+    def test_close_phase(self, make_logger):
         """Test closing a phase."""
-        logger = DecisionLogger()
-        logger.start_phase(DrawingPhase.SKETCH)
+        logger = make_logger()
         
         logger.close_phase("Transition to refinement")
         
         assert logger.current_log.end_time is not None
     
-    def test_phase_transition(self):
+    def test_phase_transition(self, two_phase_logger):
         """Test transitioning between phases."""
-        logger = DecisionLogger()
-        
-        logger.start_phase(DrawingPhase.SKETCH)
-        logger.log_stroke(
-            stroke_id="s1",
-            intent=StrokeIntent.GESTURE,
-            phase=DrawingPhase.SKETCH,
-        )
-        
-        # Start new phase (should close previous)
-        logger.start_phase(DrawingPhase.REFINEMENT)
+        logger = two_phase_logger
         
+        # Starting the second phase closed the first
         assert len(logger.phase_logs) == 2
         assert logger.phase_logs[0].end_time is not None
-        assert logger.current_log.phase == DrawingPhase.REFINEMENT
+        assert logger.current_log.phase == _REFINEMENT
     
-    def test_get_phase_log(self):
+    def test_get_phase_log(self, two_phase_logger):
         """Test getting phase log."""
-        logger = DecisionLogger()
-        
-        logger.start_phase(DrawingPhase.SKETCH)
-        logger.start_phase(DrawingPhase.REFINEMENT)
-        
-        sketch_log = logger.get_phase_log(DrawingPhase.SKETCH)
+        sketch_log = two_phase_logger.get_phase_log(_SKETCH)
         assert sketch_log is not None
-        assert sketch_log.phase == DrawingPhase.SKETCH
+        assert sketch_log.phase == _SKETCH
     
-    def test_get_all_phase_logs(self):
+    def test_get_all_phase_logs(self, make_logger):
         """Test getting all logs for a phase."""
-        logger = DecisionLogger()
-        
-        logger.start_phase(DrawingPhase.SKETCH)
-        logger.start_phase(DrawingPhase.REFINEMENT)
-        logger.start_phase(DrawingPhase.SKETCH)  # Second iteration
+        logger = make_logger()
+        logger.start_phase(_REFINEMENT)
+        logger.start_phase(_SKETCH)  # Second iteration
         
-        sketch_logs = logger.get_all_phase_logs(DrawingPhase.SKETCH)
+        sketch_logs = logger.get_all_phase_logs(_SKETCH)
         assert len(sketch_logs) == 2
     
-    def test_get_all_strokes(self):
-        """Test getting all strokes."""
-        logger = DecisionLogger()
+    def test_max_phase_logs(self):
+        """Test the oldest phase logs are dropped once the limit is reached."""
+        logger = DecisionLogger(max_phase_logs=2)
+        for phase in (_SKETCH, _REFINEMENT, _SKETCH):
+            logger.start_phase(phase)
+            logger.log_stroke(f"s_{len(logger.phase_logs)}", _GESTURE, phase)
         
-        logger.start_phase(DrawingPhase.SKETCH)
-        logger.log_stroke("s1", StrokeIntent.GESTURE, DrawingPhase.SKETCH)
-        
-        logger.start_phase(DrawingPhase.REFINEMENT)
-        logger.log_stroke("s2", StrokeIntent.CONTOUR, DrawingPhase.REFINEMENT)
-        
-        all_strokes = logger.get_all_strokes()
-        assert len(all_strokes) == 2
+        assert len(logger.phase_logs) == 2
+        assert [log.phase for log in logger.phase_logs] == [_REFINEMENT, _SKETCH]
+        assert logger.get_total_stroke_count() == 2
+        assert len(logger.to_dict()["phase_logs"]) == 2
+    
+    def test_get_all_strokes(self, two_phase_logger):
+        """Test getting all strokes."""
+        all_strokes = two_phase_logger.get_all_strokes()
+        assert [s.stroke_id for s in all_strokes] == ["s1", "s2"]
     
-    def test_get_workflow_summary(self):
+    def test_get_workflow_summary(self, two_phase_logger):
         """Test getting workflow summary."""
-        logger = DecisionLogger()
-        
-        logger.start_phase(DrawingPhase.SKETCH)
-        logger.log_stroke("s1", StrokeIntent.GESTURE, DrawingPhase.SKETCH)
-        logger.start_phase(DrawingPhase.REFINEMENT)
-        
-        summary = logger.get_workflow_summary()
+        summary = two_phase_logger.get_workflow_summary()
         assert summary["total_phases"] == 2
-        assert summary["total_strokes"] == 1
+        assert summary["total_strokes"] == 2
     
-    def test_serialization(self):
-        """Test logger to/from dict."""
-        logger = DecisionLogger()
-        logger.start_phase(DrawingPhase.SKETCH)
-        logger.log_stroke("s1", StrokeIntent.GESTURE, DrawingPhase.SKETCH)
-        
-        data = logger.to_dict()
+    def test_to_dict_shape(self, serialized_logger):
+        """Test logger to dict."""
+        _, data = serialized_logger
         assert len(data["phase_logs"]) == 1
-        
+        assert len(data["phase_logs"][0]["strokes"]) == 1
+    
+    @pytest.mark.slow
+    def test_from_dict_roundtrip(self, serialized_logger):
+        """Test logger from dict."""
+        logger, data = serialized_logger
         restored = DecisionLogger.from_dict(data)
         assert len(restored.phase_logs) == 1
         assert restored.get_total_stroke_count() == 1
+        assert restored.phase_logs == logger.phase_logs
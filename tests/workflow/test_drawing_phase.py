@@ -10,16 +10,39 @@ from workflow.models.drawing_phase import (
 )
 
 
+_DT = datetime(2024, 1, 1, 0, 0, 0)
+
+_S = DrawingPhase.SKETCH
+_R = DrawingPhase.REFINEMENT
+_ST = DrawingPhase.STYLIZATION
+_RE = DrawingPhase.RENDERING
+_C = DrawingPhase.COMPLETE
+
+# Full transition matrix: (from_phase, to_phase, is_valid)
+TRANSITION_MATRIX = [
+    (_S, _S, True), (_S, _R, True), (_S, _ST, False), (_S, _RE, False), (_S, _C, False),
+    (_R, _S, True), (_R, _R, True), (_R, _ST, True), (_R, _RE, False), (_R, _C, False),
+    (_ST, _S, False), (_ST, _R, True), (_ST, _ST, True), (_ST, _RE, True), (_ST, _C, False),
+    (_RE, _S, False), (_RE, _R, False), (_RE, _ST, True), (_RE, _RE, True), (_RE, _C, True),
+    (_C, _S, False), (_C, _R, False), (_C, _ST, False), (_C, _RE, True), (_C, _C, True),
+]
+
+
 class TestDrawingPhase:
     """Test DrawingPhase enum."""
     
-    def test_phase_values(self):
+    pytestmark = pytest.mark.fast
+    
+    @pytest.mark.parametrize("phase,expected", [
+        (DrawingPhase.SKETCH, "sketch"),
+        (DrawingPhase.REFINEMENT, "refinement"),
+        (DrawingPhase.STYLIZATION, "stylization"),
+        (DrawingPhase.RENDERING, "rendering"),
+        (DrawingPhase.COMPLETE, "complete"),
+    ])
+    def test_phase_values(self, phase, expected):
         """Test phase enum values."""
-        assert DrawingPhase.SKETCH.value == "sketch"
-        assert DrawingPhase.REFINEMENT.value == "refinement"
-        assert DrawingPhase.STYLIZATION.value == "stylization"
-        assert DrawingPhase.RENDERING.value == "rendering"
-        assert DrawingPhase.COMPLETE.value == "complete"
+        assert phase.value == expected
 
 
 class TestPhaseTransition:
@@ -28,15 +51,16 @@ class TestPhaseTransition:
     def test_create_transition(self):
         """Test creating a phase transition."""
         transition = PhaseTransition(
-            from_phase=DrawingPhase.SKETCH,
-            to_phase=DrawingPhase.REFINEMENT,
+            from_phase=_S,
+            to_phase=_R,
+            timestamp=_DT,
             reason="Quality threshold met",
             metrics={"quality": 0.8},
             confidence=0.9,
         )
         
-        assert transition.from_phase == DrawingPhase.SKETCH
-        assert transition.to_phase == DrawingPhase.REFINEMENT
+        assert transition.from_phase == _S
+        assert transition.to_phase == _R
         assert transition.reason == "Quality threshold met"
         assert transition.metrics["quality"] == 0.8
         assert transition.confidence == 0.9
@@ -44,103 +68,52 @@ class TestPhaseTransition:
     def test_transition_serialization(self):
         """Test transition to/from dict."""
         transition = PhaseTransition(
-            from_phase=DrawingPhase.SKETCH,
-            to_phase=DrawingPhase.REFINEMENT,
+            from_phase=_S,
+            to_phase=_R,
+            timestamp=_DT,
             reason="Test",
         )
         
         data = transition.to_dict()
         assert data["from_phase"] == "sketch"
         assert data["to_phase"] == "refinement"
+        assert data["timestamp"] == "2024-01-01T00:00:00"
         
         restored = PhaseTransition.from_dict(data)
         assert restored.from_phase == transition.from_phase
         assert restored.to_phase == transition.to_phase
+        assert restored.timestamp == _DT
 
 
 class TestPhaseTransitionValidator:
     """Test phase transition validation."""
     
-    def test_valid_forward_transitions(self):
-        """Test valid forward phase transitions."""
-        assert PhaseTransitionValidator.is_valid_transition(
-            DrawingPhase.SKETCH, DrawingPhase.REFINEMENT
-        )
-        assert PhaseTransitionValidator.is_valid_transition(
-            DrawingPhase.REFINEMENT, DrawingPhase.STYLIZATION
-        )
-        assert PhaseTransitionValidator.is_valid_transition(
-            DrawingPhase.STYLIZATION, DrawingPhase.RENDERING
-        )
-        assert PhaseTransitionValidator.is_valid_transition(
-            DrawingPhase.RENDERING, DrawingPhase.COMPLETE
-        )
-    
-    def test_valid_regression_transitions(self):
-        """Test valid regression transitions."""
-        assert PhaseTransitionValidator.is_valid_transition(
-            DrawingPhase.REFINEMENT, DrawingPhase.SKETCH
-        )
-        assert PhaseTransitionValidator.is_valid_transition(
-            DrawingPhase.STYLIZATION, DrawingPhase.REFINEMENT
-        )
-        assert PhaseTransitionValidator.is_valid_transition(
-            DrawingPhase.RENDERING, DrawingPhase.STYLIZATION
-        )
-    
-    def test_valid_iteration_transitions(self):
-        """Test valid iteration within same phase."""
-        assert PhaseTransitionValidator.is_valid_transition(
-            DrawingPhase.SKETCH, DrawingPhase.SKETCH
-        )
-        assert PhaseTransitionValidator.is_valid_transition(
-            DrawingPhase.REFINEMENT, DrawingPhase.REFINEMENT
-        )
+    @pytest.mark.parametrize("from_phase,to_phase,expected", TRANSITION_MATRIX)
+    def test_transition_matrix(self, from_phase, to_phase, expected):
+        """Test validity of every phase-to-phase transition."""
+        assert PhaseTransitionValidator.is_valid_transition(from_phase, to_phase) is expected
     
-    def test_invalid_transitions(self):
-        """Test invalid phase transitions."""
-        # Can't skip phases
-        assert not PhaseTransitionValidator.is_valid_transition(
-            DrawingPhase.SKETCH, DrawingPhase.STYLIZATION
-        )
-        assert not PhaseTransitionValidator.is_valid_transition(
-            DrawingPhase.SKETCH, DrawingPhase.RENDERING
-        )
-        
-        # Can't go from COMPLETE to early phases
-        assert not PhaseTransitionValidator.is_valid_transition(
-            DrawingPhase.COMPLETE, DrawingPhase.SKETCH
-        )
+    @pytest.mark.parametrize("phase", list(DrawingPhase))
+    def test_valid_next_phases_match_matrix(self, phase):
+        """Test get_valid_next_phases agrees with the transition matrix."""
+        expected = {to for frm, to, ok in TRANSITION_MATRIX if frm == phase and ok}
+        assert PhaseTransitionValidator.get_valid_next_phases(phase) == expected
     
     def test_get_valid_next_phases(self):
         """Test getting valid next phases."""
-        valid_from_sketch = PhaseTransitionValidator.get_valid_next_phases(
-            DrawingPhase.SKETCH
-        )
-        assert DrawingPhase.SKETCH in valid_from_sketch
-        assert DrawingPhase.REFINEMENT in valid_from_sketch
+        valid_from_sketch = PhaseTransitionValidator.get_valid_next_phases(_S)
+        assert _S in valid_from_sketch
+        assert _R in valid_from_sketch
         assert len(valid_from_sketch) == 2
     
-    def test_is_forward_progression(self):
-        """Test forward progression detection."""
-        assert PhaseTransitionValidator.is_forward_progression(
-            DrawingPhase.SKETCH, DrawingPhase.REFINEMENT
-        )
-        assert not PhaseTransitionValidator.is_forward_progression(
-            DrawingPhase.REFINEMENT, DrawingPhase.SKETCH
-        )
-        assert not PhaseTransitionValidator.is_forward_progression(
-            DrawingPhase.SKETCH, DrawingPhase.SKETCH
-        )
-    
-    def test_is_regression(self):
-        """Test regression detection."""
-        assert PhaseTransitionValidator.is_regression(
-            DrawingPhase.REFINEMENT, DrawingPhase.SKETCH
-        )
-        assert not PhaseTransitionValidator.is_regression(
-            DrawingPhase.SKETCH, DrawingPhase.REFINEMENT
-        )
-        assert not PhaseTransitionValidator.is_regression(
-            DrawingPhase.SKETCH, DrawingPhase.SKETCH
-        )
+    @pytest.mark.parametrize("from_phase,to_phase,forward,regression", [
+        (DrawingPhase.SKETCH, DrawingPhase.REFINEMENT, True, False),
+        (DrawingPhase.REFINEMENT, DrawingPhase.SKETCH, False, True),
+        (DrawingPhase.SKETCH, DrawingPhase.SKETCH, False, False),
+        (DrawingPhase.RENDERING, DrawingPhase.COMPLETE, True, False),
+        (DrawingPhase.COMPLETE, DrawingPhase.RENDERING, False, True),
+    ])
+    def test_progression_direction(self, from_phase, to_phase, forward, regression):
+        """Test forward progression and regression detection."""
+        assert PhaseTransitionValidator.is_forward_progression(from_phase, to_phase) is forward
+        assert PhaseTransitionValidator.is_regression(from_phase, to_phase) is regression
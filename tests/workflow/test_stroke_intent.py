@@ -10,17 +10,32 @@ from workflow.models.stroke_intent import (
 from workflow.models.drawing_phase import DrawingPhase
 
 
+_SKETCH = DrawingPhase.SKETCH
+_REFINEMENT = DrawingPhase.REFINEMENT
+_RENDERING = DrawingPhase.RENDERING
+
+_GESTURE = StrokeIntent.GESTURE
+_CONTOUR = StrokeIntent.CONTOUR
+_DETAIL = StrokeIntent.DETAIL
+_SHADING = StrokeIntent.SHADING
+
+
 class TestStrokeIntent:
     """Test StrokeIntent enum."""
     
-    def test_intent_values(self):
+    pytestmark = pytest.mark.fast
+    
+    @pytest.mark.parametrize("intent,expected", [
+        (StrokeIntent.GESTURE, "gesture"),
+        (StrokeIntent.CONTOUR, "contour"),
+        (StrokeIntent.DETAIL, "detail"),
+        (StrokeIntent.CONSTRUCTION, "construction"),
+        (StrokeIntent.SHADING, "shading"),
+        (StrokeIntent.CLEANUP, "cleanup"),
+    ])
+    def test_intent_values(self, intent, expected):
         """Test intent enum values."""
-        assert StrokeIntent.GESTURE.value == "gesture"
-        assert StrokeIntent.CONTOUR.value == "contour"
-        assert StrokeIntent.DETAIL.value == "detail"
-        assert StrokeIntent.CONSTRUCTION.value == "construction"
-        assert StrokeIntent.SHADING.value == "shading"
-        assert StrokeIntent.CLEANUP.value == "cleanup"
+        assert intent.value == expected
 
 
 class TestStrokeMetadata:
@@ -29,15 +44,15 @@ class TestStrokeMetadata:
     def test_create_metadata(self):
         """Test creating stroke metadata."""
         metadata = StrokeMetadata(
-            intent=StrokeIntent.GESTURE,
-            phase=DrawingPhase.SKETCH,
+            intent=_GESTURE,
+            phase=_SKETCH,
             purpose="Initial layout",
             task_id="task_123",
             confidence=0.8,
         )
         
-        assert metadata.intent == StrokeIntent.GESTURE
-        assert metadata.phase == DrawingPhase.SKETCH
+        assert metadata.intent == _GESTURE
+        assert metadata.phase == _SKETCH
         assert metadata.purpose == "Initial layout"
         assert metadata.task_id == "task_123"
         assert metadata.confidence == 0.8
@@ -45,8 +60,8 @@ class TestStrokeMetadata:
     def test_metadata_serialization(self):
         """Test metadata to/from dict."""
         metadata = StrokeMetadata(
-            intent=StrokeIntent.CONTOUR,
-            phase=DrawingPhase.REFINEMENT,
+            intent=_CONTOUR,
+            phase=_REFINEMENT,
             purpose="Define anatomy",
         )
         
@@ -62,80 +77,42 @@ class TestStrokeMetadata:
 class TestStrokeIntentHelper:
     """Test StrokeIntentHelper class."""
     
-    def test_get_recommended_intents_sketch(self):
-        """Test recommended intents for sketch phase."""
-        intents = StrokeIntentHelper.get_recommended_intents(DrawingPhase.SKETCH)
-        assert StrokeIntent.GESTURE in intents
-        assert StrokeIntent.CONSTRUCTION in intents
-    
-    def test_get_recommended_intents_refinement(self):
-        """Test recommended intents for refinement phase."""
-        intents = StrokeIntentHelper.get_recommended_intents(DrawingPhase.REFINEMENT)
-        assert StrokeIntent.CONTOUR in intents
-        assert StrokeIntent.CONSTRUCTION in intents
-    
-    def test_get_recommended_intents_stylization(self):
-        """Test recommended intents for stylization phase."""
-        intents = StrokeIntentHelper.get_recommended_intents(DrawingPhase.STYLIZATION)
-        assert StrokeIntent.CONTOUR in intents
-        assert StrokeIntent.DETAIL in intents
-        assert StrokeIntent.CLEANUP in intents
-    
-    def test_get_recommended_intents_rendering(self):
-        """Test recommended intents for rendering phase."""
-        intents = StrokeIntentHelper.get_recommended_intents(DrawingPhase.RENDERING)
-        assert StrokeIntent.DETAIL in intents
-        assert StrokeIntent.SHADING in intents
-        assert StrokeIntent.CLEANUP in intents
+    @pytest.mark.parametrize("phase,required_intents", [
+        (DrawingPhase.SKETCH, {StrokeIntent.GESTURE, StrokeIntent.CONSTRUCTION}),
+        (DrawingPhase.REFINEMENT, {StrokeIntent.CONTOUR, StrokeIntent.CONSTRUCTION}),
+        (DrawingPhase.STYLIZATION, {StrokeIntent.CONTOUR, StrokeIntent.DETAIL, StrokeIntent.CLEANUP}),
+        (DrawingPhase.RENDERING, {StrokeIntent.DETAIL, StrokeIntent.SHADING, StrokeIntent.CLEANUP}),
+    ])
+    def test_get_recommended_intents(self, phase, required_intents):
+        """Test recommended intents for each phase."""
+        intents = StrokeIntentHelper.get_recommended_intents(phase)
+        assert required_intents.issubset(intents)
     
     def test_get_primary_intent(self):
         """Test getting primary intent for phases."""
-        assert StrokeIntentHelper.get_primary_intent(DrawingPhase.SKETCH) == StrokeIntent.GESTURE
-        assert StrokeIntentHelper.get_primary_intent(DrawingPhase.REFINEMENT) == StrokeIntent.CONTOUR
-        assert StrokeIntentHelper.get_primary_intent(DrawingPhase.STYLIZATION) == StrokeIntent.CONTOUR
-        assert StrokeIntentHelper.get_primary_intent(DrawingPhase.RENDERING) == StrokeIntent.DETAIL
+        assert StrokeIntentHelper.get_primary_intent(_SKETCH) == _GESTURE
+        assert StrokeIntentHelper.get_primary_intent(_REFINEMENT) == _CONTOUR
+        assert StrokeIntentHelper.get_primary_intent(DrawingPhase.STYLIZATION) == _CONTOUR
+        assert StrokeIntentHelper.get_primary_intent(_RENDERING) == _DETAIL
     
     def test_is_intent_appropriate(self):
         """Test checking if intent is appropriate for phase."""
         # Gesture is appropriate for sketch
-        assert StrokeIntentHelper.is_intent_appropriate(
-            DrawingPhase.SKETCH, StrokeIntent.GESTURE
-        )
+        assert StrokeIntentHelper.is_intent_appropriate(_SKETCH, _GESTURE)
         
         # Detail is not appropriate for sketch
-        assert not StrokeIntentHelper.is_intent_appropriate(
-            DrawingPhase.SKETCH, StrokeIntent.DETAIL
-        )
+        assert not StrokeIntentHelper.is_intent_appropriate(_SKETCH, _DETAIL)
         
         # Shading is appropriate for rendering
-        assert StrokeIntentHelper.is_intent_appropriate(
-            DrawingPhase.RENDERING, StrokeIntent.SHADING
-        )
+        assert StrokeIntentHelper.is_intent_appropriate(_RENDERING, _SHADING)
     
-    def test_suggest_intent_for_task(self):
+    @pytest.mark.parametrize("phase,task_type,expected", [
+        (DrawingPhase.SKETCH, "fix_pose", StrokeIntent.GESTURE),
+        (DrawingPhase.REFINEMENT, "refine_anatomy", StrokeIntent.CONTOUR),
+        (DrawingPhase.RENDERING, "add_detail", StrokeIntent.DETAIL),
+        # Unknown task type falls back to the phase primary intent
+        (DrawingPhase.REFINEMENT, "unknown_task", StrokeIntent.CONTOUR),
+    ])
+    def test_suggest_intent_for_task(self, phase, task_type, expected):
         """Test suggesting intent based on task type."""
-        # fix_pose should suggest GESTURE
-        intent = StrokeIntentHelper.suggest_intent_for_task(
-            DrawingPhase.SKETCH, "fix_pose"
-        )
-        assert intent == StrokeIntent.GESTURE
-        
-        # refine_anatomy should suggest CONTOUR
-        intent = StrokeIntentHelper.suggest_intent_for_task(
-            DrawingPhase.REFINEMENT, "refine_anatomy"
-        )
-        assert intent == StrokeIntent.CONTOUR
-        
-        # add_detail should suggest DETAIL
-        intent = StrokeIntentHelper.suggest_intent_for_task(
-            DrawingPhase.RENDERING, "add_detail"
-        )
-        assert intent == StrokeIntent.DETAIL
-    
-    def test_suggest_intent_fallback(self):
-        """Test intent suggestion fallback to phase primary."""
-        # Unknown task type should use phase primary
-        intent = StrokeIntentHelper.suggest_intent_for_task(
-            DrawingPhase.REFINEMENT, "unknown_task"
-        )
-        assert intent == StrokeIntent.CONTOUR
+        assert StrokeIntentHelper.suggest_intent_for_task(phase, task_type) == expected
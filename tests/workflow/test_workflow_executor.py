@@ -2,7 +2,6 @@
 
 import pytest
 
-from motor.core.canvas import Canvas
 from motor.core.stroke import Stroke, StrokePoint
 from workflow.models.drawing_phase import DrawingPhase
 from workflow.models.stroke_intent import StrokeIntent
@@ -12,9 +11,8 @@ from workflow.core.workflow_executor import WorkflowExecutor
 class TestWorkflowExecutor:
     """Test WorkflowExecutor class."""
     
-    def test_initialization(self):
+    def test_initialization(self, canvas):
         """Test workflow executor initialization."""
-        canvas = Canvas(width=800, height=600)
         executor = WorkflowExecutor(canvas)
         
         assert executor.canvas == canvas
@@ -22,11 +20,8 @@ class TestWorkflowExecutor:
         assert executor.checkpoint_manager.get_checkpoint_count() == 1  # Initial checkpoint
         assert executor.decision_logger is not None
     
-    def test_transition_to_phase(self):
+    def test_transition_to_phase(self, executor):
         """Test phase transition."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         success = executor.transition_to_phase(
             DrawingPhase.REFINEMENT,
             reason="Quality threshold met",
@@ -37,22 +32,16 @@ class TestWorkflowExecutor:
         # Should have initial + transition checkpoint
         assert executor.checkpoint_manager.get_checkpoint_count() == 2
     
-    def test_invalid_transition(self):
+    def test_invalid_transition(self, executor):
         """Test invalid phase transition."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         # Try to skip phases
         success = executor.transition_to_phase(DrawingPhase.RENDERING)
         
         assert not success
         assert executor.workflow_state.current_phase == DrawingPhase.SKETCH
     
-    def test_execute_stroke(self):
+    def test_execute_stroke(self, executor):
         """Test executing a stroke."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         stroke = Stroke(points=[
             StrokePoint(10, 10),
             StrokePoint(20, 20),
@@ -70,11 +59,8 @@ class TestWorkflowExecutor:
         assert "workflow" in stroke.metadata
         assert stroke.metadata["stroke_id"] == stroke_id
     
-    def test_execute_stroke_auto_intent(self):
+    def test_execute_stroke_auto_intent(self, executor):
         """Test stroke execution with auto-detected intent."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         stroke = Stroke(points=[StrokePoint(0, 0)])
         stroke_id = executor.execute_stroke(stroke)
         
@@ -83,11 +69,8 @@ class TestWorkflowExecutor:
         assert workflow_meta["intent"] == StrokeIntent.GESTURE.value
         assert workflow_meta["phase"] == DrawingPhase.SKETCH.value
     
-    def test_create_checkpoint(self):
+    def test_create_checkpoint(self, executor):
         """Test creating checkpoints."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         initial_count = executor.checkpoint_manager.get_checkpoint_count()
         
         checkpoint_id = executor.create_checkpoint(
@@ -98,11 +81,8 @@ class TestWorkflowExecutor:
         assert checkpoint_id is not None
         assert executor.checkpoint_manager.get_checkpoint_count() == initial_count + 1
     
-    def test_rollback_to_checkpoint(self):
+    def test_rollback_to_checkpoint(self, executor):
         """Test rolling back to a checkpoint."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         # Create checkpoint after some strokes
         stroke1 = Stroke(points=[StrokePoint(0, 0)])
         executor.execute_stroke(stroke1)
@@ -121,11 +101,32 @@ class TestWorkflowExecutor:
         assert success
         assert len(executor.stroke_history) == 1
     
-    def test_rollback_to_phase(self):
-        """Test rolling back to a phase."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
+    def test_rollback_restores_snapshot(self, executor):
+        """Test rollback restores strokes as they were at the checkpoint."""
+        stroke1 = Stroke(points=[StrokePoint(0, 0)], metadata={"pass": 1})
+        executor.execute_stroke(stroke1)
+        checkpoint_id = executor.create_checkpoint()
+        
+        # Editing the live stroke must not alter the checkpoint
+        stroke1.add_point(StrokePoint(5, 5))
+        stroke1.metadata["pass"] = 2
+        executor.execute_stroke(Stroke(points=[StrokePoint(10, 10)]))
         
+        assert executor.rollback_to_checkpoint(checkpoint_id)
+        assert len(executor.stroke_history) == 1
+        restored = executor.stroke_history[0]
+        assert len(restored.points) == 1
+        assert restored.metadata["pass"] == 1
+        
+        # Nor must editing the restored stroke
+        restored.add_point(StrokePoint(20, 20))
+        restored.metadata["pass"] = 3
+        assert executor.rollback_to_checkpoint(checkpoint_id)
+        assert len(executor.stroke_history[0].points) == 1
+        assert executor.stroke_history[0].metadata["pass"] == 1
+    
+    def test_rollback_to_phase(self, executor):
+        """Test rolling back to a phase."""
         # Progress through phases
         executor.transition_to_phase(DrawingPhase.REFINEMENT)
         executor.transition_to_phase(DrawingPhase.STYLIZATION)
@@ -136,33 +137,24 @@ class TestWorkflowExecutor:
         assert success
         assert executor.workflow_state.current_phase == DrawingPhase.REFINEMENT
     
-    def test_evaluate_and_decide_transition_forward(self):
+    def test_evaluate_and_decide_transition_forward(self, executor):
         """Test evaluation-based phase transition (forward)."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         # High quality metrics should suggest forward transition
         metrics = {"quality": 0.8, "accuracy": 0.75}
         suggested_phase = executor.evaluate_and_decide_transition(metrics)
         
         assert suggested_phase == DrawingPhase.REFINEMENT
     
-    def test_evaluate_and_decide_transition_stay(self):
+    def test_evaluate_and_decide_transition_stay(self, executor):
         """Test evaluation suggesting staying in phase."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         # Medium quality metrics should suggest staying
         metrics = {"quality": 0.6, "accuracy": 0.5}
         suggested_phase = executor.evaluate_and_decide_transition(metrics)
         
         assert suggested_phase is None
     
-    def test_evaluate_and_decide_transition_regress(self):
+    def test_evaluate_and_decide_transition_regress(self, executor):
         """Test evaluation suggesting regression."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         # Progress to refinement first
         executor.transition_to_phase(DrawingPhase.REFINEMENT)
         
@@ -176,11 +168,8 @@ class TestWorkflowExecutor:
         
         assert suggested_phase == DrawingPhase.SKETCH
     
-    def test_get_workflow_summary(self):
+    def test_get_workflow_summary(self, executor):
         """Test getting workflow summary."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         executor.execute_stroke(Stroke(points=[StrokePoint(0, 0)]))
         executor.transition_to_phase(DrawingPhase.REFINEMENT)
         
@@ -191,11 +180,8 @@ class TestWorkflowExecutor:
         assert "total_strokes" in summary
         assert summary["total_strokes"] == 1
     
-    def test_export_workflow(self):
+    def test_export_workflow(self, executor):
         """Test exporting workflow."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         executor.execute_stroke(Stroke(points=[StrokePoint(0, 0)]))
         
         data = executor.export_workflow()
@@ -206,21 +192,15 @@ class TestWorkflowExecutor:
         assert "checkpoints" in data
         assert "decision_log" in data
     
-    def test_is_complete(self):
+    def test_is_complete(self, executor):
         """Test checking if workflow is complete."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         assert not executor.is_complete()
         
         executor.workflow_state.current_phase = DrawingPhase.COMPLETE
         assert executor.is_complete()
     
-    def test_get_stroke_count_by_intent(self):
+    def test_get_stroke_count_by_intent(self, executor):
         """Test counting strokes by intent."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         executor.execute_stroke(
             Stroke(points=[StrokePoint(0, 0)]),
             intent=StrokeIntent.GESTURE,
@@ -240,11 +220,8 @@ class TestWorkflowExecutor:
         construction_count = executor.get_stroke_count_by_intent(StrokeIntent.CONSTRUCTION)
         assert construction_count == 1
     
-    def test_get_phase_stroke_count(self):
+    def test_get_phase_stroke_count(self, executor):
         """Test counting strokes by phase."""
-        canvas = Canvas(width=800, height=600)
-        executor = WorkflowExecutor(canvas)
-        
         executor.execute_stroke(Stroke(points=[StrokePoint(0, 0)]))
         executor.execute_stroke(Stroke(points=[StrokePoint(10, 10)]))
         
@@ -257,9 +234,26 @@ class TestWorkflowExecutor:
         refinement_count = executor.get_phase_stroke_count(DrawingPhase.REFINEMENT)
         assert refinement_count == 1
     
-    def test_workflow_without_logging(self):
+    def test_stroke_counts_after_rollback(self, executor):
+        """Test stroke counts follow the history restored by rollback."""
+        executor.execute_stroke(Stroke(points=[StrokePoint(0, 0)]))
+        checkpoint_id = executor.create_checkpoint()
+        
+        executor.transition_to_phase(DrawingPhase.REFINEMENT)
+        executor.execute_stroke(
+            Stroke(points=[StrokePoint(10, 10)]), intent=StrokeIntent.CONTOUR
+        )
+        assert executor.get_stroke_count_by_intent(StrokeIntent.CONTOUR) == 1
+        
+        executor.rollback_to_checkpoint(checkpoint_id)
+        
+        assert executor.get_stroke_count_by_intent(StrokeIntent.CONTOUR) == 0
+        assert executor.get_stroke_count_by_intent(StrokeIntent.GESTURE) == 1
+        assert executor.get_phase_stroke_count(DrawingPhase.SKETCH) == 1
+        assert executor.get_phase_stroke_count(DrawingPhase.REFINEMENT) == 0
+    
+    def test_workflow_without_logging(self, canvas):
         """Test workflow executor without decision logging."""
-        canvas = Canvas(width=800, height=600)
         executor = WorkflowExecutor(canvas, enable_logging=False)
         
         assert executor.decision_logger is None
@@ -1,10 +1,12 @@
 """Tests for workflow state management."""
 
+import time
+
 import pytest
 from datetime import datetime
 
 from workflow.models.workflow_state import WorkflowState
-from workflow.models.drawing_phase import DrawingPhase
+from workflow.models.drawing_phase import DrawingPhase, PhaseTransition
 
 
 class TestWorkflowState:
@@ -85,6 +87,34 @@ class TestWorkflowState:
         time_in_phase = state.get_time_in_phase()
         assert time_in_phase >= 0
     
+    def test_get_time_in_phase_after_start_time_assigned(self):
+        """Test time in phase follows a directly assigned start time."""
+        state = WorkflowState()
+        state.phase_start_time = datetime.fromtimestamp(time.time() - 60)
+        
+        assert 59 < state.get_time_in_phase() < 120
+        
+        restored = WorkflowState.from_dict(state.to_dict())
+        assert 59 < restored.get_time_in_phase() < 120
+    
+    def test_get_time_in_phase_ignores_wall_clock_after_anchor(self, monkeypatch):
+        """Test copies keep the monotonic anchor without consulting the wall clock."""
+        import copy
+        import workflow.models.workflow_state as workflow_state_module
+        
+        state = WorkflowState()
+        state.phase_start_time = datetime.fromtimestamp(time.time() - 60)
+        copied = copy.deepcopy(state)
+        
+        class _FrozenClock:
+            @staticmethod
+            def now():
+                raise AssertionError("wall clock consulted")
+        
+        monkeypatch.setattr(workflow_state_module, "datetime", _FrozenClock)
+        assert 59 < state.get_time_in_phase() < 120
+        assert 59 < copied.get_time_in_phase() < 120
+    
     def test_get_phase_transitions(self):
         """Test getting phase transitions."""
         state = WorkflowState()
@@ -100,6 +130,23 @@ class TestWorkflowState:
         refinement_transitions = state.get_phase_transitions(DrawingPhase.REFINEMENT)
         assert len(refinement_transitions) == 2  # from sketch and to stylization
     
+    def test_get_phase_duration(self):
+        """Test summing time across repeated visits to a phase."""
+        S, R, ST = DrawingPhase.SKETCH, DrawingPhase.REFINEMENT, DrawingPhase.STYLIZATION
+        state = WorkflowState(current_phase=ST)
+        state.phase_history = [
+            PhaseTransition(S, R, timestamp=datetime(2024, 1, 1, 0, 0, 0)),
+            PhaseTransition(R, R, timestamp=datetime(2024, 1, 1, 0, 0, 10)),
+            PhaseTransition(R, S, timestamp=datetime(2024, 1, 1, 0, 0, 30)),
+            PhaseTransition(S, R, timestamp=datetime(2024, 1, 1, 0, 1, 0)),
+            PhaseTransition(R, ST, timestamp=datetime(2024, 1, 1, 0, 1, 5)),
+        ]
+        
+        assert state.get_phase_duration(R) == 35.0
+        assert state.get_phase_duration(S) == 30.0
+        assert state.get_phase_duration(ST) > 0
+        assert state.get_phase_duration(DrawingPhase.RENDERING) == 0.0
+    
     def test_is_phase_complete(self):
         """Test checking if workflow is complete."""
         state = WorkflowState()
@@ -31,8 +31,8 @@ Example:
     ...     print(f"- {error}")
 """
 
-from vision.vision_module import VisionModule
-from vision.core import ImageProcessor, PoseDetector, LandmarkDetector, Comparator
+import importlib
+
 from vision.models import (
     AnalysisResult,
     ComparisonResult,
@@ -50,9 +50,35 @@ from vision.models import (
 
 __version__ = "0.1.0"
 
+# Components that pull in OpenCV/MediaPipe are imported on first access
+_LAZY_IMPORTS = {
+    "VisionModule": "vision.vision_module",
+    "ImageProcessor": "vision.core.image_processor",
+    "GrabCutState": "vision.core.image_processor",
+    "PoseDetector": "vision.core.pose_detector",
+    "LandmarkDetector": "vision.core.landmark_detector",
+    "Comparator": "vision.core.comparator",
+}
+
+
+def __getattr__(name):
+    """Import heavy components lazily (PEP 562)."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
 __all__ = [
     "VisionModule",
     "ImageProcessor",
+    "GrabCutState",
     "PoseDetector",
     "LandmarkDetector",
     "Comparator",
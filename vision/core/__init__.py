@@ -4,13 +4,35 @@ Vision core components.
 Contains the main vision processing modules.
 """
 
-from vision.core.image_processor import ImageProcessor
-from vision.core.pose_detector import PoseDetector
-from vision.core.landmark_detector import LandmarkDetector
-from vision.core.comparator import Comparator
+import importlib
+
+# Imported on first access so that using one component does not load the
+# dependencies (e.g. MediaPipe) of all the others
+_LAZY_IMPORTS = {
+    "ImageProcessor": "vision.core.image_processor",
+    "GrabCutState": "vision.core.image_processor",
+    "PoseDetector": "vision.core.pose_detector",
+    "LandmarkDetector": "vision.core.landmark_detector",
+    "Comparator": "vision.core.comparator",
+}
+
+
+def __getattr__(name):
+    """Import components lazily (PEP 562)."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 __all__ = [
     "ImageProcessor",
+    "GrabCutState",
     "PoseDetector",
     "LandmarkDetector",
     "Comparator",
@@ -5,10 +5,13 @@ Provides metrics for pose differences, proportions, symmetry, and alignment.
 """
 
 from typing import Optional, Tuple, List, Dict, Any
+import threading
 import numpy as np
 import cv2
 
 from vision.models.pose_data import PoseData
+from vision.models.landmarks import landmarks_pairwise_distance
+from vision.utils.geometry import GeometryUtils
 from vision.models.analysis_result import AnalysisResult, ComparisonResult
 from vision.models.comparison_metrics import (
     PoseMetrics,
@@ -18,6 +21,75 @@ from vision.models.comparison_metrics import (
 )
 
 
+# Body ratios reported by analyze_proportions:
+# (ratio name, numerator segment, denominator segment, issue label)
+PROPORTION_RATIOS: Tuple[Tuple[str, str, str, str], ...] = (
+    ("head_to_body", "head_height", "total_height", "Head"),
+    ("torso_to_legs", "torso_length", "leg_length", "Torso"),
+    ("upper_arm_to_forearm", "upper_arm_length", "forearm_length", "Upper arm"),
+    ("thigh_to_shin", "thigh_length", "shin_length", "Thigh"),
+)
+
+
+# Default standard human proportions used by analyze_proportions
+STANDARD_PROPORTIONS: Dict[str, float] = {
+    "head_to_body": 1 / 7.5,  # Head is ~1/7.5 of total height
+    "torso_to_legs": 1.0,  # Torso and legs roughly equal
+    "upper_arm_to_forearm": 1.0,  # Equal length
+    "thigh_to_shin": 1.0,  # Equal length
+}
+
+
+# Segments measured between two keypoints: (segment name, start, end)
+LIMB_SEGMENTS: Tuple[Tuple[str, str, str], ...] = (
+    ("torso_length", "left_shoulder", "left_hip"),
+    ("leg_length", "left_hip", "left_ankle"),
+    ("upper_arm_length", "left_shoulder", "left_elbow"),
+    ("forearm_length", "left_elbow", "left_wrist"),
+    ("thigh_length", "left_hip", "left_knee"),
+    ("shin_length", "left_knee", "left_ankle"),
+)
+
+
+# Keypoints used by _calculate_body_segments, in row order
+_SEGMENT_NAMES = [
+    "nose", "left_shoulder", "right_shoulder", "left_ankle", "right_ankle",
+    "left_elbow", "left_wrist", "left_hip", "left_knee",
+]
+_LIMB_START_ROWS = [_SEGMENT_NAMES.index(start) for _, start, _ in LIMB_SEGMENTS]
+_LIMB_END_ROWS = [_SEGMENT_NAMES.index(end) for _, _, end in LIMB_SEGMENTS]
+
+
+# Joint angles compared by compare_poses: (point1, joint, point2)
+ANGLE_TRIPLETS: Tuple[Tuple[str, str, str], ...] = (
+    ("left_shoulder", "left_elbow", "left_wrist"),
+    ("right_shoulder", "right_elbow", "right_wrist"),
+    ("left_hip", "left_knee", "left_ankle"),
+    ("right_hip", "right_knee", "right_ankle"),
+)
+# Each keypoint is looked up once; triplets index into that list by row
+_ANGLE_KEYPOINTS = list(dict.fromkeys(name for triplet in ANGLE_TRIPLETS for name in triplet))
+_ANGLE_TRIPLET_ROWS = np.array(
+    [[_ANGLE_KEYPOINTS.index(name) for name in triplet] for triplet in ANGLE_TRIPLETS],
+    dtype=np.intp,
+).reshape(-1, 3)
+
+
+# Left-right keypoint pairs compared by analyze_symmetry
+SYMMETRY_PAIRS: Tuple[Tuple[str, str], ...] = (
+    ("left_shoulder", "right_shoulder"),
+    ("left_elbow", "right_elbow"),
+    ("left_wrist", "right_wrist"),
+    ("left_hip", "right_hip"),
+    ("left_knee", "right_knee"),
+    ("left_ankle", "right_ankle"),
+)
+_SYMMETRY_NAMES = [name for pair in SYMMETRY_PAIRS for name in pair]
+# Per pair: key in left_right_differences, label in asymmetric_features
+_SYMMETRY_KEYS = np.array([f"{left}_{right}" for left, right in SYMMETRY_PAIRS], dtype=object)
+_SYMMETRY_LABELS = np.array([f"{left}/{right}" for left, right in SYMMETRY_PAIRS], dtype=object)
+
+
 class Comparator:
     """
     Compares images and poses to identify differences and issues.
@@ -28,7 +100,9 @@ class Comparator:
     
     def __init__(self):
         """Initialize comparator."""
-        pass
+        # Reusable full-frame buffers for per-frame edge alignment, one per
+        # slot and thread, since one comparator is shared across threads
+        self._scratch = threading.local()
     
     def compare_poses(
         self,
@@ -52,26 +126,26 @@ class Comparator:
             pose1 = pose1.normalize()
             pose2 = pose2.normalize()
         
-        # Calculate keypoint differences
-        keypoint_differences = {}
-        missing_keypoints = []
+        # Align pose2 to pose1's keypoint order (first occurrence wins, as
+        # in get_keypoint) and compute all distances in one vectorized pass
+        names1 = pose1.get_keypoint_names()
+        xyz1, _ = pose1.as_array()
+        xyz2, found = pose2.as_array(names1)
+        distances = landmarks_pairwise_distance(xyz1[found], xyz2[found])
         
-        for kp1 in pose1.keypoints:
-            kp2 = pose2.get_keypoint(kp1.name)
-            if kp2:
-                distance = kp1.distance_to(kp2)
-                keypoint_differences[kp1.name] = distance
-            else:
-                missing_keypoints.append(kp1.name)
+        matched_names = [name for name, ok in zip(names1, found) if ok]
+        keypoint_differences = dict(zip(matched_names, distances.tolist()))
+        missing_keypoints = [name for name, ok in zip(names1, found) if not ok]
         
         # Check for keypoints in pose2 not in pose1
-        for kp2 in pose2.keypoints:
-            if pose1.get_keypoint(kp2.name) is None:
-                missing_keypoints.append(kp2.name)
+        known1 = set(names1)
+        missing_keypoints.extend(
+            name for name in pose2.get_keypoint_names() if name not in known1
+        )
         
         # Calculate overall difference (average of all keypoint differences)
         if keypoint_differences:
-            overall_difference = sum(keypoint_differences.values()) / len(keypoint_differences)
+            overall_difference = float(distances.mean())
         else:
             overall_difference = 1.0
         
@@ -96,51 +170,39 @@ class Comparator:
         pose2: PoseData
     ) -> Dict[str, float]:
         """Calculate differences in joint angles."""
-        angle_differences = {}
-        
-        # Define angle triplets (point1, joint, point2)
-        angle_triplets = [
-            ("left_shoulder", "left_elbow", "left_wrist"),
-            ("right_shoulder", "right_elbow", "right_wrist"),
-            ("left_hip", "left_knee", "left_ankle"),
-            ("right_hip", "right_knee", "right_ankle"),
-        ]
+        angles1, found1 = self._calculate_angles(pose1)
+        angles2, found2 = self._calculate_angles(pose2)
+        
+        # Normalize to 0-1 range (180 degrees = 1.0)
+        valid = found1 & found2
+        diffs = np.minimum(np.abs(angles1 - angles2) / 180.0, 1.0)
+        
+        return {
+            joint_name: diff
+            for (_, joint_name, _), ok, diff in zip(ANGLE_TRIPLETS, valid, diffs.tolist())
+            if ok
+        }
+    
+    def _calculate_angles(self, pose: PoseData) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the angle at every joint in ANGLE_TRIPLETS.
         
-        for p1_name, joint_name, p2_name in angle_triplets:
-            angle1 = self._calculate_angle(pose1, p1_name, joint_name, p2_name)
-            angle2 = self._calculate_angle(pose2, p1_name, joint_name, p2_name)
+        Args:
+            pose: Pose to measure
             
-            if angle1 is not None and angle2 is not None:
-                diff = abs(angle1 - angle2)
-                # Normalize to 0-1 range (180 degrees = 1.0)
-                angle_differences[joint_name] = min(diff / 180.0, 1.0)
+        Returns:
+            Tuple of angles in degrees and a mask of triplets whose three
+            keypoints are all present
+        """
+        coords, found = pose.as_array(_ANGLE_KEYPOINTS)
+        points = coords[_ANGLE_TRIPLET_ROWS, :2]  # (triplets, 3, 2)
+        found = found[_ANGLE_TRIPLET_ROWS].all(axis=1)
         
-        return angle_differences
-    
-    def _calculate_angle(
-        self,
-        pose: PoseData,
-        point1_name: str,
-        joint_name: str,
-        point2_name: str
-    ) -> Optional[float]:
-        """Calculate angle at a joint."""
-        p1 = pose.get_keypoint(point1_name)
-        joint = pose.get_keypoint(joint_name)
-        p2 = pose.get_keypoint(point2_name)
-        
-        if not all([p1, joint, p2]):
-            return None
-        
-        # Convert to arrays
-        v1 = np.array([p1.x - joint.x, p1.y - joint.y])
-        v2 = np.array([p2.x - joint.x, p2.y - joint.y])
-        
-        # Calculate angle
-        cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
-        angle = np.arccos(np.clip(cos_angle, -1.0, 1.0))
-        
-        return np.degrees(angle)
+        # Angle between the two limb vectors at each joint
+        angles = GeometryUtils.calculate_angles_batch(
+            points[:, 0], points[:, 1], points[:, 2]
+        )
+        return angles, found
     
     def analyze_proportions(
         self,
@@ -157,14 +219,8 @@ class Comparator:
         Returns:
             ProportionMetrics with analysis results
         """
-        # Default standard human proportions
         if standard_ratios is None:
-            standard_ratios = {
-                "head_to_body": 1 / 7.5,  # Head is ~1/7.5 of total height
-                "torso_to_legs": 1.0,  # Torso and legs roughly equal
-                "upper_arm_to_forearm": 1.0,  # Equal length
-                "thigh_to_shin": 1.0,  # Equal length
-            }
+            standard_ratios = STANDARD_PROPORTIONS
         
         # Calculate actual ratios
         body_ratios = {}
@@ -174,20 +230,34 @@ class Comparator:
         # Calculate body segment lengths
         segments = self._calculate_body_segments(pose)
         
-        if "head_height" in segments and "total_height" in segments:
-            if segments["total_height"] > 0:
-                ratio = segments["head_height"] / segments["total_height"]
-                body_ratios["head_to_body"] = ratio
-                if "head_to_body" in standard_ratios:
-                    deviation = ratio - standard_ratios["head_to_body"]
-                    deviation_from_standard["head_to_body"] = deviation
+        # Compute every available ratio and its deviation in one vectorized pass
+        available = [
+            entry for entry in PROPORTION_RATIOS
+            if entry[1] in segments and segments.get(entry[2], 0) > 0
+        ]
+        if available:
+            numerators = np.array([segments[entry[1]] for entry in available])
+            denominators = np.array([segments[entry[2]] for entry in available])
+            standards = np.array([standard_ratios.get(entry[0], np.nan) for entry in available])
+            ratios = numerators / denominators
+            deviations = ratios - standards
+            has_standard = ~np.isnan(standards)
+            
+            for (name, _, _, label), ratio, deviation, compared in zip(
+                available, ratios.tolist(), deviations.tolist(), has_standard.tolist()
+            ):
+                body_ratios[name] = ratio
+                if compared:
+                    deviation_from_standard[name] = deviation
                     if abs(deviation) > 0.05:
-                        issues.append(f"Head proportion off by {deviation:.2%}")
-        
-        # Calculate overall score (1.0 - average deviation)
-        if deviation_from_standard:
-            avg_deviation = sum(abs(d) for d in deviation_from_standard.values()) / len(deviation_from_standard)
-            overall_score = max(0.0, 1.0 - avg_deviation * 5)
+                        issues.append(f"{label} proportion off by {deviation:.2%}")
+            
+            # Overall score is 1.0 - 5x the average absolute deviation
+            if has_standard.any():
+                avg_deviation = float(np.abs(deviations[has_standard]).mean())
+                overall_score = max(0.0, 1.0 - avg_deviation * 5)
+            else:
+                overall_score = 0.5  # Neutral if no data
         else:
             overall_score = 0.5  # Neutral if no data
         
@@ -202,44 +272,35 @@ class Comparator:
         """Calculate lengths of body segments."""
         segments = {}
         
-        # Helper to calculate distance
-        def dist(kp1_name: str, kp2_name: str) -> Optional[float]:
-            kp1 = pose.get_keypoint(kp1_name)
-            kp2 = pose.get_keypoint(kp2_name)
-            if kp1 and kp2:
-                return kp1.distance_to(kp2)
-            return None
-        
-        # Head height (nose to center of shoulders)
-        left_shoulder = pose.get_keypoint("left_shoulder")
-        right_shoulder = pose.get_keypoint("right_shoulder")
-        nose = pose.get_keypoint("nose")
-        if left_shoulder and right_shoulder and nose:
-            # Calculate shoulder center
-            shoulder_center_x = (left_shoulder.x + right_shoulder.x) / 2
-            shoulder_center_y = (left_shoulder.y + right_shoulder.y) / 2
-            shoulder_center_z = (left_shoulder.z + right_shoulder.z) / 2
-            # Calculate distance from nose to shoulder center
-            dx = nose.x - shoulder_center_x
-            dy = nose.y - shoulder_center_y
-            dz = nose.z - shoulder_center_z
-            segments["head_height"] = float(np.sqrt(dx*dx + dy*dy + dz*dz))
-        
-        # Total height (nose to ankle)
-        left_ankle_dist = dist("nose", "left_ankle")
-        right_ankle_dist = dist("nose", "right_ankle")
+        coords, found = pose.as_array(_SEGMENT_NAMES)
+        nose, left_shoulder, right_shoulder, left_ankle, right_ankle = coords[:5]
+        
+        # All segments in one pass: head height (nose to shoulder center),
+        # nose to each ankle, then every limb segment. Segments with a
+        # missing endpoint come out NaN and are zeroed.
+        starts = np.vstack([nose, nose, nose, coords[_LIMB_START_ROWS]])
+        ends = np.vstack([
+            (left_shoulder + right_shoulder) / 2,
+            left_ankle,
+            right_ankle,
+            coords[_LIMB_END_ROWS],
+        ])
+        lengths = np.nan_to_num(
+            GeometryUtils.calculate_distances_batch(starts, ends), nan=0.0
+        ).tolist()
+        head_height, left_ankle_dist, right_ankle_dist = lengths[:3]
+        
+        if found[:3].all():
+            segments["head_height"] = head_height
+        
+        # Total height (nose to the farther ankle)
         if left_ankle_dist or right_ankle_dist:
-            segments["total_height"] = max(left_ankle_dist or 0, right_ankle_dist or 0)
-        
-        # Torso (shoulder to hip)
-        torso_dist = dist("left_shoulder", "left_hip")
-        if torso_dist:
-            segments["torso_length"] = torso_dist
+            segments["total_height"] = max(left_ankle_dist, right_ankle_dist)
         
-        # Legs (hip to ankle)
-        leg_dist = dist("left_hip", "left_ankle")
-        if leg_dist:
-            segments["leg_length"] = leg_dist
+        # Limb segments are skipped when missing or zero-length
+        for (name, _, _), length in zip(LIMB_SEGMENTS, lengths[3:]):
+            if length:
+                segments[name] = length
         
         return segments
     
@@ -256,16 +317,6 @@ class Comparator:
         left_right_differences = {}
         asymmetric_features = []
         
-        # Define left-right pairs
-        pairs = [
-            ("left_shoulder", "right_shoulder"),
-            ("left_elbow", "right_elbow"),
-            ("left_wrist", "right_wrist"),
-            ("left_hip", "right_hip"),
-            ("left_knee", "right_knee"),
-            ("left_ankle", "right_ankle"),
-        ]
-        
         # Calculate symmetry axis (vertical line through center)
         bounds = pose.calculate_bounds()
         if bounds:
@@ -275,27 +326,20 @@ class Comparator:
         else:
             symmetry_axis = None
         
-        # Compare left-right pairs
-        for left_name, right_name in pairs:
-            left_kp = pose.get_keypoint(left_name)
-            right_kp = pose.get_keypoint(right_name)
+        # Compare all left-right pairs at once: rows alternate left, right
+        if symmetry_axis:
+            coords, found = pose.as_array(_SYMMETRY_NAMES)
+            axis_dist = np.abs(coords[:, 0] - symmetry_axis[0]).reshape(-1, 2)
+            diffs = np.abs(axis_dist[:, 0] - axis_dist[:, 1])
+            valid = found.reshape(-1, 2).all(axis=1)
             
-            if left_kp and right_kp and symmetry_axis:
-                # Calculate distance from symmetry axis for each
-                center_x = symmetry_axis[0]
-                left_dist = abs(left_kp.x - center_x)
-                right_dist = abs(right_kp.x - center_x)
-                
-                # Calculate difference
-                diff = abs(left_dist - right_dist)
-                left_right_differences[f"{left_name}_{right_name}"] = diff
-                
-                if diff > 0.15:
-                    asymmetric_features.append(f"{left_name}/{right_name}")
+            diffs = diffs[valid]
+            left_right_differences = dict(zip(_SYMMETRY_KEYS[valid], diffs.tolist()))
+            asymmetric_features = _SYMMETRY_LABELS[valid][diffs > 0.15].tolist()
         
         # Calculate overall symmetry score
         if left_right_differences:
-            avg_diff = sum(left_right_differences.values()) / len(left_right_differences)
+            avg_diff = float(diffs.mean())
             symmetry_score = max(0.0, 1.0 - avg_diff * 3)
         else:
             symmetry_score = 0.5
@@ -310,7 +354,9 @@ class Comparator:
     def calculate_edge_alignment(
         self,
         edges1: np.ndarray,
-        edges2: np.ndarray
+        edges2: np.ndarray,
+        return_heatmap: bool = True,
+        downsample: int = 1
     ) -> AlignmentMetrics:
         """
         Calculate alignment between edge maps.
@@ -318,19 +364,32 @@ class Comparator:
         Args:
             edges1: First edge map (canvas)
             edges2: Second edge map (reference)
+            return_heatmap: Include the misalignment heatmap (uint8 mask,
+                255 where exactly one map has an edge) in the result
+            downsample: Factor (1-16) to shrink both edge maps by before
+                comparing. Shrinking is area-averaged, so a block with any
+                edge pixel counts as an edge. Region boxes are scaled back
+                to full resolution; the heatmap stays at the reduced
+                resolution.
             
         Returns:
             AlignmentMetrics with alignment analysis
+            
+        Raises:
+            ValueError: If downsample is outside 1-16
         """
-        # Ensure same size
-        if edges1.shape != edges2.shape:
-            edges2 = cv2.resize(edges2, (edges1.shape[1], edges1.shape[0]))
-        
-        # Calculate overlap
-        overlap = np.logical_and(edges1 > 0, edges2 > 0)
-        edge1_pixels = np.sum(edges1 > 0)
-        edge2_pixels = np.sum(edges2 > 0)
-        overlap_pixels = np.sum(overlap)
+        if not 1 <= downsample <= 16:
+            raise ValueError(f"downsample must be between 1 and 16, got {downsample}")
+        
+        # Scores need only mask counts; the regions are labelled from the
+        # XOR of the same masks on first access
+        mask1, mask2 = self._prepare_edge_masks(edges1, edges2, downsample)
+        overlap = cv2.bitwise_and(
+            mask1, mask2, dst=self._get_scratch_buffer("overlap", mask1.shape, np.uint8)
+        )
+        edge1_pixels = cv2.countNonZero(mask1)
+        edge2_pixels = cv2.countNonZero(mask2)
+        overlap_pixels = cv2.countNonZero(overlap)
         
         # Calculate edge overlap percentage
         if edge1_pixels > 0 or edge2_pixels > 0:
@@ -338,47 +397,149 @@ class Comparator:
         else:
             edge_overlap = 0.0
         
-        # Create alignment heatmap (XOR shows misalignment)
-        heatmap = np.logical_xor(edges1 > 0, edges2 > 0).astype(np.float32)
+        # Misaligned pixels are the XOR of the masks: |A| + |B| - 2|A & B|
+        misaligned_pixels = edge1_pixels + edge2_pixels - 2 * overlap_pixels
+        alignment_score = 1.0 - misaligned_pixels / mask1.size
         
-        # Calculate alignment score (1.0 - misalignment)
-        alignment_score = 1.0 - (np.sum(heatmap) / heatmap.size)
+        # A fresh array: the masks live in scratch buffers the next call reuses
+        misaligned_mask = cv2.bitwise_xor(mask1, mask2)
+        min_region_area = max(1, 100 // (downsample * downsample))
         
-        # Find misaligned regions (simplified - uses contours)
-        misaligned_regions = self._find_misaligned_regions(heatmap)
+        def find_regions() -> List[Tuple[int, int, int, int]]:
+            # Connected components of the XOR, scaled back to full resolution
+            regions = self._find_misaligned_regions(misaligned_mask, min_region_area)
+            if downsample > 1:
+                regions = [
+                    (x * downsample, y * downsample, w * downsample, h * downsample)
+                    for x, y, w, h in regions
+                ]
+            return regions
         
         return AlignmentMetrics(
             alignment_score=alignment_score,
             edge_overlap=edge_overlap,
-            heatmap=heatmap,
-            misaligned_regions=misaligned_regions
+            heatmap=misaligned_mask if return_heatmap else None,
+            misaligned_regions=find_regions
         )
     
+    def _prepare_edge_masks(
+        self,
+        edges1: np.ndarray,
+        edges2: np.ndarray,
+        downsample: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bring two edge maps to a common size and convert them to uint8 masks.
+        
+        Args:
+            edges1: First edge map, whose (reduced) size is used for both
+            edges2: Second edge map
+            downsample: Factor to shrink both maps by
+            
+        Returns:
+            Tuple of the two masks (255 where edges > 0), held in scratch
+            buffers that the next call overwrites
+        """
+        if downsample > 1:
+            # Both maps go straight to the reduced size of edges1
+            size = (
+                max(1, edges1.shape[1] // downsample),
+                max(1, edges1.shape[0] // downsample),
+            )
+            edges1 = self._downsample_edges("small1", edges1, size)
+            edges2 = self._downsample_edges("small2", edges2, size)
+        
+        # Ensure same size; nearest-neighbour keeps edge maps binary
+        elif edges1.shape != edges2.shape:
+            if edges2.dtype == np.bool_:
+                edges2 = edges2.view(np.uint8)
+            resized = self._get_scratch_buffer(
+                "resized", edges1.shape[:2] + edges2.shape[2:], edges2.dtype
+            )
+            edges2 = cv2.resize(
+                edges2, (edges1.shape[1], edges1.shape[0]),
+                dst=resized, interpolation=cv2.INTER_NEAREST
+            )
+        
+        mask1 = self._edge_mask(edges1, self._get_scratch_buffer("mask1", edges1.shape, np.uint8))
+        mask2 = self._edge_mask(edges2, self._get_scratch_buffer("mask2", edges1.shape, np.uint8))
+        return mask1, mask2
+    
+    def _get_scratch_buffer(
+        self,
+        slot: str,
+        shape: Tuple[int, ...],
+        dtype: np.dtype
+    ) -> np.ndarray:
+        """
+        Get a reusable buffer for intermediate results that are never returned.
+        
+        Each slot holds one buffer per thread, replaced when the requested
+        shape or dtype changes, so comparing same-sized frames allocates
+        nothing.
+        
+        Args:
+            slot: Name of the intermediate result
+            shape: Buffer shape
+            dtype: Buffer dtype
+            
+        Returns:
+            Uninitialized buffer of the requested shape and dtype
+        """
+        buffers = getattr(self._scratch, "buffers", None)
+        if buffers is None:
+            buffers = self._scratch.buffers = {}
+        
+        buffer = buffers.get(slot)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = buffers[slot] = np.empty(shape, dtype=dtype)
+        return buffer
+    
+    def _downsample_edges(
+        self,
+        slot: str,
+        edges: np.ndarray,
+        size: Tuple[int, int]
+    ) -> np.ndarray:
+        """Area-downsample the mask of an edge map to (width, height)."""
+        # Averaging a 0/255 mask keeps any block with an edge pixel nonzero
+        # (255 / 16**2 still rounds to 1), whatever the input dtype
+        mask = self._edge_mask(edges, self._get_scratch_buffer(slot + "_full", edges.shape, np.uint8))
+        out = self._get_scratch_buffer(slot, (size[1], size[0]), np.uint8)
+        return cv2.resize(mask, size, dst=out, interpolation=cv2.INTER_AREA)
+    
+    @staticmethod
+    def _edge_mask(edges: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Write a uint8 mask of an edge map (255 where edges > 0) into out."""
+        if edges.dtype == np.bool_:
+            edges = edges.view(np.uint8)
+        if edges.dtype == np.uint8:
+            return cv2.compare(edges, 0, cv2.CMP_GT, dst=out)
+        np.multiply(edges > 0, 255, out=out, casting="unsafe")
+        return out
+    
     def _find_misaligned_regions(
         self,
         heatmap: np.ndarray,
         min_area: int = 100
     ) -> List[Tuple[int, int, int, int]]:
         """Find regions with significant misalignment."""
-        # Convert to uint8 for contour detection
-        heatmap_uint8 = (heatmap * 255).astype(np.uint8)
-        
-        # Find contours
-        contours, _ = cv2.findContours(
-            heatmap_uint8,
-            cv2.RETR_EXTERNAL,
-            cv2.CHAIN_APPROX_SIMPLE
-        )
+        # Convert to uint8 for labelling (masks need no copy)
+        if heatmap.dtype == np.bool_:
+            heatmap_uint8 = heatmap.view(np.uint8)
+        elif heatmap.dtype == np.uint8:
+            heatmap_uint8 = heatmap
+        else:
+            heatmap_uint8 = (heatmap * 255).astype(np.uint8)
+        
+        # Areas and bounding boxes of all connected regions in one pass
+        _, _, stats, _ = cv2.connectedComponentsWithStats(heatmap_uint8, connectivity=8)
         
-        # Extract bounding boxes for large misaligned regions
-        regions = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area >= min_area:
-                x, y, w, h = cv2.boundingRect(contour)
-                regions.append((x, y, w, h))
+        # Keep large regions (label 0 is the background)
+        stats = stats[1:]
+        boxes = stats[stats[:, cv2.CC_STAT_AREA] >= min_area, :4]
         
-        # Sort by area (largest first)
-        regions.sort(key=lambda r: r[2] * r[3], reverse=True)
+        # Sort by bounding box area (largest first)
+        order = np.argsort(-(boxes[:, 2] * boxes[:, 3]), kind="stable")
         
-        return regions
+        return [tuple(box) for box in boxes[order].tolist()]
@@ -4,11 +4,83 @@ Image processing utilities.
 Handles loading, preprocessing, and basic image operations using OpenCV.
 """
 
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Union, Optional, Tuple
 from pathlib import Path
+import io
+import threading
 import numpy as np
 import cv2
-from PIL import Image
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+# EXIF tag holding the image orientation (1-8)
+_EXIF_ORIENTATION = 0x0112
+
+
+def _read_image_file(path: str) -> Optional[np.ndarray]:
+    """
+    Decode an image file to BGR.
+    
+    The file is read with np.fromfile and decoded with cv2.imdecode, which
+    (unlike cv2.imread) also handles non-ASCII paths on Windows.
+    
+    Args:
+        path: File path
+        
+    Returns:
+        Decoded image, or None if the data could not be decoded
+    """
+    data = np.fromfile(path, dtype=np.uint8)
+    if data.size == 0:
+        return None
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+@lru_cache(maxsize=8)
+def _decode_image_file(path: str, mtime_ns: int, size: int) -> Optional[np.ndarray]:
+    """
+    Decode an image file once per path, mtime and size (see _read_image_file).
+    
+    Only used by load_image(cache=True). The returned array is shared by
+    all cache hits, so it is made read-only.
+    
+    Args:
+        path: File path
+        mtime_ns: File modification time, part of the cache key
+        size: File size in bytes, part of the cache key
+        
+    Returns:
+        Read-only decoded image, or None if the data could not be decoded
+    """
+    image = _read_image_file(path)
+    if image is not None:
+        image.flags.writeable = False
+    return image
+
+
+@dataclass
+class GrabCutState:
+    """
+    GrabCut models carried between frames of a slowly changing scene.
+    
+    Pass the same instance to successive extract_silhouette calls. The first
+    call (or one after a frame size change) segments from the border
+    rectangle with the full iteration count; later calls refine the previous
+    mask and color models with only refine_iterations iterations.
+    """
+    refine_iterations: int = 2
+    mask: Optional[np.ndarray] = field(default=None, repr=False)
+    bgd_model: np.ndarray = field(default_factory=lambda: np.zeros((1, 65), np.float64), repr=False)
+    fgd_model: np.ndarray = field(default_factory=lambda: np.zeros((1, 65), np.float64), repr=False)
+    
+    def reset(self) -> None:
+        """Forget the carried mask and models so the next call starts fresh."""
+        self.mask = None
+        self.bgd_model[:] = 0
+        self.fgd_model[:] = 0
 
 
 class ImageProcessor:
@@ -19,46 +91,72 @@ class ImageProcessor:
     and preparing them for vision analysis.
     """
     
+    # Per-thread scratch buffers for intermediate images, keyed by shape
+    _scratch = threading.local()
+    MAX_SCRATCH_ENTRIES = 4
+    
+    # Color conversions to BGR applied by load_image, keyed by channel
+    # count (numpy arrays) or PIL mode. Missing keys need no conversion
+    # (numpy) or are converted through RGB first (PIL).
+    _NP_CONVERTERS = {
+        1: cv2.COLOR_GRAY2BGR,
+        4: cv2.COLOR_RGBA2BGR,
+    }
+    _PIL_CONVERTERS = {
+        'RGB': cv2.COLOR_RGB2BGR,
+        'RGBA': cv2.COLOR_RGBA2BGR,
+        'L': cv2.COLOR_GRAY2BGR,
+    }
+    
     @staticmethod
-    def load_image(source: Union[str, Path, Image.Image, np.ndarray]) -> np.ndarray:
+    def load_image(
+        source: Union[str, Path, Image.Image, np.ndarray, bytes, io.BufferedIOBase],
+        target_size: Optional[Tuple[int, int]] = None,
+        cache: bool = False
+    ) -> np.ndarray:
         """
         Load image from various sources.
         
         Args:
-            source: Image source (file path, PIL Image, or numpy array)
+            source: Image source (file path, PIL Image, numpy array, encoded
+                bytes, or a binary stream such as io.BytesIO)
+            target_size: Optional (width, height) hint. JPEG files are then
+                decoded at the smallest DCT scale (1/2, 1/4, 1/8) that is
+                still at least this size; other sources ignore it.
+            cache: Keep decoded files (keyed on path, mtime and size) in a
+                small process-wide cache, for images that are loaded again
+                and again such as a reference. Cached images are returned
+                read-only and shared between loads; clear the cache with
+                clear_file_cache. Ignored for other sources and for
+                reduced-size JPEG decodes.
             
         Returns:
             Image as numpy array in BGR format (OpenCV convention)
             
         Raises:
-            ValueError: If source type is not supported
+            ValueError: If source type is not supported or the file cannot
+                be decoded
             FileNotFoundError: If file path does not exist
         """
         if isinstance(source, np.ndarray):
-            # Already a numpy array
-            if len(source.shape) == 2:
-                # Grayscale, convert to BGR
-                return cv2.cvtColor(source, cv2.COLOR_GRAY2BGR)
-            elif source.shape[2] == 3:
-                return source
-            elif source.shape[2] == 4:
-                # RGBA, convert to BGR
-                return cv2.cvtColor(source, cv2.COLOR_RGBA2BGR)
-            return source
+            # Already a numpy array; 2D arrays are single-channel grayscale
+            channels = source.shape[2] if source.ndim > 2 else 1
+            code = ImageProcessor._NP_CONVERTERS.get(channels)
+            return source if code is None else cv2.cvtColor(source, code)
         
         elif isinstance(source, Image.Image):
-            # PIL Image
-            if source.mode == 'RGB':
-                # Convert RGB to BGR
-                return cv2.cvtColor(np.array(source), cv2.COLOR_RGB2BGR)
-            elif source.mode == 'RGBA':
-                return cv2.cvtColor(np.array(source), cv2.COLOR_RGBA2BGR)
-            elif source.mode == 'L':
-                return cv2.cvtColor(np.array(source), cv2.COLOR_GRAY2BGR)
-            else:
-                # Convert to RGB first, then to BGR
-                rgb_image = source.convert('RGB')
-                return cv2.cvtColor(np.array(rgb_image), cv2.COLOR_RGB2BGR)
+            # PIL Image; unlisted modes are converted to RGB first
+            code = ImageProcessor._PIL_CONVERTERS.get(source.mode)
+            if code is None:
+                source = source.convert('RGB')
+                code = cv2.COLOR_RGB2BGR
+            # All listed modes are 8 bits per band, so wrap the raw bytes
+            # without the extra copy np.array would make; cvtColor then
+            # writes the only output buffer
+            pixels = np.frombuffer(source.tobytes(), dtype=np.uint8).reshape(
+                source.height, source.width, len(source.getbands())
+            )
+            return cv2.cvtColor(pixels, code)
         
         elif isinstance(source, (str, Path)):
             # File path
@@ -66,28 +164,89 @@ class ImageProcessor:
             if not path.exists():
                 raise FileNotFoundError(f"Image file not found: {path}")
             
-            image = cv2.imread(str(path))
+            if target_size is not None and path.suffix.lower() in (".jpg", ".jpeg"):
+                # Reduced-resolution decode straight from the DCT coefficients,
+                # rotated by the EXIF orientation as cv2.imdecode would
+                try:
+                    with Image.open(path) as pil_image:
+                        width, height = target_size
+                        if pil_image.getexif().get(_EXIF_ORIENTATION, 1) in (5, 6, 7, 8):
+                            # Stored sideways, so the hint applies transposed
+                            width, height = height, width
+                        pil_image.draft('RGB', (width, height))
+                        rgb = np.asarray(ImageOps.exif_transpose(pil_image).convert('RGB'))
+                except (UnidentifiedImageError, OSError) as error:
+                    raise ValueError(f"Failed to load image from: {path}") from error
+                return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+            
+            if cache:
+                stat = path.stat()
+                image = _decode_image_file(str(path), stat.st_mtime_ns, stat.st_size)
+            else:
+                image = _read_image_file(str(path))
             if image is None:
                 raise ValueError(f"Failed to load image from: {path}")
             return image
         
+        elif isinstance(source, (bytes, bytearray, memoryview, io.BufferedIOBase)):
+            # Encoded image data in memory
+            data = source.read() if isinstance(source, io.BufferedIOBase) else source
+            image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError("Failed to decode image from bytes")
+            return image
+        
         else:
             raise ValueError(f"Unsupported image source type: {type(source)}")
     
     @staticmethod
-    def to_rgb(image: np.ndarray) -> np.ndarray:
+    def clear_file_cache() -> None:
+        """Drop the images kept by load_image(cache=True)."""
+        _decode_image_file.cache_clear()
+    
+    @staticmethod
+    def to_rgb(image: np.ndarray, reuse_buffer: bool = False) -> np.ndarray:
         """
         Convert BGR image to RGB.
         
         Args:
             image: BGR image
+            reuse_buffer: Write into a per-thread scratch buffer instead of
+                allocating. The result is overwritten by the next such call
+                on the same thread, so only use it for data that is consumed
+                (or copied) immediately, e.g. frames passed to MediaPipe.
             
         Returns:
             RGB image
         """
-        if len(image.shape) == 2:
-            return cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
-        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        code = cv2.COLOR_GRAY2RGB if len(image.shape) == 2 else cv2.COLOR_BGR2RGB
+        if not reuse_buffer:
+            return cv2.cvtColor(image, code)
+        
+        dst = ImageProcessor._get_scratch_buffer(
+            image.shape[:2] + (3,), image.dtype, slot="rgb"
+        )
+        return cv2.cvtColor(image, code, dst=dst)
+    
+    @staticmethod
+    def copy_to(image: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get a drawing canvas holding a copy of an image.
+        
+        Args:
+            image: Source image
+            out: Array to copy into (same shape and dtype as image); pass
+                the image itself to draw on it in place. None allocates a
+                new copy.
+            
+        Returns:
+            The canvas: out if given, otherwise a new copy of image
+        """
+        if out is None:
+            return image.copy()
+        if out is not image:
+            np.copyto(out, image)
+        return out
     
     @staticmethod
     def to_grayscale(image: np.ndarray) -> np.ndarray:
@@ -149,7 +308,9 @@ class ImageProcessor:
     def extract_silhouette(
         image: np.ndarray,
         method: str = "grabcut",
-        threshold: int = 127
+        threshold: int = 127,
+        gray: Optional[np.ndarray] = None,
+        grabcut_state: Optional[GrabCutState] = None
     ) -> np.ndarray:
         """
         Extract silhouette/foreground mask from image.
@@ -158,11 +319,15 @@ class ImageProcessor:
             image: Input image
             method: Extraction method ("threshold", "grabcut", "adaptive")
             threshold: Threshold value for simple thresholding
+            gray: Precomputed grayscale version of image (optional)
+            grabcut_state: GrabCut models reused across calls on successive
+                frames (optional, "grabcut" only)
             
         Returns:
             Binary mask (0 or 255)
         """
-        gray = ImageProcessor.to_grayscale(image)
+        if gray is None:
+            gray = ImageProcessor.to_grayscale(image)
         
         if method == "threshold":
             _, mask = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
@@ -177,22 +342,46 @@ class ImageProcessor:
         
         elif method == "grabcut":
             # GrabCut algorithm for more sophisticated segmentation
-            mask = np.zeros(image.shape[:2], np.uint8)
-            bgd_model = np.zeros((1, 65), np.float64)
-            fgd_model = np.zeros((1, 65), np.float64)
+            state = grabcut_state
+            refine = (
+                state is not None
+                and state.mask is not None
+                and state.mask.shape == image.shape[:2]
+            )
+            if refine:
+                # Continue from the previous frame's segmentation
+                mask, bgd_model, fgd_model = state.mask, state.bgd_model, state.fgd_model
+            else:
+                mask = np.zeros(image.shape[:2], np.uint8)
+                if state is not None:
+                    state.reset()
+                    bgd_model, fgd_model = state.bgd_model, state.fgd_model
+                else:
+                    bgd_model = np.zeros((1, 65), np.float64)
+                    fgd_model = np.zeros((1, 65), np.float64)
             
             # Define rectangle around the foreground
             h, w = image.shape[:2]
             rect = (10, 10, w - 20, h - 20)
             
             try:
-                cv2.grabCut(image, mask, rect, bgd_model, fgd_model, 5, cv2.GC_INIT_WITH_RECT)
+                if refine:
+                    cv2.grabCut(
+                        image, mask, None, bgd_model, fgd_model,
+                        state.refine_iterations, cv2.GC_INIT_WITH_MASK
+                    )
+                else:
+                    cv2.grabCut(image, mask, rect, bgd_model, fgd_model, 5, cv2.GC_INIT_WITH_RECT)
+                    if state is not None:
+                        state.mask = mask
                 # Create binary mask
                 binary_mask = np.where((mask == 2) | (mask == 0), 0, 255).astype('uint8')
                 return binary_mask
             except (cv2.error, ValueError) as e:
                 # Fallback to threshold if GrabCut fails
                 # This can happen with very small images or images with too few colors
+                if state is not None:
+                    state.reset()
                 _, binary_mask = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
                 return binary_mask
         
@@ -203,7 +392,8 @@ class ImageProcessor:
     def detect_edges(
         image: np.ndarray,
         low_threshold: int = 50,
-        high_threshold: int = 150
+        high_threshold: int = 150,
+        gray: Optional[np.ndarray] = None
     ) -> np.ndarray:
         """
         Detect edges in image using Canny edge detection.
@@ -212,20 +402,98 @@ class ImageProcessor:
             image: Input image
             low_threshold: Lower threshold for Canny
             high_threshold: Upper threshold for Canny
+            gray: Precomputed grayscale version of image (optional)
             
         Returns:
             Edge map (binary image)
         """
-        gray = ImageProcessor.to_grayscale(image)
+        if gray is None:
+            gray = ImageProcessor.to_grayscale(image)
         
-        # Apply Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(gray, (5, 5), 1.4)
+        # Apply Gaussian blur to reduce noise (into a reused scratch buffer)
+        blurred = ImageProcessor._get_scratch_buffer(gray.shape, gray.dtype, slot="blur")
+        cv2.GaussianBlur(gray, (5, 5), 1.4, dst=blurred)
         
         # Apply Canny edge detection
         edges = cv2.Canny(blurred, low_threshold, high_threshold)
         
         return edges
     
+    @staticmethod
+    def compute_edges_and_mask(
+        image: np.ndarray,
+        low_threshold: int = 50,
+        high_threshold: int = 150,
+        method: str = "grabcut",
+        threshold: int = 127,
+        grabcut_state: Optional[GrabCutState] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Detect edges and extract the silhouette from a single grayscale pass.
+        
+        Equivalent to calling detect_edges and extract_silhouette separately,
+        but the BGR to grayscale conversion is done once into a reused
+        scratch buffer and shared by both paths.
+        
+        Args:
+            image: Input image
+            low_threshold: Lower threshold for Canny
+            high_threshold: Upper threshold for Canny
+            method: Silhouette extraction method ("threshold", "grabcut", "adaptive")
+            threshold: Threshold value for simple thresholding
+            grabcut_state: GrabCut models reused across calls on successive
+                frames (optional, "grabcut" only)
+            
+        Returns:
+            Tuple of (edge map, binary silhouette mask)
+        """
+        if len(image.shape) == 2:
+            gray = image
+        else:
+            gray = ImageProcessor._get_scratch_buffer(image.shape[:2], np.uint8, slot="gray")
+            cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=gray)
+        
+        edges = ImageProcessor.detect_edges(image, low_threshold, high_threshold, gray=gray)
+        mask = ImageProcessor.extract_silhouette(
+            image, method, threshold, gray=gray, grabcut_state=grabcut_state
+        )
+        return edges, mask
+    
+    @staticmethod
+    def _get_scratch_buffer(
+        shape: Tuple[int, ...],
+        dtype: np.dtype,
+        slot: str = ""
+    ) -> np.ndarray:
+        """
+        Get a reusable buffer for intermediate results that are never returned.
+        
+        Buffers are kept per thread in a small LRU so repeated calls on
+        same-sized frames skip the allocation.
+        
+        Args:
+            shape: Buffer shape
+            dtype: Buffer dtype
+            slot: Name distinguishing buffers that must be live at the same time
+            
+        Returns:
+            Uninitialized buffer of the requested shape and dtype
+        """
+        buffers = getattr(ImageProcessor._scratch, "buffers", None)
+        if buffers is None:
+            buffers = ImageProcessor._scratch.buffers = OrderedDict()
+        
+        key = (slot, tuple(shape), np.dtype(dtype).str)
+        buffer = buffers.get(key)
+        if buffer is None:
+            buffer = np.empty(shape, dtype=dtype)
+            buffers[key] = buffer
+            if len(buffers) > ImageProcessor.MAX_SCRATCH_ENTRIES:
+                buffers.popitem(last=False)
+        else:
+            buffers.move_to_end(key)
+        return buffer
+    
     @staticmethod
     def normalize_image(image: np.ndarray) -> np.ndarray:
         """
@@ -237,7 +505,8 @@ class ImageProcessor:
         Returns:
             Normalized image (float32, 0-1 range)
         """
-        return image.astype(np.float32) / 255.0
+        # Cast and divide in one ufunc pass, without a float32 temporary
+        return np.divide(image, np.float32(255.0), dtype=np.float32)
     
     @staticmethod
     def denormalize_image(image: np.ndarray) -> np.ndarray:
@@ -248,9 +517,11 @@ class ImageProcessor:
             image: Normalized image (0-1 range)
             
         Returns:
-            Image in 0-255 range (uint8)
+            Image in 0-255 range (uint8), rounded and clamped
         """
-        return (image * 255).astype(np.uint8)
+        # Round and clamp in one float32 buffer; values below 0 become 0
+        scaled = np.multiply(image, 255, dtype=np.float32)
+        return np.clip(np.rint(scaled, out=scaled), 0, 255, out=scaled).astype(np.uint8)
     
     @staticmethod
     def get_dimensions(image: np.ndarray) -> Tuple[int, int]:
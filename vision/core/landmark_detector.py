@@ -4,13 +4,55 @@ Landmark detection for faces and hands using MediaPipe.
 Handles detection of facial landmarks and hand landmarks.
 """
 
-from typing import List, Optional
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+import threading
 import numpy as np
 import cv2
 import mediapipe as mp
 
-from vision.models.landmarks import FaceLandmarks, HandLandmarks, Landmark
+from vision.models.landmarks import (
+    FACE_CONTOUR_INDICES,
+    FaceLandmarks,
+    HandLandmarks,
+    landmark_list_to_array,
+)
 from vision.core.image_processor import ImageProcessor
+from vision.core.model_cache import SHARED_MODELS
+
+
+# Pixels filled by cv2.circle(image, center, 1, color, -1), as (dx, dy)
+_DOT_OFFSETS = np.array([(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)], dtype=np.int32)
+
+
+def _points_buffer(n: int) -> np.ndarray:
+    """Per-thread (n, 2) int32 scratch for pixel coordinates while drawing."""
+    return ImageProcessor._get_scratch_buffer((n, 2), np.int32, slot="points")
+
+
+def _stamp_dots(image: np.ndarray, points: np.ndarray, color: tuple) -> None:
+    """
+    Draw filled radius-1 dots at many points with one indexed assignment.
+    
+    Produces the same pixels as calling cv2.circle(image, pt, 1, color, -1)
+    for every point.
+    
+    Args:
+        image: Image to draw on in place
+        points: (N, 2) int array of x, y pixel coordinates
+        color: Dot color (BGR)
+    """
+    h, w = image.shape[:2]
+    stamped = (points[:, None, :] + _DOT_OFFSETS).reshape(-1, 2)
+    inside = (
+        (stamped[:, 0] >= 0) & (stamped[:, 0] < w)
+        & (stamped[:, 1] >= 0) & (stamped[:, 1] < h)
+    )
+    stamped = stamped[inside]
+    
+    channels = image.shape[2] if image.ndim == 3 else 1
+    value = np.zeros(channels)
+    value[:min(channels, len(color))] = color[:channels]
+    image[stamped[:, 1], stamped[:, 0]] = value if image.ndim == 3 else value[0]
 
 
 class LandmarkDetector:
@@ -20,12 +62,27 @@ class LandmarkDetector:
     Provides detection of fine-grained features for detailed analysis.
     """
     
+    # MediaPipe hand connections as (start, end) landmark indices
+    HAND_CONNECTIONS = np.array([
+        (0, 1), (1, 2), (2, 3), (3, 4),  # Thumb
+        (0, 5), (5, 6), (6, 7), (7, 8),  # Index
+        (0, 9), (9, 10), (10, 11), (11, 12),  # Middle
+        (0, 13), (13, 14), (14, 15), (15, 16),  # Ring
+        (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky
+        (5, 9), (9, 13), (13, 17)  # Palm
+    ], dtype=np.intp)
+    
+    # In video mode, a hand classified below this score makes the next
+    # frame run the palm detector again instead of tracking
+    REDETECT_CONFIDENCE = 0.5
+    
     def __init__(
         self,
         enable_face: bool = True,
         enable_hands: bool = True,
         min_detection_confidence: float = 0.5,
-        min_tracking_confidence: float = 0.5
+        min_tracking_confidence: float = 0.5,
+        mode: str = "image"
     ):
         """
         Initialize landmark detector.
@@ -35,37 +92,77 @@ class LandmarkDetector:
             enable_hands: Enable hand landmark detection
             min_detection_confidence: Minimum confidence for detection
             min_tracking_confidence: Minimum confidence for tracking
+            mode: "image" runs the full detectors on every call; "video"
+                tracks landmarks from the previous frame and only re-runs
+                detection when tracking is lost
         """
+        if mode not in ("image", "video"):
+            raise ValueError(f"mode must be 'image' or 'video', got {mode!r}")
+        
         self.enable_face = enable_face
         self.enable_hands = enable_hands
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
+        self.mode = mode
+        static_image_mode = mode == "image"
         
-        # Initialize MediaPipe components
+        # Initialize MediaPipe components. Static graphs are shared between
+        # detectors with the same config; tracking graphs belong to this one.
         if enable_face:
             self.mp_face_mesh = mp.solutions.face_mesh
-            self.face_mesh = self.mp_face_mesh.FaceMesh(
-                static_image_mode=True,
-                max_num_faces=1,
-                min_detection_confidence=min_detection_confidence,
-                min_tracking_confidence=min_tracking_confidence
+            self.face_mesh, self._face_lock = self._load_model(
+                "face_mesh",
+                lambda: self.mp_face_mesh.FaceMesh(
+                    static_image_mode=static_image_mode,
+                    max_num_faces=1,
+                    min_detection_confidence=min_detection_confidence,
+                    min_tracking_confidence=min_tracking_confidence
+                )
             )
         
         if enable_hands:
             self.mp_hands = mp.solutions.hands
-            self.hands = self.mp_hands.Hands(
-                static_image_mode=True,
-                max_num_hands=2,
-                min_detection_confidence=min_detection_confidence,
-                min_tracking_confidence=min_tracking_confidence
+            self.hands, self._hands_lock = self._load_model(
+                "hands",
+                lambda: self.mp_hands.Hands(
+                    static_image_mode=static_image_mode,
+                    max_num_hands=2,
+                    min_detection_confidence=min_detection_confidence,
+                    min_tracking_confidence=min_tracking_confidence
+                )
             )
     
-    def detect_face(self, image: np.ndarray) -> Optional[FaceLandmarks]:
+    def _shared_key(self, kind: str) -> Tuple[Any, ...]:
+        """Key of a graph in the shared model cache."""
+        return (kind, self.min_detection_confidence, self.min_tracking_confidence)
+    
+    def _load_model(self, kind: str, factory: Callable[[], Any]) -> Tuple[Any, threading.Lock]:
+        """
+        Load a MediaPipe graph, sharing it in image mode.
+        
+        Args:
+            kind: Graph kind ("face_mesh" or "hands")
+            factory: Zero-argument callable building the graph
+            
+        Returns:
+            Tuple of (graph, lock to hold while running it)
+        """
+        if self.mode == "video":
+            return factory(), threading.Lock()
+        shared = SHARED_MODELS.acquire(self._shared_key(kind), factory)
+        return shared.model, shared.lock
+    
+    def detect_face(
+        self,
+        image: np.ndarray,
+        rgb: Optional[np.ndarray] = None
+    ) -> Optional[FaceLandmarks]:
         """
         Detect facial landmarks.
         
         Args:
             image: Input image (BGR format)
+            rgb: RGB conversion of image, when the caller already has one
             
         Returns:
             FaceLandmarks if face detected, None otherwise
@@ -74,10 +171,11 @@ class LandmarkDetector:
             return None
         
         # Convert to RGB
-        rgb_image = ImageProcessor.to_rgb(image)
+        rgb_image = rgb if rgb is not None else ImageProcessor.to_rgb(image, reuse_buffer=True)
         
         # Process image
-        results = self.face_mesh.process(rgb_image)
+        with self._face_lock:
+            results = self.face_mesh.process(rgb_image)
         
         if not results.multi_face_landmarks:
             return None
@@ -85,30 +183,25 @@ class LandmarkDetector:
         # Get first face
         face_landmarks_raw = results.multi_face_landmarks[0]
         
-        # Convert to our Landmark format
-        landmarks = []
-        for landmark in face_landmarks_raw.landmark:
-            lm = Landmark(
-                x=landmark.x,
-                y=landmark.y,
-                z=landmark.z,
-                visibility=1.0  # Face mesh doesn't provide visibility
-            )
-            landmarks.append(lm)
-        
+        # Face mesh doesn't provide visibility or an overall confidence
         face_landmarks = FaceLandmarks(
-            landmarks=landmarks,
-            confidence=1.0  # Face mesh doesn't provide overall confidence
+            xyzv=landmark_list_to_array(face_landmarks_raw, with_visibility=False),
+            confidence=1.0
         )
         
         return face_landmarks
     
-    def detect_hands(self, image: np.ndarray) -> List[HandLandmarks]:
+    def detect_hands(
+        self,
+        image: np.ndarray,
+        rgb: Optional[np.ndarray] = None
+    ) -> List[HandLandmarks]:
         """
         Detect hand landmarks.
         
         Args:
             image: Input image (BGR format)
+            rgb: RGB conversion of image, when the caller already has one
             
         Returns:
             List of HandLandmarks (one per detected hand)
@@ -117,10 +210,11 @@ class LandmarkDetector:
             return []
         
         # Convert to RGB
-        rgb_image = ImageProcessor.to_rgb(image)
+        rgb_image = rgb if rgb is not None else ImageProcessor.to_rgb(image, reuse_buffer=True)
         
         # Process image
-        results = self.hands.process(rgb_image)
+        with self._hands_lock:
+            results = self.hands.process(rgb_image)
         
         if not results.multi_hand_landmarks:
             return []
@@ -135,36 +229,83 @@ class LandmarkDetector:
                 handedness_info = results.multi_handedness[idx]
                 handedness = handedness_info.classification[0].label
             
-            # Convert landmarks
-            landmarks = []
-            for landmark in hand_landmarks_raw.landmark:
-                lm = Landmark(
-                    x=landmark.x,
-                    y=landmark.y,
-                    z=landmark.z,
-                    visibility=1.0  # Hand landmarks don't provide visibility
-                )
-                landmarks.append(lm)
-            
             # Get confidence
             confidence = 1.0
             if results.multi_handedness and idx < len(results.multi_handedness):
                 confidence = results.multi_handedness[idx].classification[0].score
             
+            # Hand landmarks don't provide visibility
             hand_landmarks = HandLandmarks(
-                landmarks=landmarks,
+                xyzv=landmark_list_to_array(hand_landmarks_raw, with_visibility=False),
                 handedness=handedness,
                 confidence=confidence
             )
             hand_landmarks_list.append(hand_landmarks)
         
+        # Drop the tracked ROIs once a hand looks doubtful
+        if self.mode == "video" and any(
+            hand.confidence < self.REDETECT_CONFIDENCE for hand in hand_landmarks_list
+        ):
+            with self._hands_lock:
+                self.hands.reset()
+        
         return hand_landmarks_list
     
+    def detect_streaming(
+        self,
+        frames: Iterable[np.ndarray]
+    ) -> Iterator[Tuple[Optional[FaceLandmarks], List[HandLandmarks]]]:
+        """
+        Detect face and hand landmarks on consecutive video frames.
+        
+        Landmarks are tracked from frame to frame so the face and palm
+        detectors only run when tracking is lost. A video-mode detector
+        uses its own graphs, reset at the start of the stream; an
+        image-mode detector loads temporary video-mode graphs for the
+        duration of the stream.
+        
+        Args:
+            frames: Video frames in order (BGR format)
+            
+        Yields:
+            Tuple of (face landmarks or None, list of hand landmarks) per frame
+        """
+        if self.mode == "video":
+            detector = self
+            self.reset()
+        else:
+            detector = LandmarkDetector(
+                enable_face=self.enable_face,
+                enable_hands=self.enable_hands,
+                min_detection_confidence=self.min_detection_confidence,
+                min_tracking_confidence=self.min_tracking_confidence,
+                mode="video"
+            )
+        
+        try:
+            for frame in frames:
+                yield detector.detect_face(frame), detector.detect_hands(frame)
+        finally:
+            if detector is not self:
+                detector.close()
+    
+    def reset(self):
+        """Forget tracked landmarks so the next frame runs full detection."""
+        if self.mode != "video":
+            return  # Static graphs keep no tracking state
+        if hasattr(self, 'face_mesh'):
+            with self._face_lock:
+                self.face_mesh.reset()
+        if hasattr(self, 'hands'):
+            with self._hands_lock:
+                self.hands.reset()
+    
     def visualize_face(
         self,
         image: np.ndarray,
         face_landmarks: FaceLandmarks,
-        color: tuple = (0, 255, 0)
+        color: tuple = (0, 255, 0),
+        out: Optional[np.ndarray] = None
     ) -> np.ndarray:
         """
         Draw face landmarks on image.
@@ -173,24 +314,24 @@ class LandmarkDetector:
             image: Input image
             face_landmarks: Detected face landmarks
             color: Point color (BGR)
+            out: Canvas to draw on (see ImageProcessor.copy_to); pass
+                image itself to draw in place, mutating the input
             
         Returns:
             Image with face landmarks drawn
         """
-        output = image.copy()
+        output = ImageProcessor.copy_to(image, out)
         h, w = image.shape[:2]
         
+        points = face_landmarks.to_pixel_coords(w, h, out=_points_buffer(len(face_landmarks)))
+        
         # Draw landmarks
-        for landmark in face_landmarks.landmarks:
-            pt = landmark.to_pixel_coords(w, h)
-            cv2.circle(output, pt, 1, color, -1)
+        _stamp_dots(output, points, color)
         
         # Draw contour
-        contour = face_landmarks.get_contour()
+        contour = points[FACE_CONTOUR_INDICES[FACE_CONTOUR_INDICES < len(points)]]
         if len(contour) > 1:
-            points = [lm.to_pixel_coords(w, h) for lm in contour]
-            for i in range(len(points) - 1):
-                cv2.line(output, points[i], points[i + 1], color, 1)
+            cv2.polylines(output, [contour], True, color, 1)
         
         return output
     
@@ -198,7 +339,8 @@ class LandmarkDetector:
         self,
         image: np.ndarray,
         hand_landmarks_list: List[HandLandmarks],
-        color: tuple = (0, 255, 0)
+        color: tuple = (0, 255, 0),
+        out: Optional[np.ndarray] = None
     ) -> np.ndarray:
         """
         Draw hand landmarks on image.
@@ -207,34 +349,26 @@ class LandmarkDetector:
             image: Input image
             hand_landmarks_list: List of detected hand landmarks
             color: Point color (BGR)
+            out: Canvas to draw on (see ImageProcessor.copy_to); pass
+                image itself to draw in place, mutating the input
             
         Returns:
             Image with hand landmarks drawn
         """
-        output = image.copy()
+        output = ImageProcessor.copy_to(image, out)
         h, w = image.shape[:2]
         
-        # MediaPipe hand connections
-        hand_connections = [
-            (0, 1), (1, 2), (2, 3), (3, 4),  # Thumb
-            (0, 5), (5, 6), (6, 7), (7, 8),  # Index
-            (0, 9), (9, 10), (10, 11), (11, 12),  # Middle
-            (0, 13), (13, 14), (14, 15), (15, 16),  # Ring
-            (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky
-            (5, 9), (9, 13), (13, 17)  # Palm
-        ]
-        
         for hand_landmarks in hand_landmarks_list:
+            points = hand_landmarks.to_pixel_coords(w, h, out=_points_buffer(len(hand_landmarks)))
+            
             # Draw connections
-            for start_idx, end_idx in hand_connections:
-                if start_idx < len(hand_landmarks.landmarks) and end_idx < len(hand_landmarks.landmarks):
-                    start_pt = hand_landmarks.landmarks[start_idx].to_pixel_coords(w, h)
-                    end_pt = hand_landmarks.landmarks[end_idx].to_pixel_coords(w, h)
-                    cv2.line(output, start_pt, end_pt, color, 2)
+            valid = (self.HAND_CONNECTIONS < len(points)).all(axis=1)
+            segments = points[self.HAND_CONNECTIONS[valid]]
+            if len(segments):
+                cv2.polylines(output, list(segments), False, color, 2)
             
             # Draw landmarks
-            for landmark in hand_landmarks.landmarks:
-                pt = landmark.to_pixel_coords(w, h)
+            for pt in points.tolist():
                 cv2.circle(output, pt, 3, color, -1)
                 cv2.circle(output, pt, 3, (255, 255, 255), 1)
         
@@ -242,7 +376,11 @@ class LandmarkDetector:
     
     def close(self):
         """Release resources."""
-        if hasattr(self, 'face_mesh'):
-            self.face_mesh.close()
-        if hasattr(self, 'hands'):
-            self.hands.close()
+        for kind in ("face_mesh", "hands"):
+            model = self.__dict__.pop(kind, None)
+            if model is None:
+                continue
+            if self.mode == "video":
+                model.close()
+            else:
+                SHARED_MODELS.release(self._shared_key(kind))
@@ -0,0 +1,79 @@
+"""
+Shared MediaPipe model cache.
+
+Building a MediaPipe graph loads its model and takes hundreds of
+milliseconds, so detectors created with the same configuration share one
+graph instead of each loading their own.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable
+import threading
+
+
+@dataclass
+class SharedModel:
+    """
+    A model shared between detectors.
+
+    MediaPipe graphs are not reentrant, so users must hold the lock while
+    running the model.
+    """
+    model: Any
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    ref_count: int = 0
+
+
+class ModelCache:
+    """
+    Reference-counted cache of models keyed by configuration.
+
+    A model is loaded on the first acquire of its key and closed when the
+    last holder releases it.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries: Dict[Hashable, SharedModel] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any]) -> SharedModel:
+        """
+        Get the shared model for a configuration, loading it on first use.
+
+        Args:
+            key: Configuration key
+            factory: Zero-argument callable loading the model
+
+        Returns:
+            SharedModel whose reference is now held by the caller
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = SharedModel(factory())
+            entry.ref_count += 1
+            return entry
+
+    def release(self, key: Hashable) -> None:
+        """
+        Drop a reference to a shared model, closing it when unused.
+
+        Args:
+            key: Configuration key passed to acquire
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.ref_count -= 1
+            if entry.ref_count <= 0:
+                del self._entries[key]
+                entry.model.close()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+# Cache used by all detectors; keys start with the model kind
+SHARED_MODELS = ModelCache()
@@ -4,14 +4,88 @@ Pose detection using MediaPipe.
 Handles pose estimation and landmark detection for body poses.
 """
 
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+import itertools
+import queue
+import threading
 import numpy as np
 import cv2
 import mediapipe as mp
 
-from vision.models.pose_data import PoseData, PoseKeypoint
-from vision.models.landmarks import PoseLandmarks, Landmark
+from vision.models.pose_data import (
+    PoseData,
+    PoseKeypoint,
+    SKELETON_EDGES,
+    SKELETON_KEYPOINTS,
+)
+from vision.models.landmarks import (
+    PoseLandmarks,
+    landmark_list_to_array,
+    landmarks_to_array,
+)
 from vision.core.image_processor import ImageProcessor
+from vision.core.model_cache import SHARED_MODELS, SharedModel
+
+
+# End-of-stream marker passed from the prefetch thread
+_END_OF_STREAM = object()
+
+
+def _prefetch_rgb(
+    frames: Iterable[np.ndarray],
+    depth: int
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Read and convert frames on a background thread.
+    
+    The next frames are captured and converted to RGB while the caller
+    processes the current one. Each frame gets its own RGB array, so the
+    thread never writes a buffer the caller is still reading.
+    
+    Args:
+        frames: Frames in order (BGR format)
+        depth: Maximum number of converted frames waiting to be consumed
+        
+    Yields:
+        (frame, rgb) pairs in input order. Errors raised while reading
+        frames are re-raised here.
+    """
+    pending: queue.Queue = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+    
+    def put(item: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def produce() -> None:
+        try:
+            for frame in frames:
+                if not put((frame, ImageProcessor.to_rgb(frame))):
+                    return
+        except BaseException as error:
+            put(error)
+        else:
+            put(_END_OF_STREAM)
+    
+    # Daemon, as a camera read may block long after the consumer stops
+    threading.Thread(target=produce, name="frame-prefetch", daemon=True).start()
+    try:
+        while True:
+            item = pending.get()
+            if item is _END_OF_STREAM:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stopped.set()
 
 
 class PoseDetector:
@@ -35,11 +109,21 @@ class PoseDetector:
         "left_foot_index", "right_foot_index"
     ]
     
+    # Timestamp step between frames fed to a video-mode Tasks landmarker
+    VIDEO_FRAME_INTERVAL_MS = 33
+    
+    # Default worker threads for detect_batch; each extra worker needs its
+    # own graph, so this stays small
+    BATCH_WORKERS = 2
+    
     def __init__(
         self,
         min_detection_confidence: float = 0.5,
         min_tracking_confidence: float = 0.5,
-        model_complexity: int = 1
+        model_complexity: int = 1,
+        mode: str = "image",
+        model_asset_path: Optional[str] = None,
+        use_gpu: bool = False
     ):
         """
         Initialize pose detector.
@@ -47,124 +131,364 @@ class PoseDetector:
         Args:
             min_detection_confidence: Minimum confidence for detection
             min_tracking_confidence: Minimum confidence for tracking
-            model_complexity: Model complexity (0, 1, or 2)
+            model_complexity: Model complexity (0, 1, or 2); ignored when
+                model_asset_path is given
+            mode: "image" runs the full detector on every call; "video"
+                tracks the pose from the previous frame and only re-runs
+                detection when tracking is lost
+            model_asset_path: Path to a MediaPipe Tasks pose landmarker
+                (.task) bundle. If given, the Tasks PoseLandmarker is used
+                instead of the legacy mp.solutions Pose graph.
+            use_gpu: Run the Tasks landmarker on the GPU delegate (requires
+                model_asset_path)
         """
+        if mode not in ("image", "video"):
+            raise ValueError(f"mode must be 'image' or 'video', got {mode!r}")
+        if use_gpu and model_asset_path is None:
+            raise ValueError("use_gpu requires model_asset_path (MediaPipe Tasks)")
+        
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
         self.model_complexity = model_complexity
+        self.mode = mode
+        self.model_asset_path = model_asset_path
+        self.use_gpu = use_gpu
+        self._timestamps = itertools.count(0, self.VIDEO_FRAME_INTERVAL_MS)
+        # Extra detect_batch graphs, held in SHARED_MODELS until close()
+        self._batch_models: List[SharedModel] = []
         
-        # Initialize MediaPipe Pose
+        # Initialize MediaPipe Pose. Static graphs are shared between detectors
+        # with the same config; tracking graphs and Tasks landmarkers belong
+        # to this detector.
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=True,
+        self._model_key = (
+            model_complexity, min_detection_confidence, min_tracking_confidence
+        )
+        self._owns_model = mode == "video" or model_asset_path is not None
+        if self._owns_model:
+            self.pose = self._new_model(video=mode == "video")
+            self._pose_lock = threading.Lock()
+        else:
+            # Static image mode keeps no tracking state between calls, so one
+            # graph can serve every detector created with the same configuration
+            shared = SHARED_MODELS.acquire(
+                self._shared_key, lambda: self._create_model(self._model_key)
+            )
+            self.pose, self._pose_lock = shared.model, shared.lock
+    
+    @property
+    def _shared_key(self) -> Tuple[Any, ...]:
+        """Key of this detector's graph in the shared model cache."""
+        return ("pose",) + self._model_key
+    
+    def _batch_key(self, worker: int) -> Tuple[Any, ...]:
+        """Key of the graph used by an extra detect_batch worker."""
+        if self.model_asset_path is None:
+            return ("pose_batch", worker) + self._model_key
+        return (
+            "pose_tasks_batch", worker, self.model_asset_path, self.use_gpu,
+            self.min_detection_confidence, self.min_tracking_confidence,
+        )
+    
+    @staticmethod
+    def _create_model(
+        key: Tuple[int, float, float],
+        static_image_mode: bool = True
+    ) -> Any:
+        """Load a new MediaPipe Pose graph for a configuration."""
+        model_complexity, min_detection, min_tracking = key
+        return mp.solutions.pose.Pose(
+            static_image_mode=static_image_mode,
             model_complexity=model_complexity,
-            min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence
+            min_detection_confidence=min_detection,
+            min_tracking_confidence=min_tracking
+        )
+    
+    def _new_model(self, video: bool) -> Any:
+        """
+        Load a pose model owned by the caller.
+        
+        Args:
+            video: Track poses across consecutive frames
+            
+        Returns:
+            Tasks PoseLandmarker if model_asset_path is set, otherwise a
+            MediaPipe Pose solution
+        """
+        if self.model_asset_path is None:
+            return self._create_model(self._model_key, static_image_mode=not video)
+        
+        from mediapipe.tasks.python import BaseOptions
+        from mediapipe.tasks.python import vision as mp_vision
+        
+        delegate = BaseOptions.Delegate.GPU if self.use_gpu else BaseOptions.Delegate.CPU
+        options = mp_vision.PoseLandmarkerOptions(
+            base_options=BaseOptions(
+                model_asset_path=self.model_asset_path, delegate=delegate
+            ),
+            running_mode=(
+                mp_vision.RunningMode.VIDEO if video else mp_vision.RunningMode.IMAGE
+            ),
+            min_pose_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
         )
+        return mp_vision.PoseLandmarker.create_from_options(options)
     
-    def detect(self, image: np.ndarray) -> Optional[PoseData]:
+    def detect(
+        self,
+        image: np.ndarray,
+        rgb: Optional[np.ndarray] = None
+    ) -> Optional[PoseData]:
         """
         Detect pose in image.
         
         Args:
             image: Input image (BGR format)
+            rgb: RGB conversion of image, when the caller already has one
             
         Returns:
             PoseData if pose detected, None otherwise
         """
+        return self._detect_with(self.pose, image, self._frame_timestamp(), rgb)
+    
+    def detect_batch(
+        self,
+        images: Sequence[np.ndarray],
+        max_workers: Optional[int] = None
+    ) -> List[Optional[PoseData]]:
+        """
+        Detect poses in many images, overlapping work across threads.
+        
+        MediaPipe releases the GIL while a graph runs, so frames processed
+        on separate threads overlap conversion and inference. A graph must
+        not run two frames at once, so each extra worker uses its own
+        graph. These graphs are loaded on first use, shared through the
+        model cache with detectors of the same configuration, and kept
+        until close().
+        
+        Args:
+            images: Input images (BGR format)
+            max_workers: Number of worker threads (None for BATCH_WORKERS,
+                capped at the number of images)
+            
+        Returns:
+            List with PoseData (or None if no pose detected) per image,
+            in input order
+        """
+        images = list(images)
+        workers = min(max_workers or self.BATCH_WORKERS, len(images))
+        # A tracking graph must see frames in order
+        if workers <= 1 or self.mode == "video":
+            return [self.detect(image) for image in images]
+        
+        # Worker 0 runs this detector's graph; the others run pooled graphs
+        while len(self._batch_models) < workers - 1:
+            key = self._batch_key(len(self._batch_models) + 1)
+            self._batch_models.append(
+                SHARED_MODELS.acquire(key, lambda: self._new_model(video=False))
+            )
+        results: List[Optional[PoseData]] = [None] * len(images)
+        
+        # Worker i handles images i, i + workers, i + 2 * workers, ...
+        def run(worker: int) -> None:
+            if worker == 0:
+                model, lock = self.pose, nullcontext()
+            else:
+                shared = self._batch_models[worker - 1]
+                model, lock = shared.model, shared.lock
+            with lock:
+                for i in range(worker, len(images), workers):
+                    results[i] = self._detect_with(model, images[i])
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(run, i) for i in range(workers)]:
+                future.result()
+        
+        return results
+    
+    def detect_streaming(
+        self,
+        frames: Iterable[np.ndarray],
+        prefetch: int = 0
+    ) -> Iterator[Optional[PoseData]]:
+        """
+        Detect poses on consecutive video frames.
+        
+        The pose is tracked from frame to frame so the person detector only
+        runs when tracking is lost. A video-mode detector uses its own graph,
+        reset at the start of the stream; an image-mode detector loads a
+        temporary tracking graph for the duration of the stream.
+        
+        With prefetch, frames are read and converted to RGB on a background
+        thread while the model runs, hiding capture latency behind inference
+        for live sources.
+        
+        Args:
+            frames: Video frames in order (BGR format)
+            prefetch: Number of frames to read ahead on a background thread
+                (0 reads each frame only when it is needed)
+            
+        Yields:
+            PoseData (or None if no pose detected) per frame
+        """
+        if self.mode == "video":
+            model = self.pose
+            # Tasks landmarkers have no reset; their tracking ends on its own
+            if self.model_asset_path is None:
+                model.reset()
+        else:
+            model = self._new_model(video=True)
+        
+        if prefetch > 0:
+            pairs = _prefetch_rgb(frames, prefetch)
+        else:
+            pairs = ((frame, None) for frame in frames)
+        
+        try:
+            for frame, rgb in pairs:
+                yield self._detect_with(model, frame, next(self._timestamps), rgb)
+        finally:
+            pairs.close()
+            if model is not self.pose:
+                model.close()
+    
+    def _frame_timestamp(self) -> Optional[int]:
+        """Next frame timestamp for a video-mode detector, None in image mode."""
+        return next(self._timestamps) if self.mode == "video" else None
+    
+    def _run_model(
+        self,
+        model: Any,
+        image: np.ndarray,
+        timestamp_ms: Optional[int] = None,
+        rgb: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Run a pose model on one image.
+        
+        Args:
+            model: MediaPipe Pose solution or Tasks PoseLandmarker
+            image: Input image (BGR format)
+            timestamp_ms: Frame timestamp, required by Tasks landmarkers in
+                video mode and ignored otherwise
+            rgb: RGB conversion of image, when the caller already has one
+            
+        Returns:
+            (N, 4) landmark array of the first detected pose, None if no
+            pose detected
+        """
         # Convert to RGB for MediaPipe
-        rgb_image = ImageProcessor.to_rgb(image)
+        rgb_image = rgb if rgb is not None else ImageProcessor.to_rgb(image, reuse_buffer=True)
         
-        # Process image
-        results = self.pose.process(rgb_image)
+        # The detector's own graph may be shared with other detectors
+        lock = self._pose_lock if model is self.pose else nullcontext()
         
-        if not results.pose_landmarks:
+        if self.model_asset_path is None:
+            with lock:
+                results = model.process(rgb_image)
+            if not results.pose_landmarks:
+                return None
+            return landmark_list_to_array(results.pose_landmarks)
+        
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_image)
+        with lock:
+            if timestamp_ms is None:
+                result = model.detect(mp_image)
+            else:
+                result = model.detect_for_video(mp_image, timestamp_ms)
+        if not result.pose_landmarks:
+            return None
+        return landmarks_to_array(result.pose_landmarks[0])
+    
+    def _detect_with(
+        self,
+        model: Any,
+        image: np.ndarray,
+        timestamp_ms: Optional[int] = None,
+        rgb: Optional[np.ndarray] = None
+    ) -> Optional[PoseData]:
+        """Run a pose model on one image and build PoseData."""
+        xyzv = self._run_model(model, image, timestamp_ms, rgb)
+        if xyzv is None:
             return None
         
-        # Extract landmarks
         h, w = image.shape[:2]
-        keypoints = []
-        
-        for idx, landmark in enumerate(results.pose_landmarks.landmark):
-            if idx < len(self.LANDMARK_NAMES):
-                keypoint = PoseKeypoint(
-                    name=self.LANDMARK_NAMES[idx],
-                    x=landmark.x,
-                    y=landmark.y,
-                    z=landmark.z,
-                    confidence=landmark.visibility
-                )
-                keypoints.append(keypoint)
-        
-        # Create PoseData
-        pose_data = PoseData(
-            keypoints=keypoints,
-            confidence=self._calculate_overall_confidence(keypoints),
-            image_width=w,
-            image_height=h
+        return PoseData.from_array(
+            self.LANDMARK_NAMES, xyzv, image_width=w, image_height=h
         )
-        
-        return pose_data
     
-    def detect_landmarks(self, image: np.ndarray) -> Optional[PoseLandmarks]:
+    def detect_landmarks(
+        self,
+        image: np.ndarray,
+        rgb: Optional[np.ndarray] = None
+    ) -> Optional[PoseLandmarks]:
         """
         Detect pose landmarks in image.
         
         Args:
             image: Input image (BGR format)
+            rgb: RGB conversion of image, when the caller already has one
             
         Returns:
             PoseLandmarks if pose detected, None otherwise
         """
-        # Convert to RGB for MediaPipe
-        rgb_image = ImageProcessor.to_rgb(image)
-        
-        # Process image
-        results = self.pose.process(rgb_image)
-        
-        if not results.pose_landmarks:
+        xyzv = self._run_model(self.pose, image, self._frame_timestamp(), rgb)
+        if xyzv is None:
             return None
         
-        # Extract landmarks
-        landmarks = []
-        for landmark in results.pose_landmarks.landmark:
-            lm = Landmark(
-                x=landmark.x,
-                y=landmark.y,
-                z=landmark.z,
-                visibility=landmark.visibility
-            )
-            landmarks.append(lm)
-        
         pose_landmarks = PoseLandmarks(
-            landmarks=landmarks,
-            confidence=self._calculate_overall_confidence_from_landmarks(landmarks)
+            xyzv=xyzv,
+            confidence=self._calculate_overall_confidence_from_landmarks(xyzv)
         )
         
         return pose_landmarks
     
-    def _calculate_overall_confidence(self, keypoints: list) -> float:
-        """Calculate overall confidence from keypoints."""
-        if not keypoints:
-            return 0.0
+    def detect_with_landmarks(
+        self,
+        image: np.ndarray,
+        rgb: Optional[np.ndarray] = None
+    ) -> Tuple[Optional[PoseData], Optional[PoseLandmarks]]:
+        """
+        Detect pose in image as both PoseData and PoseLandmarks.
+        
+        Equivalent to calling detect and detect_landmarks, but runs the
+        model once.
         
-        confidences = [kp.confidence for kp in keypoints]
-        return sum(confidences) / len(confidences)
+        Args:
+            image: Input image (BGR format)
+            rgb: RGB conversion of image, when the caller already has one
+            
+        Returns:
+            Tuple of (PoseData, PoseLandmarks), both None if no pose detected
+        """
+        xyzv = self._run_model(self.pose, image, self._frame_timestamp(), rgb)
+        if xyzv is None:
+            return None, None
+        
+        h, w = image.shape[:2]
+        pose_data = PoseData.from_array(
+            self.LANDMARK_NAMES, xyzv, image_width=w, image_height=h
+        )
+        pose_landmarks = PoseLandmarks(
+            xyzv=xyzv,
+            confidence=self._calculate_overall_confidence_from_landmarks(xyzv)
+        )
+        return pose_data, pose_landmarks
     
-    def _calculate_overall_confidence_from_landmarks(self, landmarks: list) -> float:
-        """Calculate overall confidence from landmarks."""
-        if not landmarks:
+    def _calculate_overall_confidence_from_landmarks(self, xyzv: np.ndarray) -> float:
+        """Calculate overall confidence from an (N, 4) landmark array."""
+        if len(xyzv) == 0:
             return 0.0
         
-        visibilities = [lm.visibility for lm in landmarks]
-        return sum(visibilities) / len(visibilities)
+        return float(xyzv[:, 3].mean(dtype=np.float64))
     
     def visualize_pose(
         self,
         image: np.ndarray,
         pose_data: PoseData,
         color: tuple = (0, 255, 0),
-        thickness: int = 2
+        thickness: int = 2,
+        out: Optional[np.ndarray] = None
     ) -> np.ndarray:
         """
         Draw pose skeleton on image.
@@ -174,33 +498,41 @@ class PoseDetector:
             pose_data: Detected pose data
             color: Line color (BGR)
             thickness: Line thickness
+            out: Canvas to draw on (see ImageProcessor.copy_to); pass
+                image itself to draw in place, mutating the input
             
         Returns:
             Image with pose drawn
         """
-        output = image.copy()
+        output = ImageProcessor.copy_to(image, out)
         h, w = image.shape[:2]
         
+        scale = np.array([w, h], dtype=np.float64)
+        
         # Draw skeleton connections
-        for start_name, end_name in pose_data.get_skeleton_lines():
-            start_kp = pose_data.get_keypoint(start_name)
-            end_kp = pose_data.get_keypoint(end_name)
-            
-            if start_kp and end_kp:
-                start_pt = (int(start_kp.x * w), int(start_kp.y * h))
-                end_pt = (int(end_kp.x * w), int(end_kp.y * h))
-                cv2.line(output, start_pt, end_pt, color, thickness)
+        coords, found = pose_data.as_array(SKELETON_KEYPOINTS)
+        points = (np.nan_to_num(coords[:, :2]) * scale).astype(np.int32)
+        edges = SKELETON_EDGES[found[SKELETON_EDGES].all(axis=1)]
+        if len(edges):
+            cv2.polylines(output, list(points[edges]), False, color, thickness)
         
         # Draw keypoints
-        for kp in pose_data.keypoints:
-            if kp.confidence > 0.5:
-                pt = (int(kp.x * w), int(kp.y * h))
-                cv2.circle(output, pt, 4, color, -1)
-                cv2.circle(output, pt, 4, (255, 255, 255), 1)
+        coords, _ = pose_data.as_array()
+        confident = np.array([kp.confidence > 0.5 for kp in pose_data.keypoints], dtype=bool)
+        for pt in (coords[confident, :2] * scale).astype(np.int32).tolist():
+            cv2.circle(output, pt, 4, color, -1)
+            cv2.circle(output, pt, 4, (255, 255, 255), 1)
         
         return output
     
     def close(self):
         """Release resources."""
-        if hasattr(self, 'pose'):
-            self.pose.close()
+        if getattr(self, 'pose', None) is not None:
+            if self._owns_model:
+                self.pose.close()
+            else:
+                SHARED_MODELS.release(self._shared_key)
+            self.pose = None
+        for worker in range(1, len(self._batch_models) + 1):
+            SHARED_MODELS.release(self._batch_key(worker))
+        self._batch_models = []
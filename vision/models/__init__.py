@@ -5,7 +5,16 @@ This module contains data classes for representing vision analysis results,
 landmarks, poses, and comparison metrics.
 """
 
-from vision.models.landmarks import Landmark, FaceLandmarks, HandLandmarks, PoseLandmarks
+from vision.models.landmarks import (
+    Landmark,
+    FaceLandmarks,
+    HandLandmarks,
+    PoseLandmarks,
+    landmarks_to_array,
+    landmark_list_to_array,
+    to_pixel_coords_batch,
+    landmarks_pairwise_distance,
+)
 from vision.models.pose_data import PoseData, PoseKeypoint
 from vision.models.analysis_result import AnalysisResult, ComparisonResult
 from vision.models.comparison_metrics import (
@@ -20,6 +29,10 @@ __all__ = [
     "FaceLandmarks",
     "HandLandmarks",
     "PoseLandmarks",
+    "landmarks_to_array",
+    "landmark_list_to_array",
+    "to_pixel_coords_batch",
+    "landmarks_pairwise_distance",
     "PoseData",
     "PoseKeypoint",
     "AnalysisResult",
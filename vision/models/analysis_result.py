@@ -5,7 +5,7 @@ Contains the main result objects returned by vision analysis operations.
 """
 
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import numpy as np
 
 from vision.models.landmarks import FaceLandmarks, HandLandmarks, PoseLandmarks
@@ -18,12 +18,14 @@ from vision.models.comparison_metrics import (
 )
 
 
-@dataclass
+@dataclass(init=False, slots=True)
 class AnalysisResult:
     """
     Result of analyzing a single image.
     
     Contains all detected features, landmarks, and metadata from the analysis.
+    The silhouette is stored bit-packed (one bit per pixel) and exposed
+    through the silhouette property.
     """
     # Image info
     image_width: int = 0
@@ -36,7 +38,8 @@ class AnalysisResult:
     pose_landmarks: Optional[PoseLandmarks] = None
     
     # Image analysis
-    silhouette: Optional[np.ndarray] = None  # Binary mask
+    silhouette_packed: Optional[np.ndarray] = None  # Bit-packed binary mask
+    silhouette_shape: Optional[Tuple[int, ...]] = None  # Unpacked mask shape
     edges: Optional[np.ndarray] = None  # Edge detection result
     
     # Metrics
@@ -48,6 +51,94 @@ class AnalysisResult:
     processing_time_ms: float = 0.0
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    # Foreground value (with the dtype) of the mask that was packed
+    _silhouette_value: Any = field(default=None, repr=False)
+    
+    def __init__(
+        self,
+        image_width: int = 0,
+        image_height: int = 0,
+        pose: Optional[PoseData] = None,
+        face_landmarks: Optional[FaceLandmarks] = None,
+        hand_landmarks: Optional[List[HandLandmarks]] = None,
+        pose_landmarks: Optional[PoseLandmarks] = None,
+        silhouette: Optional[np.ndarray] = None,
+        edges: Optional[np.ndarray] = None,
+        proportion_metrics: Optional[ProportionMetrics] = None,
+        symmetry_metrics: Optional[SymmetryMetrics] = None,
+        detection_confidence: float = 0.0,
+        processing_time_ms: float = 0.0,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize an analysis result.
+        
+        Args:
+            image_width: Image width in pixels
+            image_height: Image height in pixels
+            pose: Detected pose
+            face_landmarks: Detected face landmarks
+            hand_landmarks: Detected hands
+            pose_landmarks: Detected pose landmarks
+            silhouette: Binary silhouette mask, stored bit-packed
+            edges: Edge detection result
+            proportion_metrics: Body proportion analysis
+            symmetry_metrics: Symmetry analysis
+            detection_confidence: Overall detection confidence
+            processing_time_ms: Analysis time in milliseconds
+            metadata: Additional metadata
+        """
+        self.image_width = image_width
+        self.image_height = image_height
+        self.pose = pose
+        self.face_landmarks = face_landmarks
+        self.hand_landmarks = [] if hand_landmarks is None else hand_landmarks
+        self.pose_landmarks = pose_landmarks
+        self.silhouette = silhouette
+        self.edges = edges
+        self.proportion_metrics = proportion_metrics
+        self.symmetry_metrics = symmetry_metrics
+        self.detection_confidence = detection_confidence
+        self.processing_time_ms = processing_time_ms
+        self.metadata = {} if metadata is None else metadata
+    
+    @property
+    def silhouette(self) -> Optional[np.ndarray]:
+        """
+        Binary silhouette mask, with the dtype and foreground value it was
+        given (e.g. 0/255 uint8, 0/1 uint8 or bool).
+        
+        The mask is unpacked into a new array on every access, so edits to
+        the returned array are not kept; assign the edited mask back.
+        """
+        if self.silhouette_packed is None:
+            return None
+        count = int(np.prod(self.silhouette_shape))
+        bits = np.unpackbits(self.silhouette_packed, count=count)
+        value = self._silhouette_value
+        if value.dtype == np.bool_:
+            mask = bits.view(np.bool_)
+        elif value.dtype == np.uint8:
+            mask = np.multiply(bits, value, out=bits)
+        else:
+            mask = bits.astype(value.dtype)
+            mask *= value
+        return mask.reshape(self.silhouette_shape)
+    
+    @silhouette.setter
+    def silhouette(self, mask: Optional[np.ndarray]) -> None:
+        if mask is None:
+            self.silhouette_packed = None
+            self.silhouette_shape = None
+            self._silhouette_value = None
+            return
+        mask = np.asarray(mask)
+        foreground = mask.ravel() != 0
+        self.silhouette_packed = np.packbits(foreground)
+        self.silhouette_shape = mask.shape
+        # Pixels are assumed binary: all foreground pixels share one value
+        self._silhouette_value = mask.max() if foreground.any() else mask.dtype.type(1)
+    
     def has_pose(self) -> bool:
         """Check if pose was detected."""
         return self.pose is not None or self.pose_landmarks is not None
@@ -85,29 +176,30 @@ class AnalysisResult:
             "metadata": self.metadata,
         }
         
-        if self.pose:
-            result["pose"] = self.pose.to_dict()
-        if self.face_landmarks:
-            result["face_landmarks"] = self.face_landmarks.to_dict()
+        result.update({
+            key: value.to_dict()
+            for key, value in (
+                ("pose", self.pose),
+                ("face_landmarks", self.face_landmarks),
+                ("pose_landmarks", self.pose_landmarks),
+                ("proportion_metrics", self.proportion_metrics),
+                ("symmetry_metrics", self.symmetry_metrics),
+            )
+            if value is not None
+        })
         if self.hand_landmarks:
             result["hand_landmarks"] = [h.to_dict() for h in self.hand_landmarks]
-        if self.pose_landmarks:
-            result["pose_landmarks"] = self.pose_landmarks.to_dict()
-        if self.proportion_metrics:
-            result["proportion_metrics"] = self.proportion_metrics.to_dict()
-        if self.symmetry_metrics:
-            result["symmetry_metrics"] = self.symmetry_metrics.to_dict()
         
         # Include array shapes but not data
-        if self.silhouette is not None:
-            result["silhouette_shape"] = self.silhouette.shape
+        if self.silhouette_packed is not None:
+            result["silhouette_shape"] = self.silhouette_shape
         if self.edges is not None:
             result["edges_shape"] = self.edges.shape
         
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class ComparisonResult:
     """
     Result of comparing two images or analysis results.
@@ -175,13 +267,15 @@ class ComparisonResult:
             "metadata": self.metadata,
         }
         
-        if self.pose_metrics:
-            result["pose_metrics"] = self.pose_metrics.to_dict()
-        if self.proportion_metrics:
-            result["proportion_metrics"] = self.proportion_metrics.to_dict()
-        if self.symmetry_metrics:
-            result["symmetry_metrics"] = self.symmetry_metrics.to_dict()
-        if self.alignment_metrics:
-            result["alignment_metrics"] = self.alignment_metrics.to_dict()
+        result.update({
+            key: value.to_dict()
+            for key, value in (
+                ("pose_metrics", self.pose_metrics),
+                ("proportion_metrics", self.proportion_metrics),
+                ("symmetry_metrics", self.symmetry_metrics),
+                ("alignment_metrics", self.alignment_metrics),
+            )
+            if value is not None
+        })
         
         return result
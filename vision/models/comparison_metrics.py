@@ -5,11 +5,32 @@ Contains dataclasses for various comparison metrics between images/poses.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, Any, Optional
+from operator import itemgetter
+from typing import Dict, List, Tuple, Any, Optional, Callable, Union
+import heapq
 import numpy as np
 
 
-@dataclass
+# Bounding boxes as (x, y, w, h)
+Regions = List[Tuple[int, int, int, int]]
+
+
+def _quantize_heatmap(heatmap: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """
+    Store a heatmap as uint8 with 255 representing a score of 1.0.
+    
+    uint8 heatmaps are returned unchanged; boolean masks map to 0 or 255
+    and float scores in 0-1 are rounded to the nearest step.
+    """
+    if heatmap is None or heatmap.dtype == np.uint8:
+        return heatmap
+    if heatmap.dtype == np.bool_:
+        return heatmap.astype(np.uint8) * np.uint8(255)
+    scaled = np.multiply(heatmap, 255, dtype=np.float32)
+    return np.clip(np.rint(scaled, out=scaled), 0, 255, out=scaled).astype(np.uint8)
+
+
+@dataclass(slots=True)
 class PoseMetrics:
     """
     Metrics comparing two poses.
@@ -32,12 +53,10 @@ class PoseMetrics:
         Returns:
             List of (keypoint_name, difference) tuples
         """
-        sorted_diffs = sorted(
-            self.keypoint_differences.items(),
-            key=lambda x: x[1],
-            reverse=True
+        # Same result as sorting in descending order and slicing, in O(N log n)
+        return heapq.nlargest(
+            n, self.keypoint_differences.items(), key=itemgetter(1)
         )
-        return sorted_diffs[:n]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -50,7 +69,7 @@ class PoseMetrics:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ProportionMetrics:
     """
     Metrics for anatomical proportions.
@@ -72,11 +91,11 @@ class ProportionMetrics:
         Returns:
             List of (ratio_name, deviation) tuples
         """
-        major_issues = []
-        for name, deviation in self.deviation_from_standard.items():
-            if abs(deviation) > threshold:
-                major_issues.append((name, deviation))
-        return major_issues
+        return [
+            (name, deviation)
+            for name, deviation in self.deviation_from_standard.items()
+            if abs(deviation) > threshold
+        ]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -88,7 +107,7 @@ class ProportionMetrics:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SymmetryMetrics:
     """
     Metrics for bilateral symmetry analysis.
@@ -110,11 +129,11 @@ class SymmetryMetrics:
         Returns:
             List of (pair_name, difference) tuples
         """
-        asymmetric = []
-        for name, diff in self.left_right_differences.items():
-            if abs(diff) > threshold:
-                asymmetric.append((name, diff))
-        return asymmetric
+        return [
+            (name, diff)
+            for name, diff in self.left_right_differences.items()
+            if abs(diff) > threshold
+        ]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -126,17 +145,65 @@ class SymmetryMetrics:
         }
 
 
-@dataclass
+@dataclass(init=False, slots=True)
 class AlignmentMetrics:
     """
     Metrics for edge and feature alignment.
     
-    Measures how well edges and features align between two images.
+    Measures how well edges and features align between two images. The
+    misaligned regions may be given as a zero-argument callable, which is
+    only run on first access so score-only readers skip it.
     """
     alignment_score: float = 0.0  # 0.0 = no alignment, 1.0 = perfect alignment
     edge_overlap: float = 0.0  # Percentage of overlapping edges
-    heatmap: Optional[np.ndarray] = None  # Alignment heatmap
-    misaligned_regions: List[Tuple[int, int, int, int]] = field(default_factory=list)  # (x, y, w, h)
+    _heatmap: Optional[np.ndarray] = field(
+        default=None, repr=False, compare=False
+    )
+    _misaligned_regions: Union[Regions, Callable[[], Regions]] = field(
+        default_factory=list, repr=False, compare=False
+    )
+    
+    def __init__(
+        self,
+        alignment_score: float = 0.0,
+        edge_overlap: float = 0.0,
+        heatmap: Optional[np.ndarray] = None,
+        misaligned_regions: Union[Regions, Callable[[], Regions], None] = None
+    ):
+        """
+        Initialize alignment metrics.
+        
+        Args:
+            alignment_score: Fraction of pixels where the edge maps agree
+            edge_overlap: Overlapping edges relative to the larger edge count
+            heatmap: Misalignment mask (uint8, 0 or 255). Boolean or 0-1
+                float heatmaps are stored quantized to uint8.
+            misaligned_regions: (x, y, w, h) boxes, or a callable producing them
+        """
+        self.alignment_score = alignment_score
+        self.edge_overlap = edge_overlap
+        self._heatmap = _quantize_heatmap(heatmap)
+        self._misaligned_regions = [] if misaligned_regions is None else misaligned_regions
+    
+    @property
+    def heatmap(self) -> Optional[np.ndarray]:
+        """Misalignment heatmap (uint8, 255 = 1.0)."""
+        return self._heatmap
+    
+    @heatmap.setter
+    def heatmap(self, value: Optional[np.ndarray]) -> None:
+        self._heatmap = _quantize_heatmap(value)
+    
+    @property
+    def misaligned_regions(self) -> Regions:
+        """(x, y, w, h) boxes of misaligned regions, computed on first access."""
+        if callable(self._misaligned_regions):
+            self._misaligned_regions = self._misaligned_regions()
+        return self._misaligned_regions
+    
+    @misaligned_regions.setter
+    def misaligned_regions(self, value: Regions) -> None:
+        self._misaligned_regions = value
     
     def get_worst_regions(self, n: int = 3) -> List[Tuple[int, int, int, int]]:
         """
@@ -4,10 +4,17 @@ Landmark data structures for face, hands, and pose detection.
 Contains dataclasses for representing detected landmarks from MediaPipe.
 """
 
-from dataclasses import dataclass, field
-from typing import List, Tuple, Optional, Dict, Any
+from dataclasses import dataclass, fields
+from typing import List, Tuple, Optional, Dict, Any, Iterable, Sequence
+import math
 import numpy as np
 
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
 
 @dataclass
 class Landmark:
@@ -48,7 +55,25 @@ class Landmark:
         dx = self.x - other.x
         dy = self.y - other.y
         dz = self.z - other.z
-        return float(np.sqrt(dx*dx + dy*dy + dz*dz))
+        return math.sqrt(dx*dx + dy*dy + dz*dz)
+    
+    def distance_to_many(self, points: np.ndarray) -> np.ndarray:
+        """
+        Calculate Euclidean distances to many points at once.
+        
+        Args:
+            points: Array of shape (N, 2) with x, y or (N, 3) with x, y, z
+            
+        Returns:
+            Array of N distances
+        """
+        points = np.asarray(points, dtype=np.float64)
+        dx = points[:, 0] - self.x
+        dy = points[:, 1] - self.y
+        if points.shape[1] > 2:
+            dz = points[:, 2] - self.z
+            return np.sqrt(dx*dx + dy*dy + dz*dz)
+        return np.hypot(dx, dy)
     
     def to_dict(self) -> Dict[str, float]:
         """Convert to dictionary."""
@@ -65,21 +90,297 @@ class Landmark:
         return cls(**data)
 
 
-@dataclass
-class FaceLandmarks:
+# Face mesh face-oval landmark indices in drawing order, forming a closed
+# loop (the cycle described by MediaPipe's FACEMESH_FACE_OVAL edges)
+FACE_CONTOUR_INDICES = np.array([
+    10, 338, 297, 332, 284, 251, 389, 356, 454, 323, 361, 288,
+    397, 365, 379, 378, 400, 377, 152, 148, 176, 149, 150, 136,
+    172, 58, 132, 93, 234, 127, 162, 21, 54, 103, 67, 109,
+], dtype=np.intp)
+
+# Simplified face mesh eye indices
+LEFT_EYE_INDICES = np.array([33, 133, 160, 159, 158, 157, 173], dtype=np.intp)
+RIGHT_EYE_INDICES = np.array([362, 263, 387, 386, 385, 384, 398], dtype=np.intp)
+
+# Hand fingertip indices: thumb, index, middle, ring, pinky
+FINGERTIP_INDICES = np.array([4, 8, 12, 16, 20], dtype=np.intp)
+
+
+def landmarks_to_array(
+    landmarks: Iterable[Any],
+    with_visibility: bool = True,
+    dtype: np.dtype = np.float32
+) -> np.ndarray:
+    """
+    Stack landmark-like objects into a single array in one pass.
+    
+    Works with Landmark objects and MediaPipe landmark protos alike.
+    
+    Args:
+        landmarks: Objects with x, y, z (and visibility) attributes
+        with_visibility: Read each object's visibility; if False the
+            visibility column is set to 1.0
+        dtype: Array dtype; float32 matches MediaPipe's own precision
+            
+    Returns:
+        Array of shape (N, 4) with x, y, z, visibility rows
+    """
+    if with_visibility:
+        rows = [(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks]
+    else:
+        rows = [(lm.x, lm.y, lm.z, 1.0) for lm in landmarks]
+    return np.array(rows, dtype=dtype).reshape(-1, 4)
+
+
+def _row_property(column: int) -> property:
+    """Build a float property reading and writing one column of self._row."""
+    def fget(self) -> float:
+        return float(self._row[column])
+    
+    def fset(self, value: float) -> None:
+        self._row[column] = value
+    
+    return property(fget, fset)
+
+
+class _LandmarkRow(Landmark):
+    """
+    Landmark view onto one row of a landmark set's xyzv array.
+    
+    Reads and writes go straight to the parent array, so landmark sets
+    never hold a second copy of their coordinates.
+    """
+    __slots__ = ("_row",)
+    
+    def __init__(self, row: np.ndarray):
+        self._row = row
+    
+    x = _row_property(0)
+    y = _row_property(1)
+    z = _row_property(2)
+    visibility = _row_property(3)
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Landmark):
+            return NotImplemented
+        return (self.x, self.y, self.z, self.visibility) == (
+            other.x, other.y, other.z, other.visibility
+        )
+
+
+# One packed record per landmark; views as (N, 4) float32 rows
+_LANDMARK_RECORD = np.dtype([
+    ("x", np.float32),
+    ("y", np.float32),
+    ("z", np.float32),
+    ("visibility", np.float32),
+])
+
+
+def landmark_list_to_array(message: Any, with_visibility: bool = True) -> np.ndarray:
+    """
+    Convert a MediaPipe landmark list protobuf to an (N, 4) array.
+    
+    Streams the repeated landmark field straight into a structured array
+    with np.fromiter, skipping the intermediate list of row tuples. Unset
+    visibility fields read as 0.0, as with attribute access.
+    
+    Args:
+        message: NormalizedLandmarkList (or LandmarkList) message
+        with_visibility: Read visibility; if False the column is set to 1.0
+        
+    Returns:
+        Array of shape (N, 4) with x, y, z, visibility rows (float32)
+    """
+    landmarks = message.landmark
+    if with_visibility:
+        rows = ((lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks)
+    else:
+        rows = ((lm.x, lm.y, lm.z, 1.0) for lm in landmarks)
+    records = np.fromiter(rows, dtype=_LANDMARK_RECORD, count=len(landmarks))
+    return records.view(np.float32).reshape(-1, 4)
+
+
+def landmarks_pairwise_distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Calculate Euclidean distances between corresponding rows of two arrays.
+    
+    Uses SimSIMD's batched kernels when installed, numpy otherwise.
+    
+    Args:
+        a: Array of shape (N, K), e.g. x, y, z landmark rows
+        b: Array of shape (N, K)
+        
+    Returns:
+        Array of N distances (float64)
+    """
+    a = np.ascontiguousarray(a, dtype=np.float64)
+    b = np.ascontiguousarray(b, dtype=np.float64)
+    if a.shape != b.shape or a.ndim != 2:
+        raise ValueError(f"Expected two (N, K) arrays of one shape, got {a.shape} and {b.shape}")
+    if SIMSIMD_AVAILABLE and len(a):
+        return np.sqrt(np.asarray(simsimd.sqeuclidean(a, b), dtype=np.float64).reshape(len(a)))
+    return np.linalg.norm(a - b, axis=1)
+
+
+def to_pixel_coords_batch(
+    xy: np.ndarray,
+    image_width: int,
+    image_height: int,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Convert normalized x, y rows to pixel coordinates in one pass.
+    
+    Coordinates are truncated like Landmark.to_pixel_coords.
+    
+    Args:
+        xy: Array of shape (N, 2) with normalized x, y rows
+        image_width: Image width in pixels
+        image_height: Image height in pixels
+        out: Optional (N, 2) int32 array to write into instead of allocating
+        
+    Returns:
+        Array of shape (N, 2) with x, y pixel coordinates (int32)
+    """
+    if out is None:
+        out = np.empty(xy.shape, dtype=np.int32)
+    scale = np.array([image_width, image_height], dtype=np.float64)
+    return np.multiply(xy, scale, out=out, casting="unsafe")
+
+
+class _LandmarkSet:
+    """
+    Storage shared by the face, hand and pose landmark containers.
+    
+    The canonical representation is a single (N, 4) array of x, y, z,
+    visibility rows (xyzv), so bulk operations are single numpy calls.
+    float32 arrays, as produced from MediaPipe results, are kept as they
+    are; landmarks and other arrays are stored as float64 so their values
+    are not rounded. The landmarks tuple holds views onto the array rows
+    and is only built on first access.
+    """
+    
+    def _init_landmarks(
+        self,
+        landmarks: Optional[List[Landmark]],
+        xyzv: Optional[np.ndarray]
+    ) -> None:
+        if xyzv is not None:
+            xyzv = np.asarray(xyzv)
+            if xyzv.dtype != np.float32:
+                xyzv = xyzv.astype(np.float64, copy=False)
+            self._xyzv = xyzv.reshape(-1, 4)
+        else:
+            self._xyzv = landmarks_to_array(landmarks or [], dtype=np.float64)
+        self._views = None
+    
+    @property
+    def landmarks(self) -> Tuple[Landmark, ...]:
+        """
+        Landmark views onto the xyzv rows.
+        
+        Edits to a landmark write through to the array. The tuple itself is
+        read-only; assign a new list to change the number of landmarks.
+        """
+        if self._views is None:
+            self._views = tuple(_LandmarkRow(row) for row in self._xyzv)
+        return self._views
+    
+    @landmarks.setter
+    def landmarks(self, value: List[Landmark]) -> None:
+        self._init_landmarks(value, None)
+    
+    @property
+    def xyzv(self) -> np.ndarray:
+        """All landmarks as an (N, 4) array of x, y, z, visibility."""
+        return self._xyzv
+    
+    def __len__(self) -> int:
+        return len(self._xyzv)
+    
+    def to_pixel_coords(
+        self,
+        image_width: int,
+        image_height: int,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Convert all landmarks to pixel coordinates at once.
+        
+        Args:
+            image_width: Image width in pixels
+            image_height: Image height in pixels
+            out: Optional (N, 2) int32 array to write into
+            
+        Returns:
+            Array of shape (N, 2) with x, y pixel coordinates (int32)
+        """
+        return to_pixel_coords_batch(self._xyzv[:, :2], image_width, image_height, out)
+    
+    def take(self, indices: Sequence[int]) -> np.ndarray:
+        """
+        Get the xyzv rows at the given indices with one fancy-indexing call.
+        
+        Args:
+            indices: Landmark indices; out-of-range ones are skipped
+            
+        Returns:
+            Array of shape (K, 4) holding a copy of the selected rows
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        return self._xyzv[indices[indices < len(self._xyzv)]]
+    
+    def _select(self, indices: Sequence[int]) -> List[Landmark]:
+        """Get the landmarks at the given indices, skipping out-of-range ones."""
+        n = len(self._xyzv)
+        if self._views is not None:
+            return [self._views[i] for i in indices if i < n]
+        return [_LandmarkRow(self._xyzv[i]) for i in indices if i < n]
+    
+    def _landmark_dicts(self) -> List[Dict[str, float]]:
+        return [
+            {"x": x, "y": y, "z": z, "visibility": v}
+            for x, y, z, v in self._xyzv.tolist()
+        ]
+    
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, f.name) == getattr(other, f.name) for f in fields(self)
+        ) and np.array_equal(self._xyzv, other._xyzv)
+
+
+@dataclass(init=False, eq=False)
+class FaceLandmarks(_LandmarkSet):
     """
     Face landmarks detected by MediaPipe Face Mesh.
     
     Contains 468 3D face landmarks.
     """
-    landmarks: List[Landmark] = field(default_factory=list)
     confidence: float = 0.0
     
+    def __init__(
+        self,
+        landmarks: Optional[List[Landmark]] = None,
+        confidence: float = 0.0,
+        xyzv: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize face landmarks.
+        
+        Args:
+            landmarks: Landmarks to copy into the array (ignored if xyzv is given)
+            confidence: Detection confidence
+            xyzv: (N, 4) array of x, y, z, visibility rows
+        """
+        self._init_landmarks(landmarks, xyzv)
+        self.confidence = confidence
+    
     def get_contour(self) -> List[Landmark]:
         """Get face contour landmarks."""
-        # Face mesh contour indices
-        contour_indices = list(range(0, 17))
-        return [self.landmarks[i] for i in contour_indices if i < len(self.landmarks)]
+        return self._select(FACE_CONTOUR_INDICES)
     
     def get_eyes(self) -> Tuple[List[Landmark], List[Landmark]]:
         """
@@ -88,62 +389,90 @@ class FaceLandmarks:
         Returns:
             Tuple of (left_eye, right_eye) landmark lists
         """
-        # Simplified eye indices for face mesh
-        left_eye_indices = [33, 133, 160, 159, 158, 157, 173]
-        right_eye_indices = [362, 263, 387, 386, 385, 384, 398]
-        
-        left_eye = [self.landmarks[i] for i in left_eye_indices if i < len(self.landmarks)]
-        right_eye = [self.landmarks[i] for i in right_eye_indices if i < len(self.landmarks)]
-        return left_eye, right_eye
+        return self._select(LEFT_EYE_INDICES), self._select(RIGHT_EYE_INDICES)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
-            "landmarks": [lm.to_dict() for lm in self.landmarks],
+            "landmarks": self._landmark_dicts(),
             "confidence": self.confidence,
         }
 
 
-@dataclass
-class HandLandmarks:
+@dataclass(init=False, eq=False)
+class HandLandmarks(_LandmarkSet):
     """
     Hand landmarks detected by MediaPipe Hands.
     
     Contains 21 3D hand landmarks per hand.
     """
-    landmarks: List[Landmark] = field(default_factory=list)
     handedness: str = "Unknown"  # "Left" or "Right"
     confidence: float = 0.0
     
+    def __init__(
+        self,
+        landmarks: Optional[List[Landmark]] = None,
+        handedness: str = "Unknown",
+        confidence: float = 0.0,
+        xyzv: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize hand landmarks.
+        
+        Args:
+            landmarks: Landmarks to copy into the array (ignored if xyzv is given)
+            handedness: "Left", "Right" or "Unknown"
+            confidence: Handedness classification score
+            xyzv: (N, 4) array of x, y, z, visibility rows
+        """
+        self._init_landmarks(landmarks, xyzv)
+        self.handedness = handedness
+        self.confidence = confidence
+    
     def get_wrist(self) -> Optional[Landmark]:
         """Get wrist landmark."""
-        return self.landmarks[0] if self.landmarks else None
+        wrist = self._select([0])
+        return wrist[0] if wrist else None
     
     def get_fingertips(self) -> List[Landmark]:
         """Get fingertip landmarks."""
-        # Fingertip indices: thumb, index, middle, ring, pinky
-        tip_indices = [4, 8, 12, 16, 20]
-        return [self.landmarks[i] for i in tip_indices if i < len(self.landmarks)]
+        return self._select(FINGERTIP_INDICES)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
-            "landmarks": [lm.to_dict() for lm in self.landmarks],
+            "landmarks": self._landmark_dicts(),
             "handedness": self.handedness,
             "confidence": self.confidence,
         }
 
 
-@dataclass
-class PoseLandmarks:
+@dataclass(init=False, eq=False)
+class PoseLandmarks(_LandmarkSet):
     """
     Pose landmarks detected by MediaPipe Pose.
     
     Contains 33 3D pose landmarks representing body keypoints.
     """
-    landmarks: List[Landmark] = field(default_factory=list)
     confidence: float = 0.0
     
+    def __init__(
+        self,
+        landmarks: Optional[List[Landmark]] = None,
+        confidence: float = 0.0,
+        xyzv: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize pose landmarks.
+        
+        Args:
+            landmarks: Landmarks to copy into the array (ignored if xyzv is given)
+            confidence: Mean landmark visibility
+            xyzv: (N, 4) array of x, y, z, visibility rows
+        """
+        self._init_landmarks(landmarks, xyzv)
+        self.confidence = confidence
+    
     # Landmark indices following MediaPipe Pose convention
     NOSE = 0
     LEFT_EYE_INNER = 1
@@ -181,7 +510,8 @@ class PoseLandmarks:
     
     def get_landmark(self, index: int) -> Optional[Landmark]:
         """Get landmark by index."""
-        return self.landmarks[index] if index < len(self.landmarks) else None
+        landmark = self._select([index])
+        return landmark[0] if landmark else None
     
     def get_shoulders(self) -> Tuple[Optional[Landmark], Optional[Landmark]]:
         """Get left and right shoulder landmarks."""
@@ -211,6 +541,6 @@ class PoseLandmarks:
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
-            "landmarks": [lm.to_dict() for lm in self.landmarks],
+            "landmarks": self._landmark_dicts(),
             "confidence": self.confidence,
         }
@@ -5,10 +5,46 @@ Contains dataclasses for representing complete pose information.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+import math
 import numpy as np
 
 
+# Standard skeleton connections as (start_keypoint, end_keypoint) names
+SKELETON_LINES: Tuple[Tuple[str, str], ...] = (
+    # Head
+    ("nose", "left_eye"),
+    ("nose", "right_eye"),
+    ("left_eye", "left_ear"),
+    ("right_eye", "right_ear"),
+    # Torso
+    ("left_shoulder", "right_shoulder"),
+    ("left_shoulder", "left_hip"),
+    ("right_shoulder", "right_hip"),
+    ("left_hip", "right_hip"),
+    # Arms
+    ("left_shoulder", "left_elbow"),
+    ("left_elbow", "left_wrist"),
+    ("right_shoulder", "right_elbow"),
+    ("right_elbow", "right_wrist"),
+    # Legs
+    ("left_hip", "left_knee"),
+    ("left_knee", "left_ankle"),
+    ("right_hip", "right_knee"),
+    ("right_knee", "right_ankle"),
+)
+
+# Distinct keypoints used by the skeleton, and each skeleton line as a
+# (start, end) pair of row indices into SKELETON_KEYPOINTS
+SKELETON_KEYPOINTS: Tuple[str, ...] = tuple(
+    dict.fromkeys(name for line in SKELETON_LINES for name in line)
+)
+SKELETON_EDGES = np.array(
+    [[SKELETON_KEYPOINTS.index(start), SKELETON_KEYPOINTS.index(end)]
+     for start, end in SKELETON_LINES],
+    dtype=np.intp
+)
+
 @dataclass
 class PoseKeypoint:
     """
@@ -23,13 +59,20 @@ class PoseKeypoint:
     confidence: float = 1.0
     
     def to_array(self) -> np.ndarray:
-        """Convert to numpy array [x, y, z]."""
+        """
+        Convert to numpy array [x, y, z].
+        
+        Allocates a new array per call; use PoseData.as_array or
+        PoseData.pairwise_keypoint_distances when working on many keypoints.
+        """
         return np.array([self.x, self.y, self.z])
     
     def distance_to(self, other: 'PoseKeypoint') -> float:
         """Calculate distance to another keypoint."""
-        diff = self.to_array() - other.to_array()
-        return float(np.linalg.norm(diff))
+        dx = self.x - other.x
+        dy = self.y - other.y
+        dz = self.z - other.z
+        return math.sqrt(dx*dx + dy*dy + dz*dz)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -55,6 +98,38 @@ class PoseData:
     image_width: int = 0
     image_height: int = 0
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _by_name: Optional[Tuple[List[PoseKeypoint], int, Dict[str, int]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def _keypoint_index(self, rebuild: bool = False) -> Dict[str, int]:
+        """
+        Get the cached name to keypoint position mapping.
+        
+        The mapping is rebuilt whenever the keypoints list is replaced or
+        changes length, or when rebuild is set. The first keypoint with a
+        given name wins.
+        
+        Args:
+            rebuild: Rebuild even if the list looks unchanged
+            
+        Returns:
+            Dictionary mapping keypoint names to indices into keypoints
+        """
+        cached = self._by_name
+        if (
+            not rebuild
+            and cached is not None
+            and cached[0] is self.keypoints
+            and cached[1] == len(self.keypoints)
+        ):
+            return cached[2]
+        
+        by_name: Dict[str, int] = {}
+        for i, kp in enumerate(self.keypoints):
+            by_name.setdefault(kp.name, i)
+        self._by_name = (self.keypoints, len(self.keypoints), by_name)
+        return by_name
     
     def get_keypoint(self, name: str) -> Optional[PoseKeypoint]:
         """
@@ -66,10 +141,69 @@ class PoseData:
         Returns:
             The keypoint if found, None otherwise
         """
-        for kp in self.keypoints:
-            if kp.name == name:
-                return kp
-        return None
+        i = self._keypoint_index().get(name)
+        # Keypoints replaced in place are picked up through the index; a
+        # renamed one means the index is stale
+        if i is not None and self.keypoints[i].name != name:
+            i = self._keypoint_index(rebuild=True).get(name)
+        return None if i is None else self.keypoints[i]
+    
+    def as_array(
+        self,
+        names: Optional[Sequence[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Stack keypoint coordinates into a single array.
+        
+        Args:
+            names: Keypoint names giving the row order (None for all
+                keypoints in stored order)
+            
+        Returns:
+            Tuple of an (N, 3) array of [x, y, z] rows and an (N,) boolean
+            mask marking which names were found. Rows for missing names
+            are NaN.
+        """
+        if names is None:
+            coords = np.array(
+                [(kp.x, kp.y, kp.z) for kp in self.keypoints], dtype=np.float64
+            ).reshape(-1, 3)
+            return coords, np.ones(len(coords), dtype=bool)
+        
+        index = self._keypoint_index()
+        keypoints = self.keypoints
+        coords = np.full((len(names), 3), np.nan)
+        found = np.zeros(len(names), dtype=bool)
+        for i, name in enumerate(names):
+            j = index.get(name)
+            if j is None:
+                continue
+            kp = keypoints[j]
+            if kp.name != name:
+                kp = self.get_keypoint(name)
+            if kp is not None:
+                coords[i] = (kp.x, kp.y, kp.z)
+                found[i] = True
+        return coords, found
+    
+    def pairwise_keypoint_distances(
+        self,
+        names: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """
+        Calculate distances between every pair of keypoints at once.
+        
+        Args:
+            names: Keypoint names giving the row order (None for all
+                keypoints in stored order)
+            
+        Returns:
+            Symmetric (N, N) array of Euclidean distances in x, y, z.
+            Rows and columns for missing names are NaN.
+        """
+        coords, _ = self.as_array(names)
+        diff = coords[:, None, :] - coords[None, :, :]
+        return np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
     
     def get_keypoint_names(self) -> List[str]:
         """Get list of all keypoint names."""
@@ -82,29 +216,7 @@ class PoseData:
         Returns:
             List of (start_keypoint, end_keypoint) tuples
         """
-        # Define standard skeleton connections
-        return [
-            # Head
-            ("nose", "left_eye"),
-            ("nose", "right_eye"),
-            ("left_eye", "left_ear"),
-            ("right_eye", "right_ear"),
-            # Torso
-            ("left_shoulder", "right_shoulder"),
-            ("left_shoulder", "left_hip"),
-            ("right_shoulder", "right_hip"),
-            ("left_hip", "right_hip"),
-            # Arms
-            ("left_shoulder", "left_elbow"),
-            ("left_elbow", "left_wrist"),
-            ("right_shoulder", "right_elbow"),
-            ("right_elbow", "right_wrist"),
-            # Legs
-            ("left_hip", "left_knee"),
-            ("left_knee", "left_ankle"),
-            ("right_hip", "right_knee"),
-            ("right_knee", "right_ankle"),
-        ]
+        return list(SKELETON_LINES)
     
     def calculate_bounds(self) -> Optional[Tuple[float, float, float, float]]:
         """
@@ -126,29 +238,32 @@ class PoseData:
         Normalize pose to 0-1 coordinate space.
         
         Returns:
-            New normalized PoseData
+            New normalized PoseData, or this pose itself when it has no
+            keypoints or a zero-width or zero-height extent
         """
-        bounds = self.calculate_bounds()
-        if not bounds:
+        if not self.keypoints:
             return self
         
-        min_x, min_y, max_x, max_y = bounds
-        width = max_x - min_x
-        height = max_y - min_y
+        # One pass over the keypoints serves both the bounds and the rescale
+        x_coords = [kp.x for kp in self.keypoints]
+        y_coords = [kp.y for kp in self.keypoints]
+        min_x, min_y = min(x_coords), min(y_coords)
+        width = max(x_coords) - min_x
+        height = max(y_coords) - min_y
         
         if width == 0 or height == 0:
             return self
         
-        normalized_keypoints = []
-        for kp in self.keypoints:
-            norm_kp = PoseKeypoint(
+        normalized_keypoints = [
+            PoseKeypoint(
                 name=kp.name,
-                x=(kp.x - min_x) / width,
-                y=(kp.y - min_y) / height,
+                x=(x - min_x) / width,
+                y=(y - min_y) / height,
                 z=kp.z,
                 confidence=kp.confidence
             )
-            normalized_keypoints.append(norm_kp)
+            for kp, x, y in zip(self.keypoints, x_coords, y_coords)
+        ]
         
         return PoseData(
             keypoints=normalized_keypoints,
@@ -176,3 +291,39 @@ class PoseData:
             PoseKeypoint(**kp) for kp in data.get("keypoints", [])
         ]
         return cls(**data)
+    
+    @classmethod
+    def from_array(
+        cls,
+        names: Sequence[str],
+        xyzv: np.ndarray,
+        image_width: int = 0,
+        image_height: int = 0
+    ) -> 'PoseData':
+        """
+        Create from an (N, 4) landmark array.
+        
+        Rows beyond the number of names are ignored. Overall confidence is
+        the mean visibility of the named rows.
+        
+        Args:
+            names: Keypoint name for each row
+            xyzv: Array of x, y, z, visibility rows
+            image_width: Source image width
+            image_height: Source image height
+            
+        Returns:
+            PoseData with one keypoint per named row
+        """
+        rows = xyzv[:len(names)]
+        keypoints = [
+            PoseKeypoint(name=name, x=x, y=y, z=z, confidence=v)
+            for name, (x, y, z, v) in zip(names, rows.tolist())
+        ]
+        confidence = float(rows[:, 3].mean(dtype=np.float64)) if len(rows) else 0.0
+        return cls(
+            keypoints=keypoints,
+            confidence=confidence,
+            image_width=image_width,
+            image_height=image_height
+        )
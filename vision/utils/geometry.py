@@ -5,6 +5,7 @@ Mathematical operations for 2D/3D geometry and spatial analysis.
 """
 
 from typing import Tuple, List, Optional
+import math
 import numpy as np
 
 
@@ -28,9 +29,25 @@ class GeometryUtils:
         Returns:
             Distance
         """
-        dx = point2[0] - point1[0]
-        dy = point2[1] - point1[1]
-        return float(np.sqrt(dx * dx + dy * dy))
+        return math.hypot(point2[0] - point1[0], point2[1] - point1[1])
+    
+    @staticmethod
+    def calculate_distances_batch(
+        points_a: np.ndarray,
+        points_b: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate Euclidean distances between many point pairs at once.
+        
+        Args:
+            points_a: Array of shape (N, 2) (or (N, 3)) with first points
+            points_b: Array of the same shape with second points
+            
+        Returns:
+            Array of N distances
+        """
+        diff = np.asarray(points_a, dtype=np.float64) - np.asarray(points_b, dtype=np.float64)
+        return np.sqrt(np.einsum("ij,ij->i", diff, diff))
     
     @staticmethod
     def calculate_angle(
@@ -49,15 +66,45 @@ class GeometryUtils:
         Returns:
             Angle in degrees
         """
-        # Create vectors
-        v1 = np.array([point1[0] - vertex[0], point1[1] - vertex[1]])
-        v2 = np.array([point2[0] - vertex[0], point2[1] - vertex[1]])
+        # Plain floats: numpy dispatch dominates for scalars
+        v1x, v1y = point1[0] - vertex[0], point1[1] - vertex[1]
+        v2x, v2y = point2[0] - vertex[0], point2[1] - vertex[1]
+        
+        # A zero-length vector has no direction; report a right angle
+        if (v1x == 0 and v1y == 0) or (v2x == 0 and v2y == 0):
+            return 90.0
+        
+        # atan2 of cross and dot stays accurate near 0 and 180 degrees
+        return abs(math.degrees(math.atan2(v1x * v2y - v1y * v2x, v1x * v2x + v1y * v2y)))
+    
+    @staticmethod
+    def calculate_angles_batch(
+        points1: np.ndarray,
+        vertices: np.ndarray,
+        points2: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate angles at many vertices at once (see calculate_angle).
+        
+        Args:
+            points1: Array of shape (N, 2) with first points
+            vertices: Array of shape (N, 2) with vertex points
+            points2: Array of shape (N, 2) with second points
+            
+        Returns:
+            Array of N angles in degrees
+        """
+        vertices = np.asarray(vertices, dtype=np.float64)
+        v1 = np.asarray(points1, dtype=np.float64) - vertices
+        v2 = np.asarray(points2, dtype=np.float64) - vertices
         
-        # Calculate angle
-        cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
-        angle = np.arccos(np.clip(cos_angle, -1.0, 1.0))
+        cross = v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]
+        dot = np.einsum("ij,ij->i", v1, v2)
+        angles = np.abs(np.degrees(np.arctan2(cross, dot)))
         
-        return np.degrees(angle)
+        degenerate = ~v1.any(axis=1) | ~v2.any(axis=1)
+        angles[degenerate] = 90.0
+        return angles
     
     @staticmethod
     def calculate_midpoint(
@@ -122,7 +169,7 @@ class GeometryUtils:
         
         # Calculate distance using cross product formula
         numerator = abs((y2 - y1) * x0 - (x2 - x1) * y0 + x2 * y1 - y2 * x1)
-        denominator = np.sqrt((y2 - y1) ** 2 + (x2 - x1) ** 2)
+        denominator = math.hypot(y2 - y1, x2 - x1)
         
         if denominator < 1e-6:
             # Line is a point
@@ -202,7 +249,7 @@ class GeometryUtils:
         Calculate area of polygon defined by points.
         
         Args:
-            points: List of points in order [(x, y), ...]
+            points: Points in order, as a list [(x, y), ...] or an (N, 2) array
             
         Returns:
             Area
@@ -210,7 +257,13 @@ class GeometryUtils:
         if len(points) < 3:
             return 0.0
         
-        # Shoelace formula
+        # Shoelace formula; arrays take one vectorized pass, while short
+        # lists are cheaper to walk than to convert
+        if isinstance(points, np.ndarray):
+            xy = points.astype(np.float64, copy=False)
+            x, y = xy[:, 0], xy[:, 1]
+            return abs(float(x @ np.roll(y, -1) - y @ np.roll(x, -1))) / 2.0
+        
         area = 0.0
         n = len(points)
         
@@ -238,9 +291,9 @@ class GeometryUtils:
         Returns:
             Rotated point (x, y)
         """
-        angle_rad = np.radians(angle_degrees)
-        cos_a = np.cos(angle_rad)
-        sin_a = np.sin(angle_rad)
+        angle_rad = math.radians(angle_degrees)
+        cos_a = math.cos(angle_rad)
+        sin_a = math.sin(angle_rad)
         
         # Translate to origin
         x = point[0] - center[0]
@@ -252,3 +305,29 @@ class GeometryUtils:
         
         # Translate back
         return (x_rot + center[0], y_rot + center[1])
+    
+    @staticmethod
+    def rotate_points(
+        points: np.ndarray,
+        center: Tuple[float, float],
+        angle_degrees: float
+    ) -> np.ndarray:
+        """
+        Rotate many points around one center (see rotate_point).
+        
+        Args:
+            points: Array of shape (N, 2) with points to rotate
+            center: Center of rotation (x, y)
+            angle_degrees: Rotation angle in degrees
+            
+        Returns:
+            Array of shape (N, 2) with rotated points
+        """
+        angle_rad = math.radians(angle_degrees)
+        cos_a = math.cos(angle_rad)
+        sin_a = math.sin(angle_rad)
+        rotation = np.array([[cos_a, -sin_a], [sin_a, cos_a]])
+        
+        center_xy = np.asarray(center, dtype=np.float64)
+        offsets = np.asarray(points, dtype=np.float64) - center_xy
+        return np.einsum("ij,nj->ni", rotation, offsets) + center_xy
@@ -90,15 +90,13 @@ class ImageUtils:
         if len(mask.shape) == 3:
             mask = cv2.cvtColor(mask, cv2.COLOR_BGR2GRAY)
         
-        # Create output
-        output = image.copy()
+        # copyTo takes a uint8 mask and broadcasts it across channels
+        if mask.dtype != np.uint8:
+            mask = (mask > 0).view(np.uint8)
         
-        # Apply mask
-        bg = np.full_like(image, background_color)
-        mask_3ch = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR)
-        output = np.where(mask_3ch > 0, image, bg)
-        
-        return output
+        # Fill with the background, then copy the masked pixels over it
+        output = np.full_like(image, background_color)
+        return cv2.copyTo(image, mask, output)
     
     @staticmethod
     def calculate_histogram(image: np.ndarray, bins: int = 256) -> np.ndarray:
@@ -139,12 +137,19 @@ class ImageUtils:
         # Convert to grayscale if needed
         if len(source.shape) == 3:
             # Process each channel
-            matched = np.zeros_like(source)
-            for i in range(3):
-                matched[:, :, i] = ImageUtils._match_histogram_channel(
-                    source[:, :, i],
-                    reference[:, :, i] if len(reference.shape) == 3 else reference
+            lookups = [
+                ImageUtils._histogram_lookup(
+                    source, i, reference, i if len(reference.shape) == 3 else 0
                 )
+                for i in range(3)
+            ]
+            if source.dtype == np.uint8 and source.shape[2] == 3:
+                # One pass applying a per-channel table
+                return cv2.LUT(source, np.stack(lookups, axis=-1).reshape(256, 1, 3))
+            
+            matched = np.zeros_like(source)
+            for i, lookup in enumerate(lookups):
+                matched[:, :, i] = lookup[source[:, :, i]]
             return matched
         else:
             return ImageUtils._match_histogram_channel(source, reference)
@@ -155,9 +160,28 @@ class ImageUtils:
         reference: np.ndarray
     ) -> np.ndarray:
         """Match histogram for single channel."""
+        lookup = ImageUtils._histogram_lookup(source, 0, reference, 0)
+        
+        # Apply lookup
+        if source.dtype == np.uint8:
+            return cv2.LUT(source, lookup)
+        return lookup[source]
+    
+    @staticmethod
+    def _histogram_lookup(
+        source: np.ndarray,
+        source_channel: int,
+        reference: np.ndarray,
+        reference_channel: int
+    ) -> np.ndarray:
+        """
+        Build the 256-entry table mapping source levels to reference levels.
+        
+        Channels are read in place by calcHist, without slicing them out.
+        """
         # Calculate CDFs
-        source_hist = cv2.calcHist([source], [0], None, [256], [0, 256])
-        reference_hist = cv2.calcHist([reference], [0], None, [256], [0, 256])
+        source_hist = cv2.calcHist([source], [source_channel], None, [256], [0, 256])
+        reference_hist = cv2.calcHist([reference], [reference_channel], None, [256], [0, 256])
         
         source_cdf = source_hist.cumsum()
         reference_cdf = reference_hist.cumsum()
@@ -166,14 +190,17 @@ class ImageUtils:
         source_cdf = source_cdf / source_cdf[-1]
         reference_cdf = reference_cdf / reference_cdf[-1]
         
-        # Create lookup table
-        lookup = np.zeros(256, dtype=np.uint8)
-        for i in range(256):
-            j = np.argmin(np.abs(reference_cdf - source_cdf[i]))
-            lookup[i] = j
-        
-        # Apply lookup
-        return lookup[source]
+        # Map each level to the nearest reference CDF value. The CDF is
+        # non-decreasing, so the nearest is either the first value at or
+        # above it or the value just below, taken at its first occurrence
+        # (ties go to the lower level).
+        above = np.searchsorted(reference_cdf, source_cdf).clip(max=255)
+        below = np.searchsorted(reference_cdf, reference_cdf[(above - 1).clip(min=0)])
+        lower_is_nearer = (
+            np.abs(reference_cdf[below] - source_cdf)
+            <= np.abs(reference_cdf[above] - source_cdf)
+        )
+        return np.where(lower_is_nearer, below, above).astype(np.uint8)
     
     @staticmethod
     def calculate_difference(
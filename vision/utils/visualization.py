@@ -188,7 +188,7 @@ class VisualizationUtils:
         
         Args:
             image: Base image
-            heatmap: Heatmap array (0-1 range)
+            heatmap: Heatmap array (0-1 range, or uint8 0-255)
             colormap: OpenCV colormap
             alpha: Overlay transparency
             
@@ -200,7 +200,10 @@ class VisualizationUtils:
             heatmap = cv2.resize(heatmap, (image.shape[1], image.shape[0]))
         
         # Convert to uint8
-        heatmap_uint8 = (heatmap * 255).astype(np.uint8)
+        if heatmap.dtype == np.uint8:
+            heatmap_uint8 = heatmap
+        else:
+            heatmap_uint8 = (heatmap * 255).astype(np.uint8)
         
         # Apply colormap
         heatmap_colored = cv2.applyColorMap(heatmap_uint8, colormap)
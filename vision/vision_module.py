@@ -5,7 +5,8 @@ This is the primary interface for vision analysis, providing high-level methods
 for analyzing canvas state, comparing to references, and detecting issues.
 """
 
-from typing import Union, Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Optional, List, Dict, Any, Tuple
 from pathlib import Path
 import time
 import numpy as np
@@ -78,12 +79,25 @@ class VisionModule:
             self.landmark_detector = None
         
         self.comparator = Comparator()
+        
+        # Detectors run concurrently on one long-lived pool; its threads are
+        # started on first use and reused for every frame
+        detector_count = sum([
+            self.pose_detector is not None,
+            self.landmark_detector is not None and enable_face,
+            self.landmark_detector is not None and enable_hands,
+        ])
+        self._detector_pool = (
+            ThreadPoolExecutor(max_workers=detector_count, thread_name_prefix="vision-detect")
+            if detector_count > 1 else None
+        )
     
     def analyze(
         self,
         image: Union[str, Path, Image.Image, np.ndarray],
         extract_silhouette: bool = True,
-        detect_edges: bool = True
+        detect_edges: bool = True,
+        target_size: Optional[Tuple[int, int]] = None
     ) -> AnalysisResult:
         """
         Analyze an image and extract features.
@@ -92,6 +106,8 @@ class VisionModule:
             image: Input image (path, PIL Image, or numpy array)
             extract_silhouette: Extract foreground silhouette
             detect_edges: Detect edges in image
+            target_size: Optional (width, height) hint allowing JPEG files to
+                be decoded at reduced resolution (see ImageProcessor.load_image)
             
         Returns:
             AnalysisResult containing detected features and metrics
@@ -99,7 +115,7 @@ class VisionModule:
         start_time = time.time()
         
         # Load image
-        img_bgr = self.image_processor.load_image(image)
+        img_bgr = self.image_processor.load_image(image, target_size=target_size)
         h, w = img_bgr.shape[:2]
         
         # Initialize result
@@ -108,36 +124,57 @@ class VisionModule:
             image_height=h
         )
         
-        # Detect pose
+        # Detectors run on separate MediaPipe graphs, which release the GIL,
+        # so run them concurrently on one shared RGB conversion
+        tasks = {}
         if self.enable_pose and self.pose_detector:
-            pose_data = self.pose_detector.detect(img_bgr)
-            if pose_data:
-                result.pose = pose_data
-                result.pose_landmarks = self.pose_detector.detect_landmarks(img_bgr)
-                result.detection_confidence = max(result.detection_confidence, pose_data.confidence)
+            tasks["pose"] = self.pose_detector.detect_with_landmarks
+        if self.enable_face and self.landmark_detector:
+            tasks["face"] = self.landmark_detector.detect_face
+        if self.enable_hands and self.landmark_detector:
+            tasks["hands"] = self.landmark_detector.detect_hands
+        
+        detections = {}
+        if tasks:
+            img_rgb = self.image_processor.to_rgb(img_bgr, reuse_buffer=True)
+            if len(tasks) == 1 or self._detector_pool is None:
+                detections = {
+                    name: detect(img_bgr, rgb=img_rgb) for name, detect in tasks.items()
+                }
+            else:
+                futures = {
+                    name: self._detector_pool.submit(detect, img_bgr, rgb=img_rgb)
+                    for name, detect in tasks.items()
+                }
+                detections = {name: future.result() for name, future in futures.items()}
+        
+        # Detect pose
+        pose_data, pose_landmarks = detections.get("pose", (None, None))
+        if pose_data:
+            result.pose = pose_data
+            result.pose_landmarks = pose_landmarks
+            result.detection_confidence = max(result.detection_confidence, pose_data.confidence)
         
         # Detect face
-        if self.enable_face and self.landmark_detector:
-            face_landmarks = self.landmark_detector.detect_face(img_bgr)
-            if face_landmarks:
-                result.face_landmarks = face_landmarks
-                result.detection_confidence = max(result.detection_confidence, face_landmarks.confidence)
+        face_landmarks = detections.get("face")
+        if face_landmarks:
+            result.face_landmarks = face_landmarks
+            result.detection_confidence = max(result.detection_confidence, face_landmarks.confidence)
         
         # Detect hands
-        if self.enable_hands and self.landmark_detector:
-            hand_landmarks = self.landmark_detector.detect_hands(img_bgr)
-            if hand_landmarks:
-                result.hand_landmarks = hand_landmarks
-                # Update confidence with max hand confidence
-                max_hand_conf = max(h.confidence for h in hand_landmarks)
-                result.detection_confidence = max(result.detection_confidence, max_hand_conf)
-        
-        # Extract silhouette
-        if extract_silhouette:
+        hand_landmarks = detections.get("hands")
+        if hand_landmarks:
+            result.hand_landmarks = hand_landmarks
+            # Update confidence with max hand confidence
+            max_hand_conf = max(h.confidence for h in hand_landmarks)
+            result.detection_confidence = max(result.detection_confidence, max_hand_conf)
+        
+        # Extract silhouette and edges, sharing one grayscale pass when both are needed
+        if extract_silhouette and detect_edges:
+            result.edges, result.silhouette = self.image_processor.compute_edges_and_mask(img_bgr)
+        elif extract_silhouette:
             result.silhouette = self.image_processor.extract_silhouette(img_bgr)
-        
-        # Detect edges
-        if detect_edges:
+        elif detect_edges:
             result.edges = self.image_processor.detect_edges(img_bgr)
         
         # Analyze proportions if pose detected
@@ -170,9 +207,12 @@ class VisionModule:
         """
         start_time = time.time()
         
-        # Analyze both images
+        # Analyze both images (once when both inputs are the same image)
         canvas_analysis = self.analyze(canvas_image)
-        reference_analysis = self.analyze(reference_image)
+        if self._is_same_image(canvas_image, reference_image):
+            reference_analysis = canvas_analysis
+        else:
+            reference_analysis = self.analyze(reference_image)
         
         # Initialize result
         result = ComparisonResult()
@@ -249,6 +289,31 @@ class VisionModule:
         
         return result
     
+    @staticmethod
+    def _is_same_image(
+        image1: Union[str, Path, Image.Image, np.ndarray],
+        image2: Union[str, Path, Image.Image, np.ndarray]
+    ) -> bool:
+        """
+        Check whether two inputs are known to hold the same image.
+        
+        Args:
+            image1: First image input
+            image2: Second image input
+            
+        Returns:
+            True if the inputs are the same object or equal numpy arrays
+        """
+        if image1 is image2:
+            return True
+        if isinstance(image1, np.ndarray) and isinstance(image2, np.ndarray):
+            return (
+                image1.shape == image2.shape
+                and image1.dtype == image2.dtype
+                and np.array_equal(image1, image2)
+            )
+        return False
+    
     def detect_pose_errors(
         self,
         canvas_image: Union[str, Path, Image.Image, np.ndarray],
@@ -341,6 +406,9 @@ class VisionModule:
     
     def close(self):
         """Release resources."""
+        if self._detector_pool is not None:
+            self._detector_pool.shutdown()
+            self._detector_pool = None
         if self.pose_detector:
             self.pose_detector.close()
         if self.landmark_detector:
@@ -5,16 +5,58 @@ Manages saving and restoring canvas state at phase transitions and critical
 points in the workflow.
 """
 
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Deque, Tuple
 from datetime import datetime
-import copy
+import hashlib
+import itertools
+import json
+import zlib
+
+import numpy as np
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 from motor.core.canvas import Canvas
 from motor.core.stroke import Stroke
 from workflow.models.drawing_phase import DrawingPhase
 
 
+def _serializable_stroke(stroke_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a compact stroke's point array to nested lists."""
+    point_array = stroke_data.get("point_array")
+    if isinstance(point_array, np.ndarray):
+        return {**stroke_data, "point_array": point_array.tolist()}
+    return stroke_data
+
+
+def _same_stroke_data(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    """Check whether two serialized strokes hold the same content."""
+    if a is b:
+        return True
+    if a.keys() != b.keys():
+        return False
+    for key, value in a.items():
+        other = b[key]
+        if isinstance(value, np.ndarray) or isinstance(other, np.ndarray):
+            if not np.array_equal(value, other):
+                return False
+        elif value != other:
+            return False
+    return True
+
+
 @dataclass
 class CanvasCheckpoint:
     """
@@ -28,9 +70,10 @@ class CanvasCheckpoint:
         timestamp: When checkpoint was created
         phase: Drawing phase at checkpoint time
         canvas_state: Serialized canvas state
-        stroke_history: List of strokes executed up to this point
+        stroke_history: Serialized strokes executed up to this point
         metadata: Additional checkpoint metadata
         description: Human-readable description
+        sequence: Monotonic creation order within the owning manager
     """
     checkpoint_id: str
     timestamp: datetime
@@ -39,6 +82,7 @@ class CanvasCheckpoint:
     stroke_history: List[Dict[str, Any]] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
     description: str = ""
+    sequence: int = 0
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -47,9 +91,10 @@ class CanvasCheckpoint:
             "timestamp": self.timestamp.isoformat(),
             "phase": self.phase.value,
             "canvas_state": self.canvas_state,
-            "stroke_history": self.stroke_history,
+            "stroke_history": [_serializable_stroke(s) for s in self.stroke_history],
             "metadata": self.metadata,
             "description": self.description,
+            "sequence": self.sequence,
         }
     
     @classmethod
@@ -59,6 +104,78 @@ class CanvasCheckpoint:
         data["timestamp"] = datetime.fromisoformat(data["timestamp"])
         data["phase"] = DrawingPhase(data["phase"])
         return cls(**data)
+    
+    # Binary format: magic, encoding (msgpack/json), compression (zstd/zlib)
+    _BYTES_MAGIC = b"CKP1"
+    
+    def to_bytes(self) -> bytes:
+        """
+        Serialize to compact bytes for persistence.
+        
+        Uses msgpack and zstd when installed, falling back to JSON and zlib.
+        
+        Returns:
+            Encoded checkpoint
+        """
+        data = self.to_dict()
+        if MSGPACK_AVAILABLE:
+            encoding = b"m"
+            payload = msgpack.packb(data, default=str)
+        else:
+            encoding = b"j"
+            payload = json.dumps(data, default=str).encode("utf-8")
+        
+        if ZSTD_AVAILABLE:
+            compression = b"z"
+            payload = zstandard.ZstdCompressor(level=1).compress(payload)
+        else:
+            compression = b"d"
+            payload = zlib.compress(payload, 1)
+        
+        return self._BYTES_MAGIC + encoding + compression + payload
+    
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> 'CanvasCheckpoint':
+        """
+        Create from bytes produced by to_bytes.
+        
+        Args:
+            blob: Encoded checkpoint
+            
+        Returns:
+            Decoded checkpoint
+            
+        Raises:
+            ValueError: If blob is not an encoded checkpoint
+            ImportError: If blob needs msgpack/zstandard and it is not installed
+        """
+        header_size = len(cls._BYTES_MAGIC) + 2
+        if len(blob) < header_size or not blob.startswith(cls._BYTES_MAGIC):
+            raise ValueError("Not an encoded checkpoint")
+        
+        encoding = blob[header_size - 2:header_size - 1]
+        compression = blob[header_size - 1:header_size]
+        payload = blob[header_size:]
+        
+        if compression == b"z":
+            if not ZSTD_AVAILABLE:
+                raise ImportError("zstandard is required to decode this checkpoint")
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+        elif compression == b"d":
+            payload = zlib.decompress(payload)
+        else:
+            raise ValueError(f"Unknown checkpoint compression: {compression!r}")
+        
+        if encoding == b"m":
+            if not MSGPACK_AVAILABLE:
+                raise ImportError("msgpack is required to decode this checkpoint")
+            data = msgpack.unpackb(payload)
+        elif encoding == b"j":
+            data = json.loads(payload.decode("utf-8"))
+        else:
+            raise ValueError(f"Unknown checkpoint encoding: {encoding!r}")
+        
+        return cls.from_dict(data)
 
 
 class CheckpointManager:
@@ -69,6 +186,12 @@ class CheckpointManager:
     for the workflow system.
     """
     
+    # Every Nth checkpoint is exported in full to bound restore cost
+    KEYFRAME_INTERVAL = 16
+    
+    # Binary format for a whole manager: magic followed by zlib-compressed JSON
+    _BYTES_MAGIC = b"CKM1"
+    
     def __init__(self, max_checkpoints: int = 10):
         """
         Initialize checkpoint manager.
@@ -76,9 +199,20 @@ class CheckpointManager:
         Args:
             max_checkpoints: Maximum number of checkpoints to keep
         """
-        self.checkpoints: List[CanvasCheckpoint] = []
+        self.checkpoints: Deque[CanvasCheckpoint] = deque(maxlen=max_checkpoints)
         self.max_checkpoints = max_checkpoints
         self.current_checkpoint_index: int = -1
+        
+        # Monotonic sequence used for checkpoint IDs and ordering
+        self._sequence = itertools.count(1)
+        
+        # Lookup indices kept in sync with self.checkpoints
+        self._by_id: Dict[str, CanvasCheckpoint] = {}
+        self._by_phase: Dict[DrawingPhase, Deque[str]] = defaultdict(deque)
+        
+        # Content-addressed canvas states shared between checkpoints
+        self._blob_store: Dict[bytes, Dict[str, Any]] = {}
+
     
     def create_checkpoint(
         self,
@@ -101,11 +235,51 @@ class CheckpointManager:
         Returns:
             Created checkpoint
         """
-        checkpoint_id = f"checkpoint_{datetime.now().timestamp()}"
+        canvas_state = self._intern_canvas_state(canvas.to_dict())
+        return self._add_checkpoint(
+            canvas_state, phase, stroke_history, description, metadata
+        )
+    
+    def create_checkpoints_batch(
+        self,
+        items: List[Tuple[Canvas, DrawingPhase, List[Stroke], str]]
+    ) -> List[CanvasCheckpoint]:
+        """
+        Create several checkpoints in one call.
+        
+        Each distinct Canvas object in the batch is serialized and hashed
+        only once, however many items refer to it.
         
-        # Serialize canvas and strokes
-        canvas_state = canvas.to_dict()
-        stroke_data = [stroke.to_dict() for stroke in stroke_history]
+        Args:
+            items: (canvas, phase, stroke_history, description) tuples
+            
+        Returns:
+            Created checkpoints, in the order of items
+        """
+        states: Dict[int, Dict[str, Any]] = {}
+        checkpoints = []
+        for canvas, phase, stroke_history, description in items:
+            canvas_state = states.get(id(canvas))
+            if canvas_state is None:
+                canvas_state = self._intern_canvas_state(canvas.to_dict())
+                states[id(canvas)] = canvas_state
+            checkpoints.append(
+                self._add_checkpoint(canvas_state, phase, stroke_history, description)
+            )
+        return checkpoints
+    
+    def _add_checkpoint(
+        self,
+        canvas_state: Dict[str, Any],
+        phase: DrawingPhase,
+        stroke_history: List[Stroke],
+        description: str = "",
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> CanvasCheckpoint:
+        """Build a checkpoint from an interned canvas state and store it."""
+        sequence = next(self._sequence)
+        checkpoint_id = f"checkpoint_{sequence}"
+        stroke_data = self._serialize_strokes(stroke_history)
         
         checkpoint = CanvasCheckpoint(
             checkpoint_id=checkpoint_id,
@@ -115,18 +289,87 @@ class CheckpointManager:
             stroke_history=stroke_data,
             metadata=metadata or {},
             description=description,
+            sequence=sequence,
         )
+        self._store_checkpoint(checkpoint)
+        return checkpoint
+    
+    def _store_checkpoint(self, checkpoint: CanvasCheckpoint):
+        """Append a checkpoint, evicting the oldest and updating indices."""
+        # A manager that keeps no checkpoints stores nothing
+        if self.checkpoints.maxlen == 0:
+            return
+        
+        # Evict the oldest checkpoint if the deque is full
+        evicted = None
+        if len(self.checkpoints) == self.checkpoints.maxlen:
+            evicted = self.checkpoints[0]
+            del self._by_id[evicted.checkpoint_id]
+            self._by_phase[evicted.phase].popleft()
         
         # Add checkpoint
         self.checkpoints.append(checkpoint)
+        self._by_id[checkpoint.checkpoint_id] = checkpoint
+        self._by_phase[checkpoint.phase].append(checkpoint.checkpoint_id)
         self.current_checkpoint_index = len(self.checkpoints) - 1
         
-        # Trim old checkpoints if needed
-        if len(self.checkpoints) > self.max_checkpoints:
-            self.checkpoints.pop(0)
-            self.current_checkpoint_index -= 1
+        if evicted is not None:
+            self._prune_blob_store()
+    
+    def _intern_canvas_state(self, canvas_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return a shared copy of a canvas state.
         
-        return checkpoint
+        Identical canvas states (the common case between consecutive
+        checkpoints) are stored once and referenced by every checkpoint.
+        Stored states must be treated as read-only.
+        
+        Args:
+            canvas_state: Serialized canvas state
+            
+        Returns:
+            The stored canvas state with identical content
+        """
+        encoded = json.dumps(canvas_state, sort_keys=True, default=str).encode("utf-8")
+        key = hashlib.blake2b(encoded, digest_size=16).digest()
+        return self._blob_store.setdefault(key, canvas_state)
+    
+    def _serialize_strokes(self, stroke_history: List[Stroke]) -> List[Dict[str, Any]]:
+        """
+        Serialize stroke history into a snapshot.
+        
+        Strokes are mutable, so every stroke is serialized afresh. A record
+        whose content matches the one at the same position in the latest
+        checkpoint is replaced by that record, so consecutive checkpoints
+        share unchanged strokes instead of each keeping a copy. Points are
+        stored compactly as one read-only array per stroke; stored records
+        must be treated as read-only.
+        
+        Args:
+            stroke_history: Strokes executed so far
+            
+        Returns:
+            List of serialized strokes
+        """
+        previous = self.checkpoints[-1].stroke_history if self.checkpoints else []
+        stroke_data = []
+        for i, stroke in enumerate(stroke_history):
+            data = stroke.to_dict(compact=True)
+            data["metadata"] = dict(data["metadata"])
+            if i < len(previous) and _same_stroke_data(previous[i], data):
+                data = previous[i]
+            else:
+                data["point_array"].flags.writeable = False
+            stroke_data.append(data)
+        return stroke_data
+    
+    def _prune_blob_store(self):
+        """Drop canvas states no longer referenced by any checkpoint."""
+        live = {id(cp.canvas_state) for cp in self.checkpoints}
+        self._blob_store = {
+            key: state for key, state in self._blob_store.items()
+            if id(state) in live
+        }
     
     def get_checkpoint(self, checkpoint_id: str) -> Optional[CanvasCheckpoint]:
         """
@@ -138,10 +381,7 @@ class CheckpointManager:
         Returns:
             Checkpoint if found, None otherwise
         """
-        for checkpoint in self.checkpoints:
-            if checkpoint.checkpoint_id == checkpoint_id:
-                return checkpoint
-        return None
+        return self._by_id.get(checkpoint_id)
     
     def get_latest_checkpoint(self) -> Optional[CanvasCheckpoint]:
         """
@@ -164,7 +404,7 @@ class CheckpointManager:
         Returns:
             List of checkpoints for the phase
         """
-        return [cp for cp in self.checkpoints if cp.phase == phase]
+        return [self._by_id[cp_id] for cp_id in self._by_phase.get(phase, ())]
     
     def restore_checkpoint(self, checkpoint: CanvasCheckpoint) -> Canvas:
         """
@@ -188,11 +428,16 @@ class CheckpointManager:
         Returns:
             Checkpoint if found, None otherwise
         """
-        for i, checkpoint in enumerate(self.checkpoints):
-            if checkpoint.checkpoint_id == checkpoint_id:
-                self.current_checkpoint_index = i
-                return checkpoint
-        return None
+        checkpoint = self._by_id.get(checkpoint_id)
+        if checkpoint is None:
+            return None
+        
+        # Stored sequences are consecutive, so the position follows directly
+        index = checkpoint.sequence - self.checkpoints[0].sequence
+        if not (0 <= index < len(self.checkpoints) and self.checkpoints[index] is checkpoint):
+            index = next(i for i, cp in enumerate(self.checkpoints) if cp is checkpoint)
+        self.current_checkpoint_index = index
+        return checkpoint
     
     def rollback_to_phase(self, phase: DrawingPhase) -> Optional[CanvasCheckpoint]:
         """
@@ -204,10 +449,9 @@ class CheckpointManager:
         Returns:
             Checkpoint if found, None otherwise
         """
-        phase_checkpoints = self.get_checkpoints_by_phase(phase)
-        if phase_checkpoints:
-            checkpoint = phase_checkpoints[-1]
-            return self.rollback_to_checkpoint(checkpoint.checkpoint_id)
+        phase_checkpoint_ids = self._by_phase.get(phase)
+        if phase_checkpoint_ids:
+            return self.rollback_to_checkpoint(phase_checkpoint_ids[-1])
         return None
     
     def get_stroke_history_at_checkpoint(
@@ -217,6 +461,9 @@ class CheckpointManager:
         """
         Get stroke history at a checkpoint.
         
+        Strokes are rebuilt from the checkpoint's serialized snapshot, so
+        edits to the returned strokes never reach the checkpoint.
+        
         Args:
             checkpoint: Checkpoint to get strokes from
             
@@ -229,6 +476,106 @@ class CheckpointManager:
         """Clear all checkpoints."""
         self.checkpoints.clear()
         self.current_checkpoint_index = -1
+        self._by_id.clear()
+        self._by_phase.clear()
+        self._blob_store.clear()
+    
+    def export_deltas(self) -> List[Dict[str, Any]]:
+        """
+        Export checkpoints as a chain of deltas.
+        
+        Each checkpoint records only the strokes added since the previous
+        one and omits the canvas state when it is unchanged. Every
+        KEYFRAME_INTERVAL-th checkpoint is exported in full.
+        
+        Returns:
+            List of checkpoint records, oldest first
+        """
+        records = []
+        base = None
+        for i, cp in enumerate(self.checkpoints):
+            data = cp.to_dict()
+            if base is None or i % self.KEYFRAME_INTERVAL == 0:
+                data["keyframe"] = True
+            else:
+                prefix = 0
+                limit = min(len(cp.stroke_history), len(base.stroke_history))
+                while (prefix < limit
+                       and _same_stroke_data(cp.stroke_history[prefix],
+                                             base.stroke_history[prefix])):
+                    prefix += 1
+                data["base_id"] = base.checkpoint_id
+                data["stroke_prefix"] = prefix
+                data["stroke_history"] = data["stroke_history"][prefix:]
+                if cp.canvas_state is base.canvas_state:
+                    del data["canvas_state"]
+            records.append(data)
+            base = cp
+        return records
+    
+    def load_deltas(self, records: List[Dict[str, Any]]):
+        """
+        Replace stored checkpoints with those from export_deltas.
+        
+        Args:
+            records: Checkpoint records, oldest first
+            
+        Raises:
+            ValueError: If a delta refers to a base that is not present
+        """
+        self.clear_checkpoints()
+        base = None
+        for record in records:
+            data = dict(record)
+            if not data.pop("keyframe", False):
+                base_id = data.pop("base_id", None)
+                if base is None or base.checkpoint_id != base_id:
+                    raise ValueError(f"Missing base checkpoint: {base_id}")
+                prefix = data.pop("stroke_prefix", 0)
+                data["stroke_history"] = (
+                    base.stroke_history[:prefix] + data.get("stroke_history", [])
+                )
+                data.setdefault("canvas_state", base.canvas_state)
+            
+            checkpoint = CanvasCheckpoint.from_dict(data)
+            checkpoint.canvas_state = self._intern_canvas_state(checkpoint.canvas_state)
+            self._store_checkpoint(checkpoint)
+            base = checkpoint
+        
+        if base is not None:
+            self._sequence = itertools.count(base.sequence + 1)
+    
+    def to_bytes(self) -> bytes:
+        """
+        Serialize all checkpoints as compressed deltas.
+        
+        Returns:
+            Encoded checkpoints
+        """
+        payload = json.dumps(self.export_deltas(), default=str).encode("utf-8")
+        return self._BYTES_MAGIC + zlib.compress(payload, 1)
+    
+    @classmethod
+    def from_bytes(cls, blob: bytes, max_checkpoints: int = 10) -> 'CheckpointManager':
+        """
+        Create a manager from bytes produced by to_bytes.
+        
+        Args:
+            blob: Encoded checkpoints
+            max_checkpoints: Maximum number of checkpoints to keep
+            
+        Returns:
+            Manager holding the decoded checkpoints
+            
+        Raises:
+            ValueError: If blob is not an encoded checkpoint manager
+        """
+        if not blob.startswith(cls._BYTES_MAGIC):
+            raise ValueError("Not an encoded checkpoint manager")
+        records = json.loads(zlib.decompress(blob[len(cls._BYTES_MAGIC):]).decode("utf-8"))
+        manager = cls(max_checkpoints=max_checkpoints)
+        manager.load_deltas(records)
+        return manager
     
     def get_checkpoint_count(self) -> int:
         """Get number of stored checkpoints."""
@@ -5,8 +5,9 @@ Tracks decisions, strokes, and evaluations at each phase for replay
 and analysis.
 """
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Deque
 from datetime import datetime
 
 from workflow.models.drawing_phase import DrawingPhase
@@ -206,9 +207,15 @@ class DecisionLogger:
     drawing process for analysis and replay.
     """
     
-    def __init__(self):
-        """Initialize decision logger."""
-        self.phase_logs: List[PhaseDecisionLog] = []
+    def __init__(self, max_phase_logs: Optional[int] = None):
+        """
+        Initialize decision logger.
+        
+        Args:
+            max_phase_logs: Maximum phase logs to keep; the oldest are
+                dropped when exceeded. None keeps every log.
+        """
+        self.phase_logs: Deque[PhaseDecisionLog] = deque(maxlen=max_phase_logs)
         self.current_log: Optional[PhaseDecisionLog] = None
     
     def start_phase(self, phase: DrawingPhase, metadata: Optional[Dict[str, Any]] = None):
@@ -364,9 +371,9 @@ class DecisionLogger:
     def from_dict(cls, data: Dict[str, Any]) -> 'DecisionLogger':
         """Create from dictionary."""
         logger = cls()
-        logger.phase_logs = [
+        logger.phase_logs.extend(
             PhaseDecisionLog.from_dict(log) for log in data.get("phase_logs", [])
-        ]
+        )
         if logger.phase_logs:
             logger.current_log = logger.phase_logs[-1]
         return logger
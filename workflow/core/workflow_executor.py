@@ -5,6 +5,7 @@ Orchestrates the complete artistic workflow, integrating the Brain, Motor,
 Vision, and Workflow systems.
 """
 
+from collections import Counter
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 import uuid
@@ -14,7 +15,7 @@ from motor.core.stroke import Stroke
 from workflow.models.drawing_phase import DrawingPhase
 from workflow.models.stroke_intent import StrokeIntent, StrokeMetadata, StrokeIntentHelper
 from workflow.models.workflow_state import WorkflowState
-from workflow.core.checkpoint_manager import CheckpointManager
+from workflow.core.checkpoint_manager import CheckpointManager, CanvasCheckpoint
 from workflow.core.decision_logger import DecisionLogger
 
 
@@ -31,6 +32,7 @@ class WorkflowExecutor:
         canvas: Canvas,
         max_checkpoints: int = 10,
         enable_logging: bool = True,
+        max_phase_logs: Optional[int] = None,
     ):
         """
         Initialize workflow executor.
@@ -39,13 +41,21 @@ class WorkflowExecutor:
             canvas: Canvas to work with
             max_checkpoints: Maximum checkpoints to maintain
             enable_logging: Whether to enable decision logging
+            max_phase_logs: Maximum phase logs the decision logger keeps
+                (None for unbounded)
         """
         self.canvas = canvas
         self.workflow_state = WorkflowState()
         self.checkpoint_manager = CheckpointManager(max_checkpoints=max_checkpoints)
-        self.decision_logger = DecisionLogger() if enable_logging else None
+        self.decision_logger = (
+            DecisionLogger(max_phase_logs=max_phase_logs) if enable_logging else None
+        )
         self.stroke_history: List[Stroke] = []
         
+        # Stroke counts kept in sync with stroke_history
+        self._intent_counts: Counter = Counter()
+        self._phase_counts: Counter = Counter()
+        
         # Start with sketch phase
         self._initialize_workflow()
     
@@ -152,13 +162,13 @@ class WorkflowExecutor:
         )
         
         # Merge with existing metadata
-        stroke.metadata.update({
-            "workflow": workflow_metadata.to_dict(),
-            "stroke_id": stroke_id,
-        })
+        stroke.metadata["workflow"] = workflow_metadata.to_dict()
+        stroke.metadata["stroke_id"] = stroke_id
         
         # Add to stroke history
         self.stroke_history.append(stroke)
+        self._intent_counts[intent.value] += 1
+        self._phase_counts[self.workflow_state.current_phase.value] += 1
         
         # Update workflow state
         self.workflow_state.record_stroke()
@@ -217,6 +227,11 @@ class WorkflowExecutor:
         if not checkpoint:
             return False
         
+        self._restore_checkpoint(checkpoint)
+        return True
+    
+    def _restore_checkpoint(self, checkpoint: CanvasCheckpoint):
+        """Restore canvas, stroke history and phase from a checkpoint."""
         # Restore canvas
         self.canvas = self.checkpoint_manager.restore_checkpoint(checkpoint)
         
@@ -224,13 +239,21 @@ class WorkflowExecutor:
         self.stroke_history = self.checkpoint_manager.get_stroke_history_at_checkpoint(
             checkpoint
         )
+        self._recount_strokes()
         
         # Update workflow state
         self.workflow_state.current_phase = checkpoint.phase
         self.workflow_state.phase_start_time = checkpoint.timestamp
         self.workflow_state.total_strokes = len(self.stroke_history)
-        
-        return True
+    
+    def _recount_strokes(self):
+        """Rebuild the intent and phase counters from stroke_history."""
+        self._intent_counts.clear()
+        self._phase_counts.clear()
+        for stroke in self.stroke_history:
+            workflow_meta = stroke.metadata.get("workflow", {})
+            self._intent_counts[workflow_meta.get("intent")] += 1
+            self._phase_counts[workflow_meta.get("phase")] += 1
     
     def rollback_to_phase(self, phase: DrawingPhase) -> bool:
         """
@@ -243,9 +266,11 @@ class WorkflowExecutor:
             True if rollback successful
         """
         checkpoint = self.checkpoint_manager.rollback_to_phase(phase)
-        if checkpoint:
-            return self.rollback_to_checkpoint(checkpoint.checkpoint_id)
-        return False
+        if not checkpoint:
+            return False
+        
+        self._restore_checkpoint(checkpoint)
+        return True
     
     def evaluate_and_decide_transition(
         self,
@@ -359,12 +384,7 @@ class WorkflowExecutor:
         Returns:
             Number of strokes with that intent
         """
-        count = 0
-        for stroke in self.stroke_history:
-            workflow_meta = stroke.metadata.get("workflow", {})
-            if workflow_meta.get("intent") == intent.value:
-                count += 1
-        return count
+        return self._intent_counts[intent.value]
     
     def get_phase_stroke_count(self, phase: DrawingPhase) -> int:
         """
@@ -376,9 +396,4 @@ class WorkflowExecutor:
         Returns:
             Number of strokes in that phase
         """
-        count = 0
-        for stroke in self.stroke_history:
-            workflow_meta = stroke.metadata.get("workflow", {})
-            if workflow_meta.get("phase") == phase.value:
-                count += 1
-        return count
+        return self._phase_counts[phase.value]
@@ -100,6 +100,15 @@ class PhaseTransitionValidator:
         },
     }
     
+    # Position of each phase in the normal progression
+    PHASE_ORDER: Dict[DrawingPhase, int] = {
+        DrawingPhase.SKETCH: 0,
+        DrawingPhase.REFINEMENT: 1,
+        DrawingPhase.STYLIZATION: 2,
+        DrawingPhase.RENDERING: 3,
+        DrawingPhase.COMPLETE: 4,
+    }
+    
     @classmethod
     def is_valid_transition(cls, from_phase: DrawingPhase, to_phase: DrawingPhase) -> bool:
         """
@@ -139,20 +148,11 @@ class PhaseTransitionValidator:
         Returns:
             True if this is forward progression
         """
-        phase_order = [
-            DrawingPhase.SKETCH,
-            DrawingPhase.REFINEMENT,
-            DrawingPhase.STYLIZATION,
-            DrawingPhase.RENDERING,
-            DrawingPhase.COMPLETE,
-        ]
-        
-        try:
-            from_idx = phase_order.index(from_phase)
-            to_idx = phase_order.index(to_phase)
-            return to_idx > from_idx
-        except ValueError:
+        from_idx = cls.PHASE_ORDER.get(from_phase)
+        to_idx = cls.PHASE_ORDER.get(to_phase)
+        if from_idx is None or to_idx is None:
             return False
+        return to_idx > from_idx
     
     @classmethod
     def is_regression(cls, from_phase: DrawingPhase, to_phase: DrawingPhase) -> bool:
@@ -166,17 +166,8 @@ class PhaseTransitionValidator:
         Returns:
             True if this is a regression
         """
-        phase_order = [
-            DrawingPhase.SKETCH,
-            DrawingPhase.REFINEMENT,
-            DrawingPhase.STYLIZATION,
-            DrawingPhase.RENDERING,
-            DrawingPhase.COMPLETE,
-        ]
-        
-        try:
-            from_idx = phase_order.index(from_phase)
-            to_idx = phase_order.index(to_phase)
-            return to_idx < from_idx
-        except ValueError:
+        from_idx = cls.PHASE_ORDER.get(from_phase)
+        to_idx = cls.PHASE_ORDER.get(to_phase)
+        if from_idx is None or to_idx is None:
             return False
+        return to_idx < from_idx
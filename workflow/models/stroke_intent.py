@@ -113,6 +113,16 @@ class StrokeIntentHelper:
         DrawingPhase.RENDERING: StrokeIntent.DETAIL,
     }
     
+    # Intent implied by common task types
+    TASK_INTENTS: Dict[str, StrokeIntent] = {
+        "fix_pose": StrokeIntent.GESTURE,
+        "fix_proportions": StrokeIntent.CONSTRUCTION,
+        "refine_anatomy": StrokeIntent.CONTOUR,
+        "add_detail": StrokeIntent.DETAIL,
+        "improve_symmetry": StrokeIntent.CONTOUR,
+        "enhance_silhouette": StrokeIntent.CONTOUR,
+    }
+    
     @classmethod
     def get_recommended_intents(cls, phase: DrawingPhase) -> Set[StrokeIntent]:
         """
@@ -151,7 +161,7 @@ class StrokeIntentHelper:
         Returns:
             True if intent is appropriate for phase
         """
-        return intent in cls.PHASE_INTENTS.get(phase, set())
+        return intent in cls.PHASE_INTENTS.get(phase, ())
     
     @classmethod
     def suggest_intent_for_task(cls, phase: DrawingPhase, task_type: str) -> StrokeIntent:
@@ -165,18 +175,8 @@ class StrokeIntentHelper:
         Returns:
             Suggested stroke intent
         """
-        # Map common task types to intents
-        task_intent_map = {
-            "fix_pose": StrokeIntent.GESTURE,
-            "fix_proportions": StrokeIntent.CONSTRUCTION,
-            "refine_anatomy": StrokeIntent.CONTOUR,
-            "add_detail": StrokeIntent.DETAIL,
-            "improve_symmetry": StrokeIntent.CONTOUR,
-            "enhance_silhouette": StrokeIntent.CONTOUR,
-        }
-        
         # Get intent from task type
-        suggested = task_intent_map.get(task_type.lower()) if task_type else None
+        suggested = cls.TASK_INTENTS.get(task_type.lower()) if task_type else None
         
         # Fall back to phase primary intent if suggestion not appropriate
         if suggested and cls.is_intent_appropriate(phase, suggested):
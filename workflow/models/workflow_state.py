@@ -8,6 +8,7 @@ checkpoints, and progression.
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+import time
 
 from workflow.models.drawing_phase import DrawingPhase, PhaseTransition
 
@@ -39,6 +40,20 @@ class WorkflowState:
     workflow_id: str = field(default_factory=lambda: f"workflow_{datetime.now().timestamp()}")
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    # Monotonic clock reading matching phase_start_time
+    _phase_start_ns: int = field(init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any):
+        """Re-anchor the monotonic phase clock whenever phase_start_time is set."""
+        object.__setattr__(self, name, value)
+        if name == "phase_start_time":
+            elapsed = datetime.now() - value
+            object.__setattr__(
+                self,
+                "_phase_start_ns",
+                time.monotonic_ns() - int(elapsed.total_seconds() * 1e9),
+            )
+    
     def transition_to_phase(
         self,
         new_phase: DrawingPhase,
@@ -98,10 +113,13 @@ class WorkflowState:
         """
         Get time spent in current phase in seconds.
         
+        Uses the monotonic clock, so the result is unaffected by wall-clock
+        adjustments after the phase started.
+        
         Returns:
             Seconds in current phase
         """
-        return (datetime.now() - self.phase_start_time).total_seconds()
+        return (time.monotonic_ns() - self._phase_start_ns) * 1e-9
     
     def get_phase_transitions(self, phase: Optional[DrawingPhase] = None) -> List[PhaseTransition]:
         """
@@ -133,30 +151,23 @@ class WorkflowState:
         """
         total_duration = 0.0
         
-        # Track when we enter and exit the phase
-        for i, transition in enumerate(self.phase_history):
-            # When transitioning TO this phase, we enter it
+        # Walk backwards so the next exit from the phase (a transition FROM
+        # it) is known when each entry (a transition TO it) is reached
+        next_exit: Optional[datetime] = None
+        for transition in reversed(self.phase_history):
             if transition.to_phase == phase:
-                # Find when we leave this phase (transition FROM it)
-                start_time = transition.timestamp
-                end_time = None
-                
-                # Look for next transition FROM this phase
-                for j in range(i + 1, len(self.phase_history)):
-                    if self.phase_history[j].from_phase == phase:
-                        end_time = self.phase_history[j].timestamp
-                        break
+                end_time = next_exit
                 
                 # If no exit transition found, check if still in phase
-                if end_time is None:
-                    if self.current_phase == phase:
-                        end_time = datetime.now()
-                    else:
-                        # Phase was skipped or we're in a different phase
-                        continue
+                if end_time is None and self.current_phase == phase:
+                    end_time = datetime.now()
                 
-                duration = (end_time - start_time).total_seconds()
-                total_duration += duration
+                # Otherwise the phase was skipped or we're in a different phase
+                if end_time is not None:
+                    total_duration += (end_time - transition.timestamp).total_seconds()
+            
+            if transition.from_phase == phase:
+                next_exit = transition.timestamp
         
         # Special case: if no transitions yet but we're in this phase
         if not self.phase_history and self.current_phase == phase: